@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+"""Measures how many bytes of memory each expression node and type declaration takes.
+
+Run from the java-type-checker directory::
+
+    python -m benchmarks.node_memory
+"""
+
+import tracemalloc
+
+from java_type_checker import *
+
+
+def bytes_per_object(make_objects, count=100000):
+    """Returns the average number of bytes allocated per object by make_objects(count), counting
+    everything the objects keep alive.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = make_objects(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def make_type():
+    widget = JavaObjectType("Widget")
+    widget.add_method(JavaMethod("next", return_type=widget))
+    widget.add_method(JavaMethod("setSize", parameter_types=[JavaBuiltInTypes.DOUBLE, JavaBuiltInTypes.DOUBLE], return_type=JavaBuiltInTypes.VOID))
+    return widget
+
+
+WIDGET = make_type()
+
+
+def variables(count):
+    return [JavaVariable("widget", WIDGET) for i in range(count)]
+
+
+def literals(count):
+    return [JavaLiteral("1.0", JavaBuiltInTypes.DOUBLE) for i in range(count)]
+
+
+def method_calls(count):
+    # Names built at runtime, as a parser or JSON decoder would produce them
+    return [JavaMethodCall(None, "".join(["ne", "xt"])) for i in range(count)]
+
+
+def method_calls_with_args(count):
+    return [JavaMethodCall(None, "".join(["set", "Size"]), None, None) for i in range(count)]
+
+
+def constructor_calls(count):
+    return [JavaConstructorCall(WIDGET, None) for i in range(count)]
+
+
+def assignments(count):
+    return [JavaAssignment(None, None) for i in range(count)]
+
+
+def methods(count):
+    return [JavaMethod("setSize", parameter_types=[JavaBuiltInTypes.DOUBLE, JavaBuiltInTypes.DOUBLE], return_type=JavaBuiltInTypes.VOID) for i in range(count)]
+
+
+def constructors(count):
+    return [JavaConstructor([JavaBuiltInTypes.DOUBLE, JavaBuiltInTypes.DOUBLE]) for i in range(count)]
+
+
+def object_types(count):
+    return [JavaObjectType("Widget") for i in range(count)]
+
+
+def main():
+    for make_objects in [
+        variables, literals, method_calls, method_calls_with_args, constructor_calls, assignments,
+        methods, constructors,
+    ]:
+        print(f"{make_objects.__name__:24} {bytes_per_object(make_objects):8.1f} bytes")
+    print(f"{object_types.__name__:24} {bytes_per_object(object_types, 10000):8.1f} bytes")
+
+
+if __name__ == '__main__':
+    main()
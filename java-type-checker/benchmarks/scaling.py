@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+
+"""Measures how subtype tests, method lookups and type checking scale with the size of synthetic
+type hierarchies and expressions.
+
+Run from the java-type-checker directory::
+
+    python -m benchmarks.scaling [--sizes 100 300 1000 3000] [--output results.json]
+                                 [--baseline baseline.json] [--threshold 1.5]
+
+Each case builds its input of the given size, then times a workload on it, starting from cold
+caches. Time is the best of several runs; peak memory is what the workload allocates on top of its
+input, measured in a separate run because tracing memory slows Python down. Cases that consume
+source text also report their throughput in MB/s.
+
+With --baseline, the results are compared against an earlier --output file, and the exit status is
+1 if any case got slower, or allocated more memory, than the threshold allows.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from java_type_checker import *
+from java_type_checker.columnar import ExpressionColumns
+
+
+# Input generators. Each returns a workload function that runs against freshly built types and
+# expressions, so that repeated runs don’t just measure warm caches.
+
+def deep_chain(size):
+    """class T0 { T0 next() }, class T1 extends T0, ... class Tn extends Tn-1, and an expression
+    that calls the root’s method on the deepest type.
+    """
+    types = [JavaObjectType("T0")]
+    types[0].add_method(JavaMethod("next", return_type=types[0]))
+    for i in range(1, size):
+        types.append(JavaObjectType(f"T{i}", direct_supertypes=[types[-1]]))
+    leaf, root = types[-1], types[0]
+    expr = JavaMethodCall(JavaVariable("t", leaf), "next")
+
+    def workload():
+        leaf.is_subtype_of(root)
+        leaf.method_named("next")
+        expr.check_types()
+    return workload
+
+
+def wide_fanout(size):
+    """One class with the given number of direct subclasses, each tested against the root and
+    passed to a method that takes the root.
+    """
+    root = JavaObjectType("Root")
+    sink = JavaObjectType("Sink")
+    sink.add_method(JavaMethod("accept", parameter_types=[root], return_type=JavaBuiltInTypes.VOID))
+    children = [JavaObjectType(f"C{i}", direct_supertypes=[root]) for i in range(size)]
+    calls = [
+        JavaMethodCall(JavaVariable("sink", sink), "accept", JavaVariable("c", child))
+        for child in children]
+
+    def workload():
+        for child in children:
+            child.is_subtype_of(root)
+        check_many(calls)
+    return workload
+
+
+def diamond_lattice(size, width=4):
+    """Layers of `width` interfaces, where every interface extends every interface of the layer
+    above, so the number of paths from bottom to top grows exponentially with depth. Each interface
+    declares one method, and each interface in the bottom layer looks up all the inherited ones.
+    """
+    layers = [[JavaObjectType(f"I0_{j}") for j in range(width)]]
+    for i in range(1, max(1, size // width)):
+        layers.append([
+            JavaObjectType(f"I{i}_{j}", direct_supertypes=layers[-1]) for j in range(width)])
+    for layer in layers:
+        for t in layer:
+            t.add_method(JavaMethod(f"m{t.name}", return_type=t))
+    bottom = layers[-1]
+    top = layers[0]
+    names = [f"m{t.name}" for layer in layers[:-1] for t in layer]
+
+    def workload():
+        for t in bottom:
+            for other in top:
+                t.is_subtype_of(other)
+            for name in names:
+                t.method_named(name)
+    return workload
+
+
+def fluent_chain(size):
+    """builder.next().next() ... .next(), with the given number of calls.
+    """
+    builder = JavaObjectType("Builder")
+    builder.add_method(JavaMethod("next", return_type=builder))
+    expr = JavaVariable("builder", builder)
+    for i in range(size):
+        expr = JavaMethodCall(expr, "next")
+
+    def workload():
+        expr.check_types()
+        expr.static_type()
+    return workload
+
+
+def nested_arguments(size):
+    """new Box(new Box(..., b), b), nested to the given depth, where Box(Object, Box).
+    """
+    box = JavaObjectType("Box")
+    box.constructor = JavaConstructor([JavaBuiltInTypes.OBJECT, box])
+    b = JavaVariable("b", box)
+    expr = b
+    for i in range(size):
+        expr = JavaConstructorCall(box, expr, b)
+
+    def workload():
+        expr.check_types()
+    return workload
+
+
+def parse_source(size):
+    """Java source with the given number of blocks of statements, parsed as a stream. Reports
+    parser throughput in MB/s.
+    """
+    point = JavaObjectType("Point")
+    point.constructor = JavaConstructor([JavaBuiltInTypes.DOUBLE, JavaBuiltInTypes.DOUBLE])
+    point.add_method(JavaMethod("getX", return_type=JavaBuiltInTypes.DOUBLE))
+    point.add_method(JavaMethod("translate", [point], return_type=point))
+    types = TypeRegistry([point])
+    source = "".join(
+        f"{{\n    Point p = new Point({i}.0, 2.5);  // block {i}\n"
+        f"    double x = p.translate(new Point(1.0, 0.5)).getX();\n"
+        f"    x = p.getX();\n}}\n"
+        for i in range(size))
+
+    def workload():
+        for line, expr in parse_statements(source, types):
+            pass
+    workload.bytes = len(source.encode("utf-8"))
+    return workload
+
+
+def _frozen_calls(size):
+    # The given number of sink.accept(c.next()) calls over a frozen universe, where class Ci
+    # extends Root and Ci next()
+    root = JavaObjectType("Root")
+    sink = JavaObjectType("Sink")
+    sink.add_method(JavaMethod("accept", parameter_types=[root], return_type=JavaBuiltInTypes.VOID))
+    children = [JavaObjectType(f"C{i}", direct_supertypes=[root]) for i in range(100)]
+    for child in children:
+        child.add_method(JavaMethod("next", return_type=child))
+    universe = freeze([sink] + children)
+    expressions = [
+        JavaMethodCall(
+            JavaVariable("sink", sink), "accept",
+            JavaMethodCall(JavaVariable("c", children[i % len(children)]), "next"))
+        for i in range(size)]
+    return universe, expressions
+
+
+def frozen_calls(size):
+    """The calls columnar_calls checks, as expression objects checked with check_many().
+    """
+    universe, expressions = _frozen_calls(size)
+
+    def workload():
+        check_many(expressions)
+    return workload
+
+
+def columnar_calls(size):
+    """The given number of sink.accept(c.next()) calls over a frozen universe, where class Ci
+    extends Root and Ci next(), stored in columns and checked a batch at a time.
+    """
+    universe, expressions = _frozen_calls(size)
+    columns = ExpressionColumns.from_expressions(universe, expressions)
+
+    def workload():
+        columns.check()
+    return workload
+
+
+CASES = [
+    deep_chain, wide_fanout, diamond_lattice, fluent_chain, nested_arguments, parse_source,
+    frozen_calls, columnar_calls,
+]
+
+
+def measure(case, size, repeat=3):
+    """Returns a result dict for the given case at the given size.
+    """
+    best = float("inf")
+    for i in range(repeat):
+        workload = case(size)
+        data_bytes = getattr(workload, "bytes", None)
+        start = time.perf_counter()
+        workload()
+        best = min(best, time.perf_counter() - start)
+
+    workload = case(size)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    workload()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    result = {"case": case.__name__, "size": size, "seconds": best, "peak_bytes": peak}
+    if data_bytes is not None:
+        result["mb_per_second"] = data_bytes / best / 1e6 if best > 0 else float("inf")
+    return result
+
+
+#: The smallest value of each metric that compare() considers, below which it is too noisy
+METRIC_FLOORS = {"seconds": 0.001, "peak_bytes": 64 * 1024}
+
+
+def compare(results, baseline, threshold):
+    """Returns a list of (metric, result, baseline result) tuples for the results that are more
+    than `threshold` times slower, or use more than `threshold` times the peak memory, than the
+    baseline for the same case and size. The metric is "seconds" or "peak_bytes".
+
+    Timings below a millisecond and peaks below 64 KiB are too noisy to compare and are never
+    reported.
+    """
+    previous = {(r["case"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get((result["case"], result["size"]))
+        if before is None:
+            continue
+        for metric, floor in METRIC_FLOORS.items():
+            if metric not in before or max(result[metric], before[metric]) < floor:
+                continue
+            if result[metric] > before[metric] * threshold:
+                regressions.append((metric, result, before))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.scaling",
+        description="Measure how the type checker scales with hierarchy and expression size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 1000, 3000],
+        help="input sizes to measure (default: 100 300 1000 3000)")
+    parser.add_argument("--cases", nargs="+", choices=[case.__name__ for case in CASES],
+        help="cases to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3,
+        help="runs per measurement; the fastest one counts (default: 3)")
+    parser.add_argument("--output", "-o", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results from an earlier --output")
+    parser.add_argument("--threshold", type=float, default=1.5,
+        help="slowdown or growth in peak memory relative to the baseline that counts as a "
+            "regression (default: 1.5)")
+    args = parser.parse_args(argv)
+
+    cases = [case for case in CASES if args.cases is None or case.__name__ in args.cases]
+    results = []
+    for case in cases:
+        for size in args.sizes:
+            result = measure(case, size, args.repeat)
+            results.append(result)
+            line = (f"{result['case']:18} {size:8} {result['seconds'] * 1000:10.2f} ms "
+                f"{result['peak_bytes'] / 1024:10.1f} KiB")
+            if "mb_per_second" in result:
+                line += f" {result['mb_per_second']:8.2f} MB/s"
+            print(line)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": platform.python_version(), "results": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for metric, result, before in regressions:
+            if metric == "seconds":
+                change = f"{before['seconds'] * 1000:.2f} ms -> {result['seconds'] * 1000:.2f} ms"
+            else:
+                change = (f"{before['peak_bytes'] / 1024:.1f} KiB -> "
+                    f"{result['peak_bytes'] / 1024:.1f} KiB")
+            print(f"REGRESSION {result['case']} at size {result['size']} in {metric}: {change}",
+                file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -25,3 +25,10 @@ if sys.version_info[0] < 3:
 
 from .types import *
 from .expressions import *
+from .universe import FrozenTypeUniverse, freeze
+from .batch import BatchResult, CheckResult, check_many
+from .interning import ExpressionInterner
+from .incremental import IncrementalChecker, ResultChange
+from .instrumentation import Instrumentation, instrument
+from .registry import DuplicateTypeError, TypeRegistry
+from .parser import JavaParseError, parse_expression, parse_statements
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+import time
+from collections import Counter
+
+from .expressions import _check
+
+
+class CheckResult(object):
+    """The outcome of type checking one expression with check_many().
+
+    Attributes:
+        static_type (JavaType): The expression’s static type, or None if it is ill-typed
+        error (DeferredJavaTypeError): The error check_types() would raise, or None if there is none
+    """
+    def __init__(self, static_type, error):
+        self.static_type = static_type
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def error_class(self):
+        """The JavaTypeError subclass check_types() would raise, or None.
+        """
+        return None if self.error is None else self.error.error_class
+
+    @property
+    def message(self):
+        """The message of the error check_types() would raise, or None. Formatted on each access.
+        """
+        return None if self.error is None else self.error.message
+
+    def __repr__(self):
+        if self.ok:
+            return f"<ok: {self.static_type.qualified_name}>"
+        return repr(self.error)
+
+
+class BatchResult(object):
+    """The outcome of type checking a whole batch of expressions with check_many().
+
+    Attributes:
+        results (list of CheckResult): One result per expression, in the order they were given
+        elapsed (float): Wall-clock seconds spent checking
+        unique_nodes (int): Number of distinct non-leaf expression nodes that were actually checked
+    """
+    def __init__(self, results, elapsed, unique_nodes):
+        self.results = results
+        self.elapsed = elapsed
+        self.unique_nodes = unique_nodes
+
+    @property
+    def ok_count(self):
+        return sum(1 for r in self.results if r.ok)
+
+    @property
+    def error_count(self):
+        return len(self.results) - self.ok_count
+
+    def error_counts(self):
+        """Returns a Counter of how many expressions failed with each JavaTypeError subclass.
+        """
+        return Counter(r.error_class for r in self.results if not r.ok)
+
+    @property
+    def expressions_per_second(self):
+        return len(self.results) / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def summary(self):
+        """Returns a dict of aggregate counts and timings, suitable for logging.
+        """
+        return {
+            "expressions": len(self.results),
+            "ok": self.ok_count,
+            "errors": {error_class.__name__: n for error_class, n in self.error_counts().items()},
+            "unique_nodes": self.unique_nodes,
+            "elapsed": self.elapsed,
+            "expressions_per_second": self.expressions_per_second,
+        }
+
+
+def check_many(expressions):
+    """Type checks every expression in the given iterable and returns a BatchResult, without
+    raising for ill-typed expressions.
+
+    All checks share the subtype and method lookup caches on the types, and every node remembers
+    the outcome of checking it, so a node object that appears in many expressions (or many times
+    within one) is only checked once.
+    """
+    checked = []
+    results = []
+    start = time.perf_counter()
+    for expr in expressions:
+        results.append(CheckResult(*_check(expr, checked.append)))
+    elapsed = time.perf_counter() - start
+    return BatchResult(results, elapsed, len(checked))
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+"""Command line type checker for corpora of Java expressions.
+
+Usage::
+
+    python -m java_type_checker UNIVERSE CORPUS [--jobs N] [--output FILE] [--stats]
+
+UNIVERSE is either a JSON type universe or a snapshot (see `java_type_checker.snapshot`), and CORPUS
+a JSON-lines file of expressions, in the formats described in `java_type_checker.serialization`. One JSON result is written per expression, in
+input order::
+
+    {"ok": true, "type": "double"}
+    {"ok": false, "error": "NoSuchJavaMethod", "message": "Point has no method named getZ"}
+
+Lines that cannot be decoded get the error "InvalidExpression". The exit status is 0 if every expression is well-typed, and 1 otherwise.
+
+The corpus is streamed: results are written as they are ready, in chunks, and memory use does not
+grow with the size of the corpus (see `iter_corpus()`).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .batch import check_many
+from .interning import ExpressionInterner
+from .registry import TypeRegistry
+from .serialization import expression_from_json, universe_from_json
+from .snapshot import SNAPSHOT_MAGIC, snapshot_from_bytes
+from .streaming import check_lines, invalid_expression_result, result_to_json, write_results
+
+
+def check_corpus_lines(lines, types):
+    """Decodes and type checks JSON-encoded expressions, returning one JSON-ready result dict each.
+
+    Lines that cannot be decoded get a result with the error "InvalidExpression". Identical
+    subexpressions across the lines share one node, so they are only checked once.
+    """
+    interner = ExpressionInterner()
+    results = [None] * len(lines)
+    expressions = []
+    positions = []
+    for i, line in enumerate(lines):
+        try:
+            expressions.append(expression_from_json(json.loads(line), types, interner))
+            positions.append(i)
+        except (ValueError, KeyError, TypeError, RecursionError) as e:
+            results[i] = invalid_expression_result(e)
+    for i, result in zip(positions, check_many(expressions).results):
+        results[i] = result_to_json(result, types)
+    return results
+
+
+def load_universe_bytes(data):
+    """Decodes the contents of a universe file, which may be JSON or a snapshot, and returns a
+    TypeRegistry of all types, including the built-in types.
+
+    Raises:
+        ValueError if the universe is malformed or declares a type more than once
+    """
+    if not data.startswith(SNAPSHOT_MAGIC):
+        return universe_from_json(json.loads(data.decode("utf-8")))
+    return TypeRegistry(snapshot_from_bytes(data))
+
+
+# Each worker process decodes the universe once, when it starts, and keeps it here
+_worker_types = None
+
+
+def _init_worker(universe_data):
+    global _worker_types
+    _worker_types = load_universe_bytes(universe_data)
+
+
+def _check_shard(lines):
+    start = time.perf_counter()
+    results = check_corpus_lines(lines, _worker_types)
+    return results, os.getpid(), time.perf_counter() - start
+
+
+def _shards(lines, shard_size):
+    lines = (line for line in lines if line.strip())
+    while True:
+        shard = list(islice(lines, shard_size))
+        if not shard:
+            return
+        yield shard
+
+
+def iter_corpus(universe_data, lines, jobs=1, shard_size=1000, worker_stats=None, types=None):
+    """Type checks corpus lines against the given universe file contents, and yields one result
+    dict per line that is not blank, in the same order as the lines.
+
+    A caller that has already decoded the universe (see load_universe_bytes()) can pass the
+    TypeRegistry as `types`, so that a run with jobs <= 1 does not decode it again.
+
+    With jobs <= 1, lines are checked and yielded one at a time (see `streaming.check_lines()`).
+    With more jobs, lines are sent to a pool of worker processes in shards of `shard_size`, with at
+    most two shards per worker in flight. Either way, identical subexpressions are shared within
+    each shard of `shard_size` lines (see check_corpus_lines()), and memory use stays bounded
+    however long the corpus is.
+
+    If a worker_stats dict is given, it is filled in with [expressions checked, seconds spent]
+    for each worker’s process ID.
+    """
+    if worker_stats is None:
+        worker_stats = {}
+
+    def collect(shard_results, pid, elapsed):
+        stats = worker_stats.setdefault(pid, [0, 0.0])
+        stats[0] += len(shard_results)
+        stats[1] += elapsed
+        return shard_results
+
+    if jobs <= 1:
+        if types is None:
+            types = load_universe_bytes(universe_data)
+        lines = iter(lines)
+        stats = worker_stats.setdefault(os.getpid(), [0, 0.0])
+        while True:
+            shard = list(islice(lines, shard_size))
+            if not shard:
+                return
+            # A new interner per shard, as in the workers, so that it only holds on to one shard
+            results = check_lines(shard, types, ExpressionInterner())
+            while True:
+                start = time.perf_counter()
+                result = next(results, None)
+                stats[1] += time.perf_counter() - start
+                if result is None:
+                    break
+                stats[0] += 1
+                yield result
+
+    with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(universe_data,)) as pool:
+        # Results are yielded in submission order, whichever worker finishes first
+        in_flight = deque()
+        for shard in _shards(lines, shard_size):
+            in_flight.append(pool.submit(_check_shard, shard))
+            if len(in_flight) >= 2 * jobs:
+                yield from collect(*in_flight.popleft().result())
+        while in_flight:
+            yield from collect(*in_flight.popleft().result())
+
+
+def check_corpus(universe_data, lines, jobs=1, shard_size=1000):
+    """Type checks the given corpus lines against the given universe file contents, using a pool of
+    `jobs` worker processes if jobs > 1.
+
+    Returns (results, worker_stats), where results are in the same order as the lines, and
+    worker_stats maps each worker’s process ID to [expressions checked, seconds spent].
+    """
+    worker_stats = {}
+    results = list(iter_corpus(universe_data, lines, jobs, shard_size, worker_stats))
+    return results, worker_stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m java_type_checker",
+        description="Type checks a corpus of Java expressions against a type universe.")
+    parser.add_argument("universe", help="JSON file or snapshot declaring the Java types")
+    parser.add_argument("corpus", help="JSON-lines file with one expression per line")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="number of worker processes (default: 1)")
+    parser.add_argument("--shard-size", type=int, default=1000,
+                        help="expressions per task sent to a worker, and that share identical "
+                             "subexpressions (default: 1000)")
+    parser.add_argument("--output", "-o", help="write results here instead of stdout")
+    parser.add_argument("--stats", action="store_true",
+                        help="print throughput per worker to stderr")
+    args = parser.parse_args(argv)
+
+    with open(args.universe, "rb") as file:
+        universe_data = file.read()
+    try:
+        # Decoded here even when workers decode their own copies, so that a bad universe is
+        # reported once, before any work starts
+        types = load_universe_bytes(universe_data)
+    except (ValueError, KeyError, TypeError) as e:
+        parser.exit(2, f"{parser.prog}: error: cannot load {args.universe}: {e}\n")
+
+    worker_stats = {}
+    start = time.perf_counter()
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        with open(args.corpus, encoding="utf-8") as corpus:
+            counts = write_results(
+                iter_corpus(
+                    universe_data, corpus, args.jobs, args.shard_size, worker_stats, types),
+                output)
+    finally:
+        if args.output:
+            output.close()
+    elapsed = time.perf_counter() - start
+
+    if args.stats:
+        for pid, (count, seconds) in sorted(worker_stats.items()):
+            rate = count / seconds if seconds > 0 else float("inf")
+            sys.stderr.write(f"worker {pid}: {count} expressions in {seconds:.3f}s ({rate:.0f}/s)\n")
+        rate = counts["expressions"] / elapsed if elapsed > 0 else float("inf")
+        sys.stderr.write(
+            f"total: {counts['expressions']} expressions, {counts['errors']} with errors, "
+            f"in {elapsed:.3f}s ({rate:.0f}/s) with {args.jobs} job(s)\n")
+
+    return 0 if counts["errors"] == 0 else 1
@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+
+"""Columnar storage for large expression corpora, and a checker that works on whole batches of
+nodes at a time.
+
+An `ExpressionColumns` holds any number of expressions as a handful of flat `array.array` columns
+instead of one Python object per node. Nodes are numbered in post-order, so each expression is a
+contiguous run of nodes that ends with its root, and every node comes after its children.
+
+`ExpressionColumns.check()` types every node of every expression over a FrozenTypeUniverse, a
+batch at a time, where a batch is all the nodes with the same height, kind and number of children.
+For each batch it gathers columns of receiver, argument and parameter type IDs with `map()` and
+`zip()`, so that nearly all of the per-node work happens inside built-ins. Signatures are looked up
+once per distinct (receiver type, method name), and subtype tests against the universe’s bitsets
+are made once per distinct (argument type, parameter type) pair. A corpus generated from a few
+thousand types has far fewer of those than it has nodes.
+
+Its results are the same as `check_many()` on the object model, errors included: well-typed calls
+that are not overloaded for their number of arguments, assignments and conditionals are checked
+entirely in columns, and any expression with an error or overloaded call is rebuilt as objects (see
+`expression()`) and checked the usual way, so that it gets exactly the same error and message.
+"""
+
+from array import array
+from itertools import groupby, repeat
+from operator import add, itemgetter, mul
+
+from .batch import CheckResult
+from .expressions import (
+    JavaAssignment, JavaConditional, JavaConstructorCall, JavaLiteral, JavaMethodCall,
+    JavaNullLiteral, JavaVariable, _check)
+from .types import JavaBuiltInTypes
+
+
+VARIABLE = 0
+LITERAL = 1
+NULL_LITERAL = 2
+METHOD_CALL = 3
+CONSTRUCTOR_CALL = 4
+ASSIGNMENT = 5
+CONDITIONAL = 6
+
+_UNTYPED = -1  # Node type ID of a node the columnar checker leaves to the object model
+
+
+class ExpressionColumns(object):
+    """A struct-of-arrays store for expressions whose types all belong to one FrozenTypeUniverse.
+
+    Columns, with one entry per node:
+
+    - `kinds`: the node kind (VARIABLE, LITERAL, NULL_LITERAL, METHOD_CALL, CONSTRUCTOR_CALL,
+      ASSIGNMENT or CONDITIONAL)
+    - `type_ids`: the universe type ID of a variable’s declared type, a literal’s type, or the type a
+      constructor call instantiates; -1 for other nodes
+    - `name_ids`: the index in `strings` of a variable’s name, a literal’s value, or the name of the
+      method a call invokes; -1 for other nodes
+    - `child_starts`, `child_counts`: the node’s run of entries in `children`
+    - `heights`: 0 for a variable or literal, otherwise 1 more than the greatest height among the
+      node’s children
+
+    `children` lists child node numbers: the receiver and then the arguments of a method call, the
+    arguments of a constructor call, the variable and then the value of an assignment, and the
+    condition and then the two branches of a conditional.
+    `roots` has the root node number of each expression.
+
+    Attributes:
+        universe (FrozenTypeUniverse): The universe that type IDs refer to
+        strings (list of str): Names and literal values, indexed by name ID
+    """
+    def __init__(self, universe):
+        self.universe = universe
+        self.strings = []
+        self._string_ids = {}
+        self.kinds = array("b")
+        self.type_ids = array("i")
+        self.name_ids = array("i")
+        self.child_starts = array("i")
+        self.child_counts = array("i")
+        self.heights = array("i")
+        self.children = array("i")
+        self.roots = array("i")
+
+    @classmethod
+    def from_expressions(cls, universe, expressions):
+        """Returns new columns holding the given expressions, in order.
+        """
+        columns = cls(universe)
+        for expr in expressions:
+            columns.append(expr)
+        return columns
+
+    def __len__(self):
+        return len(self.roots)
+
+    @property
+    def node_count(self):
+        return len(self.kinds)
+
+    def nbytes(self):
+        """Returns the number of bytes the columns’ contents take up, not counting `strings`.
+        """
+        return sum(
+            len(column) * column.itemsize
+            for column in (
+                self.kinds, self.type_ids, self.name_ids, self.child_starts, self.child_counts,
+                self.heights, self.children, self.roots))
+
+    def append(self, expr):
+        """Adds an expression, and returns its index.
+
+        Shared subexpressions are stored once per place they occur. Works without recursion, so
+        the expression may be of any depth.
+
+        Raises:
+            KeyError if the expression refers to a type that is not in the universe
+            ValueError if it contains a kind of node that the columns cannot store
+        """
+        node_count, child_total = len(self.kinds), len(self.children)
+        try:
+            root = self._append_nodes(expr)
+        except (KeyError, ValueError):
+            # Leave the columns as they were
+            for column in (
+                    self.kinds, self.type_ids, self.name_ids, self.child_starts, self.child_counts,
+                    self.heights):
+                del column[node_count:]
+            del self.children[child_total:]
+            raise
+        self.roots.append(root)
+        return len(self.roots) - 1
+
+    def _append_nodes(self, expr):
+        pending = [(expr, False)]
+        done = []  # Node numbers of finished subexpressions, in order
+        while pending:
+            node, expanded = pending.pop()
+            node_children = _children(node)
+            if node_children and not expanded:
+                pending.append((node, True))
+                pending.extend((child, False) for child in reversed(node_children))
+                continue
+            child_count = len(node_children)
+            if child_count:
+                child_numbers = done[-child_count:]
+                del done[-child_count:]
+            else:
+                child_numbers = ()
+            done.append(self._add_node(node, child_numbers))
+        return done[0]
+
+    def _add_node(self, node, child_numbers):
+        if isinstance(node, JavaVariable):
+            kind, t, name = VARIABLE, node.declared_type, node.name
+        elif isinstance(node, JavaNullLiteral):
+            kind, t, name = NULL_LITERAL, JavaBuiltInTypes.NULL, node.value
+        elif isinstance(node, JavaLiteral):
+            kind, t, name = LITERAL, node.type, node.value
+        elif isinstance(node, JavaMethodCall):
+            kind, t, name = METHOD_CALL, None, node.method_name
+        elif isinstance(node, JavaConstructorCall):
+            kind, t, name = CONSTRUCTOR_CALL, node.instantiated_type, None
+        elif isinstance(node, JavaAssignment):
+            kind, t, name = ASSIGNMENT, None, None
+        elif isinstance(node, JavaConditional):
+            kind, t, name = CONDITIONAL, None, None
+        else:
+            raise ValueError("Cannot store {0} in columns".format(type(node).__name__))
+
+        self.kinds.append(kind)
+        self.type_ids.append(-1 if t is None else self.universe.type_id(t))
+        self.name_ids.append(-1 if name is None else self._string_id(name))
+        self.child_starts.append(len(self.children))
+        self.child_counts.append(len(child_numbers))
+        if child_numbers or kind == CONSTRUCTOR_CALL:
+            self.heights.append(1 + max(map(self.heights.__getitem__, child_numbers), default=0))
+        else:
+            self.heights.append(0)
+        self.children.extend(child_numbers)
+        return len(self.kinds) - 1
+
+    def _string_id(self, string):
+        string_id = self._string_ids.get(string)
+        if string_id is None:
+            string_id = self._string_ids[string] = len(self.strings)
+            self.strings.append(string)
+        return string_id
+
+    def expression(self, index):
+        """Rebuilds the expression with the given index as expression objects.
+        """
+        start = self.roots[index - 1] + 1 if index > 0 else 0
+        types = self.universe.types
+        built = {}
+        for n in range(start, self.roots[index] + 1):
+            kind = self.kinds[n]
+            first = self.child_starts[n]
+            args = [built.pop(c) for c in self.children[first:first + self.child_counts[n]]]
+            if kind == VARIABLE:
+                node = JavaVariable(self.strings[self.name_ids[n]], types[self.type_ids[n]])
+            elif kind == LITERAL:
+                node = JavaLiteral(self.strings[self.name_ids[n]], types[self.type_ids[n]])
+            elif kind == NULL_LITERAL:
+                node = JavaNullLiteral()
+            elif kind == METHOD_CALL:
+                node = JavaMethodCall(args[0], self.strings[self.name_ids[n]], *args[1:])
+            elif kind == CONSTRUCTOR_CALL:
+                node = JavaConstructorCall(types[self.type_ids[n]], *args)
+            elif kind == ASSIGNMENT:
+                node = JavaAssignment(*args)
+            else:
+                node = JavaConditional(*args)
+            built[n] = node
+        return built[self.roots[index]]
+
+    def check(self):
+        """Type checks every expression, and returns a list with a CheckResult for each one, the
+        same as `check_many(...).results` would for the expressions as objects.
+        """
+        root_types = list(map(self._check_nodes().__getitem__, self.roots))
+        results = list(map(
+            CheckResult, map(self.universe.types.__getitem__, root_types), repeat(None)))
+        for index, type_id in enumerate(root_types):
+            if type_id == _UNTYPED:
+                results[index] = CheckResult(*_check(self.expression(index)))
+        return results
+
+    def _check_nodes(self):
+        # Returns a column with the type ID of every node that is well-typed without needing
+        # overload resolution, and _UNTYPED for every other node.
+        node_types = array("i", self.type_ids)
+        starts, children = self.child_starts, self.children
+
+        def child_types(firsts, offset):
+            # The type IDs of the child at the given offset of each node, given where each
+            # node’s children start
+            return map(
+                node_types.__getitem__, map(children.__getitem__, map(add, firsts, repeat(offset))))
+
+        # Visit the nodes in batches of the same height, kind and child count. A node is always
+        # higher than its children, so they are typed by the time it is.
+        # (Each node’s key packs the three into one int, in that order of significance.)
+        width = max(self.child_counts, default=0) + 1
+        keys = array("q", map(
+            add, map(mul, map(add, map(mul, self.heights, repeat(8)), self.kinds), repeat(width)),
+            self.child_counts))
+        signatures = _SignatureCache(self.universe, self.strings)
+        is_subtype = self._pair_is_subtype
+        for key, batch in groupby(sorted(range(len(keys)), key=keys.__getitem__), keys.__getitem__):
+            height_and_kind, count = divmod(key, width)
+            height, kind = divmod(height_and_kind, 8)
+            if height == 0:
+                continue
+            batch = list(batch)
+            firsts = list(map(starts.__getitem__, batch))
+
+            # A (parameter type IDs, result type ID) signature per node, and where its arguments
+            # start among its children
+            if kind == METHOD_CALL:
+                batch_signatures = signatures.methods(
+                    zip(child_types(firsts, 0), map(self.name_ids.__getitem__, batch)), count - 1)
+                offset = 1
+            elif kind == CONSTRUCTOR_CALL:
+                batch_signatures = signatures.constructors(
+                    map(self.type_ids.__getitem__, batch), count)
+                offset = 0
+            elif kind == ASSIGNMENT:
+                lhs_ids = list(child_types(firsts, 0))
+                batch_signatures = list(zip(zip(lhs_ids), lhs_ids))
+                offset = 1
+            else:  # CONDITIONAL: the condition is the one argument
+                batch_signatures = signatures.conditionals(
+                    zip(child_types(firsts, 1), child_types(firsts, 2)))
+                offset = 0
+
+            # Test each distinct (argument type ID, parameter type ID) pair once
+            results = list(map(itemgetter(1), batch_signatures))
+            parameter_ids = list(map(itemgetter(0), batch_signatures))
+            for i in range(len(batch_signatures[0][0])):
+                pairs = list(zip(child_types(firsts, offset + i), map(itemgetter(i), parameter_ids)))
+                failed = set(pairs)
+                failed.difference_update(list(filter(is_subtype, failed)))
+                if failed:
+                    results = [
+                        _UNTYPED if pair in failed else result
+                        for pair, result in zip(pairs, results)]
+            for n, result in zip(batch, results):
+                node_types[n] = result
+        return node_types
+
+    def _pair_is_subtype(self, pair):
+        arg_id, parameter_id = pair
+        return (
+            arg_id != _UNTYPED and parameter_id != _UNTYPED
+            and self.universe._ancestor_bits[arg_id] >> parameter_id & 1 == 1)
+
+
+class _SignatureCache(object):
+    # Looks up and remembers the (parameter type IDs, result type ID) signature of each kind of
+    # node. The result type ID is _UNTYPED (and so are the parameter type IDs, so that there is
+    # still one for each argument) if the columnar checker cannot tell that such a node is
+    # well-typed without overload resolution, or if it can tell that it is not.
+
+    def __init__(self, universe, strings):
+        self.universe = universe
+        self.strings = strings
+        self._methods = {}  # By argument count, then (receiver type ID, name ID)
+        self._constructors = {}  # By argument count, then type ID
+        self._conditionals = {}  # By branch type IDs
+        self._boolean_id = universe.type_id(JavaBuiltInTypes.BOOLEAN)
+        self._void_id = universe.type_id(JavaBuiltInTypes.VOID)
+
+    def methods(self, keys, arg_count):
+        return _lookup(
+            self._methods.setdefault(arg_count, {}), keys,
+            lambda key: self._method(key, arg_count))
+
+    def constructors(self, type_ids, arg_count):
+        return _lookup(
+            self._constructors.setdefault(arg_count, {}), type_ids,
+            lambda type_id: self._constructor(type_id, arg_count))
+
+    def conditionals(self, branch_ids):
+        return _lookup(self._conditionals, branch_ids, self._conditional)
+
+    def _method(self, key, arg_count):
+        receiver_id, name_id = key
+        overloads = None
+        if receiver_id != _UNTYPED:
+            receiver_type = self.universe.types[receiver_id]
+            if receiver_type != JavaBuiltInTypes.NULL:
+                overloads = receiver_type.find_overloads(self.strings[name_id])
+        return self._signature(overloads, arg_count)
+
+    def _constructor(self, type_id, arg_count):
+        t = self.universe.types[type_id]
+        overloads = t.constructor_overloads() if t.is_instantiable else None
+        return self._signature(overloads, arg_count, result_type=t)
+
+    def _conditional(self, branch_ids):
+        result_id = _UNTYPED
+        if _UNTYPED not in branch_ids and self._void_id not in branch_ids:
+            types = self.universe.types
+            bounds = self.universe.least_upper_bounds(*(types[i] for i in branch_ids))
+            if len(bounds) == 1:
+                [bound] = bounds
+                result_id = self.universe.type_id(bound)
+        return ((self._boolean_id,), result_id)
+
+    def _signature(self, overloads, arg_count, result_type=None):
+        untyped = ((_UNTYPED,) * arg_count, _UNTYPED)
+        same_arity = None if overloads is None else overloads.by_arity.get(arg_count)
+        if same_arity is None or len(same_arity) != 1:
+            return untyped
+        member = same_arity[0]
+        if result_type is None:
+            result_type = member.return_type
+        try:
+            return (
+                tuple(self.universe.type_id(t) for t in member.parameter_types),
+                self.universe.type_id(result_type))
+        except KeyError:  # Also for a method with no return type
+            return untyped
+
+
+def _lookup(cache, keys, compute):
+    # Returns a list of the cached values for the given keys, computing each missing one once
+    keys = list(keys)
+    values = list(map(cache.get, keys))
+    if None in values:
+        for key in set(keys).difference(cache):
+            cache[key] = compute(key)
+        values = list(map(cache.__getitem__, keys))
+    return values
+
+
+def _children(node):
+    if isinstance(node, JavaMethodCall):
+        return (node.receiver,) + node.args
+    if isinstance(node, JavaConstructorCall):
+        return node.args
+    if isinstance(node, JavaAssignment):
+        return (node.lhs, node.rhs)
+    if isinstance(node, JavaConditional):
+        return (node.condition, node.if_true, node.if_false)
+    return ()
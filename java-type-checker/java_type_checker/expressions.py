@@ -1,6 +1,19 @@
 # -*- coding: utf-8 -*-
 
-from .types import JavaBuiltInTypes, JavaTypeError, NoSuchJavaMethod
+import sys
+
+from .types import (
+    JavaBuiltInTypes, JavaConstructor, JavaTypeError, NoSuchJavaMethod, OverloadSet, _UniverseVersion,
+    least_upper_bounds)
+
+
+class _Unchecked:
+    """Marks a node whose memo does not yet say whether it is well-typed.
+    """
+    def __repr__(self):
+        return "_UNCHECKED"
+
+_UNCHECKED = _Unchecked()
 
 
 class JavaExpression(object):
@@ -8,12 +21,55 @@ class JavaExpression(object):
 
     Note that this library deals only with compile-time types, and this class therefore does not
     actually *evaluate* expressions.
+
+    Expressions that have subexpressions describe how to type them with two generator methods,
+    `_static_type_steps()` and `_check_steps()`. Each generator yields the subexpressions whose
+    static types it needs, one at a time, receives each one’s type back from the `yield`, and
+    finally returns its own result. A driver loop (see `_evaluate()`) runs these generators with
+    an explicit stack, so expressions of any depth can be typed without Python recursion, and
+    subexpressions are visited in exactly the order the generators ask for them.
+
+    Expression nodes are assumed not to change after construction, and non-leaf nodes remember
+    both their static type and the outcome of type checking them, so a node that is shared by
+    several larger expressions (see `interning.ExpressionInterner`) is only typed and checked once.
+    The memo is kept in three slots:
+
+    - `_memo_version`: the `_UniverseVersion` at which the other two were recorded. They are
+      ignored once the version moves on.
+    - `_static_type`: the node’s static type, or None if not known.
+    - `_check_error`: `_UNCHECKED` if the node has not been type checked, otherwise the
+      DeferredJavaTypeError it has, or None if it is well-typed.
+
+    To keep large corpora small in memory, every node class here declares `__slots__`, including
+    the memo slots if it has subexpressions, and sets `_memo_version` to None in its constructor.
+    Subclasses defined elsewhere need not do either: the class attributes below give every node an
+    empty memo to start with.
     """
 
+    __slots__ = ()
+
+    _memo_version = None
+    _static_type = None
+    _check_error = _UNCHECKED
+
     def static_type(self):
         """Returns the compile-time type of this expression as a JavaType.
 
-        Subclasses must override this method.
+        The result is cached on the node until any Java type declaration changes (e.g. via
+        `JavaObjectType.add_method`).
+
+        Subclasses must either override this method and set `_static_type_steps` to None, or
+        implement `_static_type_steps()`.
+        """
+        if self._memo_version == _UniverseVersion.current:
+            static_type = self._static_type
+            if static_type is not None:
+                return static_type
+        return _evaluate(self._static_type_steps(), self, check=False)[0]
+
+    def _static_type_steps(self):
+        """Generator that yields the subexpressions whose types this expression’s static type
+        depends on, and returns this expression’s static type.
         """
         raise NotImplementedError(type(self).__name__ + " must override static_type()")
 
@@ -22,10 +78,31 @@ class JavaExpression(object):
 
         Raises a JavaTypeError if there is an error. If there is no error, this method has no effect
         and returns nothing.
+        """
+        error = self.first_error()
+        if error is not None:
+            raise error.exception()
+
+    def is_well_typed(self):
+        """Returns True if check_types() would pass, without building any exception or message.
+        """
+        return self.first_error() is None
 
-        Subclasses must override this method.
+    def first_error(self):
+        """Returns the error check_types() would raise as a DeferredJavaTypeError, or None if there
+        is no error. Neither the exception nor its message is built unless the caller asks for it.
         """
-        raise NotImplementedError(type(self).__name__ + " must override check_types()")
+        return _check(self)[1]
+
+    def _check_steps(self):
+        """Generator that yields each subexpression that must be type checked (and whose static type
+        is then sent back), in the order errors should be detected. Returns a
+        DeferredJavaTypeError if this expression itself is ill-typed, or else its static type.
+
+        Subclasses must override this method, or set it to None if the expression has no
+        subexpressions and can never be ill-typed.
+        """
+        raise NotImplementedError(type(self).__name__ + " must override _check_steps()")
 
 
 class JavaVariable(JavaExpression):
@@ -35,39 +112,42 @@ class JavaVariable(JavaExpression):
     after the initial construction of the AST. In this sample project, however, we simply specify
     the declared_type for every variable reference.
     """
+    __slots__ = ("name", "declared_type")
+
     def __init__(self, name, declared_type):
-        self.name = name                    #: The name of the variable (str)
+        self.name = sys.intern(name)        #: The name of the variable (str)
         self.declared_type = declared_type  #: The declared type of the variable (JavaType)
         
     def static_type(self):
         return self.declared_type
-    
-    def check_types(self):
-        pass
+
+    _static_type_steps = None
+    _check_steps = None
 
 
 class JavaLiteral(JavaExpression):
     """A literal value entered in the code, e.g. `5` in the expression `x + 5`.
     """
+    __slots__ = ("value", "type")
+
     def __init__(self, value, type):
         self.value = value  #: The literal value, as a string
         self.type = type    #: The type of the literal (JavaType)
         
     def static_type(self):
         return self.type
-    
-    def check_types(self):
-        pass
+
+    _static_type_steps = None
+    _check_steps = None
 
 
 class JavaNullLiteral(JavaLiteral):
     """The literal value `null` in Java code.
     """
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("null", JavaBuiltInTypes.NULL)
-        
-    def check_types(self):
-        pass
   
 
 class JavaAssignment(JavaExpression):
@@ -77,19 +157,22 @@ class JavaAssignment(JavaExpression):
         lhs (JavaVariable): The variable whose value this assignment updates.
         rhs (JavaExpression): The expression whose value will be assigned to the lhs.
     """
+    __slots__ = ("lhs", "rhs", "_memo_version", "_static_type", "_check_error")
+
     def __init__(self, lhs, rhs):
         self.lhs = lhs
         self.rhs = rhs
+        self._memo_version = None
         
-    def static_type(self):
-        return self.lhs.static_type()
+    def _static_type_steps(self):
+        return (yield self.lhs)
     
-    def check_types(self):
-        self.rhs.check_types()
+    def _check_steps(self):
+        rhs_type = yield self.rhs
         lhs_type = self.lhs.static_type()
-        rhs_type = self.rhs.static_type()
         if not lhs_type.is_supertype_of(rhs_type) :
-            raise JavaTypeMismatchError (f"Cannot assign {rhs_type.name} to variable {self.lhs.name} of type {lhs_type.name}")
+            return DeferredJavaTypeError(JavaTypeMismatchError, expression=self, variable=self.lhs.name, expected=lhs_type, actual=rhs_type)
+        return lhs_type
 
 
 class JavaMethodCall(JavaExpression):
@@ -106,23 +189,45 @@ class JavaMethodCall(JavaExpression):
     Attributes:
         receiver (JavaExpression): The object whose method we are calling
         method_name (String): The name of the method to call
-        args (list of Expressions): The arguments to pass to the method
+        args (tuple of Expressions): The arguments to pass to the method
     """
+    __slots__ = ("receiver", "method_name", "args", "_memo_version", "_static_type", "_check_error")
+
     def __init__(self, receiver, method_name, *args):
         self.receiver = receiver
-        self.method_name = method_name
+        self.method_name = sys.intern(method_name)
         self.args = args
+        self._memo_version = None
         
-    def static_type(self):
-        return self.receiver.static_type().method_named(self.method_name).return_type
+    def _static_type_steps(self):
+        receiver_type = yield self.receiver
+        overloads = receiver_type.find_overloads(self.method_name)
+        if overloads is None:
+            raise NoSuchJavaMethod(expression=self, receiver_type=receiver_type, method_name=self.method_name)
+        if overloads.return_type is not None or len(overloads) == 1:
+            # No need to look at the arguments if every overload returns the same type
+            return overloads.members[0].return_type
+        arg_types = []
+        for a in self.args:
+            arg_types.append((yield a))
+        method = _resolve(overloads, arg_types, self, receiver_type, self.method_name)
+        if isinstance(method, DeferredJavaTypeError):
+            raise method.exception()
+        return method.return_type
     
-    def check_types(self):
-        self.receiver.check_types()
+    def _check_steps(self):
+        receiver_type = yield self.receiver
         # Check if receiver is null
-        if self.receiver.static_type() == JavaBuiltInTypes.NULL:
-            raise NoSuchJavaMethod(f"Cannot invoke method {self.method_name}() on null")
-        method = self.receiver.static_type().method_named(self.method_name)
-        check_args(f"{self.receiver.static_type().name}.{self.method_name}()", method.parameter_types, self.args)
+        if receiver_type == JavaBuiltInTypes.NULL:
+            overloads = None
+        else:
+            overloads = receiver_type.find_overloads(self.method_name)
+        if overloads is None:
+            return DeferredJavaTypeError(NoSuchJavaMethod, expression=self, receiver_type=receiver_type, method_name=self.method_name)
+        method = yield from _resolve_steps(overloads, self.args, self, receiver_type, self.method_name)
+        if isinstance(method, DeferredJavaTypeError):
+            return method
+        return method.return_type
         
         
 
@@ -139,56 +244,410 @@ class JavaConstructorCall(JavaExpression):
 
     Attributes:
         instantiated_type (JavaType): The type to instantiate
-        args (list of Expressions): Constructor arguments
+        args (tuple of Expressions): Constructor arguments
     """
+    __slots__ = ("instantiated_type", "args", "_memo_version", "_static_type", "_check_error")
+
     def __init__(self, instantiated_type, *args):
         self.instantiated_type = instantiated_type
         self.args = args
+        self._memo_version = None
     
     def static_type(self):
         return self.instantiated_type
+
+    _static_type_steps = None
     
-    def check_types(self):
+    def _check_steps(self):
         if(not self.instantiated_type.is_instantiable):
-            raise JavaIllegalInstantiationError(f"Type {self.instantiated_type.name} is not instantiable")
-        constructor = self.instantiated_type.constructor
-        check_args(f"{ self.instantiated_type.name} constructor", constructor.parameter_types, self.args)
+            return DeferredJavaTypeError(JavaIllegalInstantiationError, expression=self, instantiated_type=self.instantiated_type)
+        constructors = self.instantiated_type.constructor_overloads()
+        constructor = yield from _resolve_steps(constructors, self.args, self, self.instantiated_type)
+        if isinstance(constructor, DeferredJavaTypeError):
+            return constructor
+        return self.instantiated_type
         
         
         
 
 
-class JavaTypeMismatchError(JavaTypeError):
+class JavaConditional(JavaExpression):
+    """A conditional expression, `condition ? if_true : if_false`.
+
+    Its static type is the least upper bound of the types of the two branches (see
+    `types.least_upper_bounds()`), so `flag ? rect : group` has type GraphicsObject, and
+    `flag ? rect : null` has type Rectangle. This model has no boxing, numeric promotion or
+    intersection types, so unlike Java, it rejects branches whose types do not have exactly one
+    least upper bound, such as int and double. As in Java, neither branch may be void.
+
+    Attributes:
+        condition (JavaExpression): The condition, which must be boolean
+        if_true (JavaExpression): The value of the expression if the condition is true
+        if_false (JavaExpression): The value of the expression if the condition is false
+    """
+    __slots__ = ("condition", "if_true", "if_false", "_memo_version", "_static_type", "_check_error")
+
+    def __init__(self, condition, if_true, if_false):
+        self.condition = condition
+        self.if_true = if_true
+        self.if_false = if_false
+        self._memo_version = None
+
+    def _static_type_steps(self):
+        true_type = yield self.if_true
+        false_type = yield self.if_false
+        result = self._branch_type(true_type, false_type)
+        if isinstance(result, DeferredJavaTypeError):
+            raise result.exception()
+        return result
+
+    def _check_steps(self):
+        condition_type = yield self.condition
+        if not condition_type.is_subtype_of(JavaBuiltInTypes.BOOLEAN):
+            return DeferredJavaTypeError(JavaConditionTypeError, expression=self, actual=condition_type)
+        true_type = yield self.if_true
+        false_type = yield self.if_false
+        return self._branch_type(true_type, false_type)
+
+    def _branch_type(self, true_type, false_type):
+        for branch, branch_type in (("true", true_type), ("false", false_type)):
+            if branch_type == JavaBuiltInTypes.VOID:
+                return DeferredJavaTypeError(JavaVoidBranchError, expression=self, branch=branch)
+        bounds = least_upper_bounds(true_type, false_type)
+        if len(bounds) == 1:
+            for bound in bounds:
+                return bound
+        return DeferredJavaTypeError(
+            JavaIncompatibleBranchesError, expression=self, actual=(true_type, false_type),
+            candidates=tuple(sorted(bounds, key=lambda t: t.qualified_name)))
+
+
+class DeferredJavaTypeError(object):
+    """A type error that has been detected but not raised.
+
+    Building the exception and formatting its message are put off until somebody asks for them,
+    which makes rejecting an expression nearly free for callers that only need a yes or no.
+
+    Attributes:
+        error_class (type): The JavaTypeError subclass that check_types() would raise
+        fields (dict): The structured fields of that error
+    """
+    def __init__(self, error_class, **fields):
+        self.error_class = error_class
+        self.fields = fields
+
+    @property
+    def message(self):
+        return str(self.exception())
+
+    def exception(self):
+        """Returns a new instance of error_class with the error’s fields.
+        """
+        return self.error_class(**self.fields)
+
+    def __repr__(self):
+        return f"<{self.error_class.__name__}: {self.message}>"
+
+
+class _CallError(JavaTypeError):
+    """Fields shared by errors in method and constructor calls.
+
+    Attributes:
+        target (JavaType): The receiver type of a method call, or the instantiated type of a
+            constructor call
+        method_name (str): The name of the called method, or None for a constructor
+    """
+    target = None
+    method_name = None
+    describe_method = None  # Returns the display name of the method, if given instead of the above
+
+    @property
+    def method(self):
+        """The display name of the called method or constructor, e.g. "Point.getX()".
+        """
+        if self.describe_method is not None:
+            return self.describe_method()
+        if self.method_name is None:
+            return f"{self.target.qualified_name} constructor"
+        return f"{self.target.qualified_name}.{self.method_name}()"
+
+
+class JavaTypeMismatchError(_CallError):
     """Indicates that one or more expressions do not evaluate to the correct type.
+
+    Attributes:
+        variable (str): For an assignment, the name of the assigned variable; None for a call
+        expected: For an assignment, the variable’s type (JavaType); for a call, the parameter types
+            of each overload with the right number of parameters (tuple of tuples of JavaType)
+        actual: For an assignment, the assigned value’s type (JavaType); for a call, the argument
+            types (tuple of JavaType)
     """
-    pass
+    variable = None
+
+    def _format(self):
+        if self.variable is not None:
+            return f"Cannot assign {self.actual.qualified_name} to variable {self.variable} of type {self.expected.qualified_name}"
+        return f"{self.method} expects arguments of type {_alternatives(_names(p) for p in self.expected)}, but got {_names(self.actual)}"
 
 
-class JavaArgumentCountError(JavaTypeError):
+class JavaArgumentCountError(_CallError):
     """Indicates that a call to a method or constructor has the wrong number of arguments.
+
+    Attributes:
+        expected (tuple of int): The numbers of parameters the overloads take, in increasing order
+        actual (int): The number of arguments
     """
-    pass
+    def _format(self):
+        return f"Wrong number of arguments for {self.method}: expected {_alternatives(self.expected)}, got {self.actual}"
 
 
 class JavaIllegalInstantiationError(JavaTypeError):
     """Raised in response to `new Foo()` where `Foo` is not an instantiable type.
+
+    Attributes:
+        instantiated_type (JavaType): The type that cannot be instantiated
+    """
+    def _format(self):
+        return f"Type {self.instantiated_type.qualified_name} is not instantiable"
+
+
+class JavaAmbiguousCallError(_CallError):
+    """Indicates that several overloads of a method or constructor accept the arguments of a call,
+    and none of them is more specific than all the others.
+
+    Attributes:
+        candidates (tuple of JavaMethod or JavaConstructor): The equally specific overloads
+        actual (tuple of JavaType): The argument types
+    """
+    def _format(self):
+        return f"Ambiguous call to {self.method} with arguments {_names(self.actual)}: could be {_alternatives(_names(m.parameter_types) for m in self.candidates)}"
+
+
+class JavaConditionTypeError(JavaTypeError):
+    """Indicates that the condition of a conditional expression is not boolean.
+
+    Attributes:
+        actual (JavaType): The type of the condition
+    """
+    def _format(self):
+        return f"Condition must be boolean, but got {self.actual.qualified_name}"
+
+
+class JavaVoidBranchError(JavaTypeError):
+    """Indicates that a branch of a conditional expression is a call to a method that returns void,
+    so it has no value to give the expression.
+
+    Attributes:
+        branch (str): "true" or "false": the branch that is void, or the first if both are
     """
-    pass
+    def _format(self):
+        return f"The {self.branch} branch of a conditional cannot be void"
+
 
+class JavaIncompatibleBranchesError(JavaTypeError):
+    """Indicates that the branches of a conditional expression do not have exactly one least upper
+    bound, which would be the expression’s type.
+
+    Attributes:
+        actual (tuple of JavaType): The types of the two branches
+        candidates (tuple of JavaType): Their least upper bounds in order of qualified name, or () if they have
+            no common supertype at all
+    """
+    def _format(self):
+        branches = f"{self.actual[0].qualified_name} and {self.actual[1].qualified_name}"
+        if not self.candidates:
+            return f"Conditional branches of type {branches} have no common supertype"
+        return f"Conditional branches of type {branches} have no single common supertype: could be {_alternatives(t.qualified_name for t in self.candidates)}"
 
-def _names(named_things):
+
+def _names(types):
     """Helper for formatting pretty error messages
     """
-    return "(" + ", ".join([e.name for e in named_things]) + ")"
+    return "(" + ", ".join([t.qualified_name for t in types]) + ")"
+
+def _alternatives(things):
+    """Helper for formatting pretty error messages: "a", "a or b", "a, b or c"
+    """
+    things = [str(thing) for thing in things]
+    if len(things) == 1:
+        return things[0]
+    return ", ".join(things[:-1]) + " or " + things[-1]
 
 def check_args(method_display_name, parameter_types, args):
-     # Check arg types
-        for a in args:
-            a.check_types()
+    """Raises a JavaTypeError if the given argument expressions are not acceptable for the given
+    parameter types.
+    """
+    error = first_args_error(lambda: method_display_name, parameter_types, args)
+    if error is not None:
+        raise error.exception()
+
+def first_args_error(describe_method, parameter_types, args):
+    """Non-raising counterpart to check_args(). Takes a function that returns the method's display
+    name, so that the name is only formatted if there is an error.
+    """
+    return _evaluate(_check_args_steps(describe_method, parameter_types, args), None, check=True)[1]
+
+def _check_args_steps(describe_method, parameter_types, args):
+    overloads = OverloadSet((JavaConstructor(parameter_types),))
+    result = yield from _resolve_steps(overloads, args, describe_method=describe_method)
+    return result if isinstance(result, DeferredJavaTypeError) else None
+
+def _resolve_steps(overloads, args, expression=None, target=None, method_name=None, describe_method=None):
+    # Check arg types
+    arg_types = []
+    for a in args:
+        arg_types.append((yield a))
+    return _resolve(overloads, arg_types, expression, target, method_name, describe_method)
+
+def _resolve(overloads, arg_types, expression=None, target=None, method_name=None, describe_method=None):
+    """Returns the member of the given OverloadSet that a call with arguments of the given types
+    invokes, or a DeferredJavaTypeError if there isn’t exactly one.
+
+    The remaining arguments are the fields of the _CallError that describe the call.
+    """
+    def error(error_class, **fields):
+        return DeferredJavaTypeError(
+            error_class, expression=expression, target=target, method_name=method_name,
+            describe_method=describe_method, **fields)
+
     # Check if correct number of arguments
-        if len(parameter_types) != len(args):
-            raise JavaArgumentCountError(f"Wrong number of arguments for {method_display_name}: expected {len(parameter_types)}, got {len(args)}")
-        # Check if correct types of arguments
-        arg_types = list(map(lambda x: x.static_type(), args))
-        if any(filter(lambda t: not t[0].is_subtype_of(t[1]) ,zip(arg_types, parameter_types))):
-            raise JavaTypeMismatchError(f"{method_display_name} expects arguments of type {_names(parameter_types)}, but got {_names(arg_types)}")
+    same_arity = overloads.by_arity.get(len(arg_types))
+    if same_arity is None:
+        return error(JavaArgumentCountError, expected=tuple(sorted(overloads.by_arity)), actual=len(arg_types))
+    # Check if correct types of arguments
+    if len(same_arity) == 1:
+        # The common case of a method that isn’t overloaded (for this many arguments)
+        member = same_arity[0]
+        for arg_type, parameter_type in zip(arg_types, member.parameter_types):
+            if not arg_type.is_subtype_of(parameter_type):
+                break
+        else:
+            return member
+        candidates = ()
+    else:
+        candidates = overloads.applicable(arg_types)
+    if not candidates:
+        return error(JavaTypeMismatchError, expected=tuple(m.parameter_types for m in same_arity), actual=tuple(arg_types))
+    best = OverloadSet.most_specific(candidates)
+    if len(best) > 1:
+        return error(JavaAmbiguousCallError, candidates=best, actual=tuple(arg_types))
+    return best[0]
+
+
+def infer(expr):
+    """Type checks the given expression and returns its static type, visiting each node once.
+
+    This is equivalent to calling `expr.check_types()` followed by `expr.static_type()`, but each
+    subexpression hands its type up to its parent as soon as it has been checked, instead of the
+    parent asking for it again afterwards.
+
+    Raises:
+        JavaTypeError if the expression is ill-typed
+    """
+    static_type, error = _check(expr)
+    if error is not None:
+        raise error.exception()
+    return static_type
+
+
+def _subexpressions(expr):
+    """Returns a tuple of the direct subexpressions of the given expression, in evaluation order.
+    """
+    if isinstance(expr, JavaMethodCall):
+        return (expr.receiver,) + tuple(expr.args)
+    if isinstance(expr, JavaConstructorCall):
+        return tuple(expr.args)
+    if isinstance(expr, JavaAssignment):
+        return (expr.lhs, expr.rhs)
+    if isinstance(expr, JavaConditional):
+        return (expr.condition, expr.if_true, expr.if_false)
+    return ()
+
+
+def _check(expr, on_check=None):
+    """Returns a (static type, error) pair for the given expression, using its memo if it is up to
+    date. See _evaluate().
+    """
+    if expr._check_steps is None:
+        return (expr.static_type(), None)
+    if expr._memo_version == _UniverseVersion.current:
+        error = expr._check_error
+        if error is not _UNCHECKED:
+            return (expr._static_type, error)
+    return _evaluate(expr._check_steps(), expr, check=True, on_check=on_check)
+
+
+def _evaluate(steps, node, check, on_check=None):
+    """Runs a `_check_steps()` (if check is True) or `_static_type_steps()` generator to completion,
+    along with the generators of all the subexpressions it asks for, and returns a
+    (static type, error) pair. The static type is None if there is an error.
+
+    The given node is the expression the steps belong to, or None if they do not belong to one.
+    Results are recorded in the memo of every non-leaf node along the way, and subexpressions
+    whose memo already has the answer are not visited again.
+
+    If on_check is given, it is called with each node whose check this call actually runs, once
+    the outcome is known.
+    """
+    version = _UniverseVersion.current
+    stack = [(node, steps)]
+    value = None
+    while True:
+        node, steps = stack[-1]
+        try:
+            child = steps.send(value)
+        except StopIteration as done:
+            value = done.value
+            if isinstance(value, DeferredJavaTypeError):
+                return _fail(stack, value, version, on_check)
+            stack.pop()
+            if node is not None:
+                memo_version = node._memo_version
+                node._static_type = value
+                if memo_version != version:
+                    node._check_error = _UNCHECKED
+                    node._memo_version = version  # Last, so that readers never see stale slots
+                if check:
+                    node._check_error = None
+                    if on_check is not None:
+                        on_check(node)
+            if not stack:
+                return (value, None)
+            continue
+
+        if check:
+            child_steps = child._check_steps
+            if child_steps is not None and child._memo_version == version:
+                error = child._check_error
+                if error is None:
+                    value = child._static_type
+                    continue
+                if error is not _UNCHECKED:
+                    return _fail(stack, error, version, on_check)
+        else:
+            child_steps = child._static_type_steps
+            if child_steps is not None and child._memo_version == version:
+                static_type = child._static_type
+                if static_type is not None:
+                    value = static_type
+                    continue
+        if child_steps is None:
+            value = child.static_type()
+        else:
+            stack.append((child, child_steps()))
+            value = None
+
+
+def _fail(stack, error, version, on_check):
+    # Every expression still waiting on the stack fails with the same error as its subexpression.
+    for node, _ in stack:
+        if node is not None:
+            if node._memo_version != version:
+                node._static_type = None  # Only clears a stale type: a known one stays
+                node._check_error = error
+                node._memo_version = version
+            else:
+                node._check_error = error
+            if on_check is not None:
+                on_check(node)
+    return (None, error)
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+from .batch import CheckResult
+from .expressions import (
+    JavaAssignment, JavaConditional, JavaConstructorCall, JavaMethodCall, _check, _subexpressions)
+from .types import JavaObjectType, _UniverseVersion
+
+# Dependency keys are (type, name) pairs. The name is a method name, or one of these two, which
+# can’t be mistaken for one.
+_SUPERTYPES = "<supertypes>"
+_CONSTRUCTOR = "<constructor>"
+
+
+class ResultChange(object):
+    """An expression whose type checking outcome changed during IncrementalChecker.recheck().
+
+    Attributes:
+        index (int): Position of the expression in the checker’s list
+        expression (JavaExpression): The expression itself
+        before (CheckResult): The outcome before the change
+        after (CheckResult): The outcome now
+    """
+    def __init__(self, index, expression, before, after):
+        self.index = index
+        self.expression = expression
+        self.before = before
+        self.after = after
+
+    def __repr__(self):
+        return f"<#{self.index}: {self.before!r} -> {self.after!r}>"
+
+
+class IncrementalChecker(object):
+    """Type checks a fixed list of expressions, and re-checks only the affected ones when the types
+    they use change.
+
+    While checking, the checker records what each expression’s outcome depended on:
+
+    - for each method call, the method name and every type whose declaration the lookup went
+      through (the receiver type and all its supertypes);
+    - for each argument and assigned value, the supertypes of its type, since those decide the
+      subtype tests against the expected types;
+    - for each branch of a conditional expression, the supertypes of its type, since those decide
+      the expression’s type;
+    - for each constructor call, the constructor of the instantiated type.
+
+    After modifying types, pass recheck() what changed. Only expressions that depended on it are
+    checked again.
+
+    Attributes:
+        expressions (list of JavaExpression): The expressions being checked
+        results (list of CheckResult): The current outcome for each expression
+        rechecked (int): Number of expressions checked again by the last call to recheck()
+    """
+    def __init__(self, expressions):
+        self.expressions = list(expressions)
+        self.results = [None] * len(self.expressions)
+        self.rechecked = 0
+        self._dependents = {}  # type -> name -> set of expression indexes
+        self._dependencies = [()] * len(self.expressions)
+        self._check(range(len(self.expressions)))
+
+    def recheck(self, changed):
+        """Re-checks the expressions affected by the given changes, and returns a list of
+        ResultChange for the ones whose outcome is now different, in expression order.
+
+        Each change is either a JavaObjectType, meaning anything about its declaration may have
+        changed (its supertypes, constructor or methods), or a (JavaObjectType, method name) pair,
+        meaning only the methods with that name were added, removed or replaced.
+
+        Changes must be reported against the types as they were when the affected expressions were
+        last checked: if a type’s supertypes changed, report that type, not each of its subtypes.
+        """
+        affected = set()
+        for change in changed:
+            if isinstance(change, tuple):
+                changed_type, name = change
+                affected |= self._dependents.get(changed_type, {}).get(name, set())
+            else:
+                for indexes in self._dependents.get(change, {}).values():
+                    affected |= indexes
+
+        indexes = sorted(affected)
+        before = [self.results[i] for i in indexes]
+        self._check(indexes)
+        self.rechecked = len(indexes)
+        return [
+            ResultChange(i, self.expressions[i], old, self.results[i])
+            for i, old in zip(indexes, before)
+            if not _same_outcome(old, self.results[i])]
+
+    def dependencies(self, index):
+        """Returns the set of (type, name) pairs the outcome of the expression at the given index
+        depends on. The name is a method name, "<supertypes>" or "<constructor>".
+        """
+        return set(self._dependencies[index])
+
+    def _check(self, indexes):
+        node_dependencies = {}
+        for i in indexes:
+            for t, name in self._dependencies[i]:
+                self._dependents[t][name].discard(i)
+            expr = self.expressions[i]
+            self.results[i] = CheckResult(*_check(expr))
+            dependencies = self._dependencies[i] = _expression_dependencies(expr, node_dependencies)
+            for t, name in dependencies:
+                self._dependents.setdefault(t, {}).setdefault(name, set()).add(i)
+
+
+def _same_outcome(a, b):
+    return (
+        a.static_type is b.static_type
+        and a.error_class is b.error_class
+        and (a.ok or a.message == b.message))
+
+
+def _expression_dependencies(expr, node_dependencies):
+    # Returns a frozenset of the keys for every node in the expression, visiting shared nodes once.
+    # node_dependencies caches the keys of the nodes already visited.
+    stack = [expr]
+    keys = set()
+    seen = set()
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        own = node_dependencies.get(id(node))
+        if own is None:
+            own = node_dependencies[id(node)] = _node_dependencies(node)
+        keys |= own
+        stack.extend(_subexpressions(node))
+    return frozenset(keys)
+
+
+def _node_dependencies(node):
+    keys = set()
+    if isinstance(node, JavaMethodCall):
+        receiver_type = _known_type(node.receiver)
+        if isinstance(receiver_type, JavaObjectType):
+            for t in receiver_type.ancestors():
+                keys.add((t, node.method_name))
+                keys.add((t, _SUPERTYPES))
+        values = node.args
+    elif isinstance(node, JavaConstructorCall):
+        if isinstance(node.instantiated_type, JavaObjectType):
+            keys.add((node.instantiated_type, _CONSTRUCTOR))
+        values = node.args
+    elif isinstance(node, JavaAssignment):
+        values = (node.rhs,)
+    elif isinstance(node, JavaConditional):
+        values = (node.if_true, node.if_false)
+    else:
+        values = ()
+    for value in values:
+        value_type = _known_type(value)
+        if isinstance(value_type, JavaObjectType):
+            for t in value_type.ancestors():
+                keys.add((t, _SUPERTYPES))
+    return keys
+
+
+def _known_type(expr):
+    # The static type checking found for the given expression, or None if it didn’t get that far.
+    if expr._check_steps is None:
+        return expr.static_type()
+    if expr._memo_version == _UniverseVersion.current and expr._check_error is None:
+        return expr._static_type
+    return None
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+import functools
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from .expressions import (
+    DeferredJavaTypeError, JavaAssignment, JavaConditional, JavaConstructorCall, JavaExpression,
+    JavaLiteral, JavaMethodCall, JavaVariable)
+from .types import JavaNullType, JavaObjectType, JavaPrimitiveType, JavaType, JavaVoidType
+
+
+class Instrumentation(object):
+    """Counts of what the type checker did while `instrument()` was active.
+
+    Every event is counted in total and per key, where the key is the name of the type for type
+    events, the node class for expression events, and the error class for `type_error`. Timings are
+    inclusive: time spent in an `is_subtype_of` call made while checking a method call counts
+    toward both.
+
+    Events:
+
+    - is_subtype_of, method_named, find_method, find_overloads: calls to those methods of
+      JavaType (timed)
+    - ancestors_build, method_table_build: cached supertype sets and method tables computed for
+      a type (timed)
+    - static_type, check_types: public calls on expressions, including ones answered from the
+      memo (timed)
+    - static_type_steps, check_steps: non-leaf nodes whose type or check was actually computed
+      rather than taken from the memo (counted only)
+    - type_error: type errors found while checking (counted only)
+
+    Exceptions that escape a timed call, such as NoSuchJavaMethod from method_named(), are counted
+    per event and exception class in `raised`.
+
+    Attributes:
+        calls (Counter): Number of times each event happened
+        seconds (defaultdict of float): Seconds spent in each timed event
+        calls_by (defaultdict of Counter): For each event, the number of times per key
+        seconds_by (defaultdict of defaultdict of float): For each timed event, the seconds per key
+        raised (Counter): Number of exceptions per (event, exception class name)
+    """
+    def __init__(self):
+        self.calls = Counter()
+        self.seconds = defaultdict(float)
+        self.calls_by = defaultdict(Counter)
+        self.seconds_by = defaultdict(lambda: defaultdict(float))
+        self.raised = Counter()
+
+    def report(self):
+        """Returns the counts as a JSON-ready dict, with one entry per event that happened.
+        """
+        report = {}
+        for event, calls in sorted(self.calls.items()):
+            entry = {"calls": calls}
+            if event in self.seconds:
+                entry["seconds"] = self.seconds[event]
+            entry["by"] = dict(self.calls_by[event].most_common())
+            if event in self.seconds_by:
+                entry["seconds_by"] = dict(self.seconds_by[event])
+            raised = {
+                name: n for (raised_event, name), n in self.raised.items() if raised_event == event}
+            if raised:
+                entry["raised"] = raised
+            report[event] = entry
+        return report
+
+    def format_report(self, top=5):
+        """Returns the counts as human-readable text, listing the `top` keys of each event.
+        """
+        lines = []
+        for event, entry in self.report().items():
+            line = f"{event:20} {entry['calls']:10}"
+            if "seconds" in entry:
+                line += f" {entry['seconds'] * 1000:10.2f} ms"
+            lines.append(line)
+            for key, calls in list(entry["by"].items())[:top]:
+                lines.append(f"    {key:16} {calls:10}")
+            for name, n in entry.get("raised", {}).items():
+                lines.append(f"    raised {name}: {n}")
+        return "\n".join(lines)
+
+
+# (event, class, attribute, timed) for every method that instrument() wraps. Only classes that
+# define the attribute themselves are listed, so that each call is counted once.
+_HOOKS = [
+    ("is_subtype_of", JavaType, "is_subtype_of", True),
+    ("is_subtype_of", JavaPrimitiveType, "is_subtype_of", True),
+    ("is_subtype_of", JavaObjectType, "is_subtype_of", True),
+    ("is_subtype_of", JavaVoidType, "is_subtype_of", True),
+    ("is_subtype_of", JavaNullType, "is_subtype_of", True),
+    ("method_named", JavaType, "method_named", True),
+    ("find_method", JavaType, "find_method", True),
+    ("find_overloads", JavaType, "find_overloads", True),
+    ("find_overloads", JavaObjectType, "find_overloads", True),
+    ("ancestors_build", JavaObjectType, "_update_ancestors", True),
+    ("method_table_build", JavaObjectType, "_update_method_table", True),
+    ("static_type", JavaExpression, "static_type", True),
+    ("static_type", JavaVariable, "static_type", True),
+    ("static_type", JavaLiteral, "static_type", True),
+    ("static_type", JavaConstructorCall, "static_type", True),
+    ("check_types", JavaExpression, "check_types", True),
+    ("static_type_steps", JavaAssignment, "_static_type_steps", False),
+    ("static_type_steps", JavaMethodCall, "_static_type_steps", False),
+    ("static_type_steps", JavaConditional, "_static_type_steps", False),
+    ("check_steps", JavaAssignment, "_check_steps", False),
+    ("check_steps", JavaMethodCall, "_check_steps", False),
+    ("check_steps", JavaConstructorCall, "_check_steps", False),
+    ("check_steps", JavaConditional, "_check_steps", False),
+    ("type_error", DeferredJavaTypeError, "__init__", False),
+]
+
+_active = None
+
+
+@contextmanager
+def instrument():
+    """Counts and times what the type checker does inside a `with` block:
+
+        with instrument() as counts:
+            expr.check_types()
+        print(counts.format_report())
+
+    Instrumentation works by temporarily replacing the methods listed in Instrumentation with
+    counting wrappers, so there is no overhead at all outside the block. It applies to the whole
+    process and is not thread-safe; instrument() blocks cannot be nested.
+
+    Yields:
+        Instrumentation
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError("Instrumentation is already active")
+    counts = Instrumentation()
+    originals = []
+    for event, cls, attribute, timed in _HOOKS:
+        original = cls.__dict__[attribute]
+        originals.append((cls, attribute, original))
+        wrapper = _timed_wrapper if timed else _counting_wrapper
+        setattr(cls, attribute, wrapper(counts, event, original))
+    _active = counts
+    try:
+        yield counts
+    finally:
+        for cls, attribute, original in reversed(originals):
+            setattr(cls, attribute, original)
+        _active = None
+
+
+def _key(obj, *args):
+    if isinstance(obj, JavaType):
+        return obj.name
+    if isinstance(obj, DeferredJavaTypeError):
+        return args[0].__name__
+    return type(obj).__name__
+
+
+def _counting_wrapper(counts, event, original):
+    calls, calls_by = counts.calls, counts.calls_by[event]
+
+    @functools.wraps(original)
+    def wrapper(self, *args, **kwargs):
+        calls[event] += 1
+        calls_by[_key(self, *args)] += 1
+        return original(self, *args, **kwargs)
+    return wrapper
+
+
+def _timed_wrapper(counts, event, original):
+    calls, calls_by = counts.calls, counts.calls_by[event]
+    seconds, seconds_by = counts.seconds, counts.seconds_by[event]
+
+    @functools.wraps(original)
+    def wrapper(self, *args, **kwargs):
+        key = _key(self, *args)
+        calls[event] += 1
+        calls_by[key] += 1
+        start = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        except Exception as e:
+            counts.raised[event, type(e).__name__] += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            seconds[event] += elapsed
+            seconds_by[key] += elapsed
+    return wrapper
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+from .expressions import (
+    JavaAssignment, JavaConditional, JavaConstructorCall, JavaLiteral, JavaMethodCall, JavaNullLiteral, JavaVariable,
+    _subexpressions)
+
+
+class ExpressionInterner(object):
+    """A factory for expression nodes that hands out the same node object for structurally identical
+    expressions, so that repeated subexpressions form a shared DAG instead of separate trees.
+
+    Because every node remembers its static type and the outcome of type checking it, a shared node
+    is only typed and checked once, however many expressions it appears in.
+
+    Two expressions are identical if they are the same kind of node, refer to the same types (by
+    identity) and have identical names, literal values and subexpressions. Each interner keeps its
+    own table, which holds on to every node it has handed out; drop the interner to release them.
+
+    The factory methods take the same arguments as the corresponding node constructors:
+
+        interner = ExpressionInterner()
+        size = interner.method_call(interner.variable("window", Window), "getSize")
+        size is interner.method_call(interner.variable("window", Window), "getSize")  # True
+    """
+    def __init__(self):
+        self._nodes = {}
+        self.requested = 0  #: Number of nodes asked for, including the ones that were reused
+        self.created = 0    #: Number of distinct nodes actually created
+
+    def _make(self, cls, *fields, key=None):
+        self.requested += 1
+        if key is None:
+            key = (cls,) + fields
+        try:
+            return self._nodes[key]
+        except KeyError:
+            node = self._nodes[key] = cls(*fields)
+        except TypeError:
+            # An unhashable literal value: such a literal can’t be shared, but it is still valid.
+            node = cls(*fields)
+        self.created += 1
+        return node
+
+    def variable(self, name, declared_type):
+        return self._make(JavaVariable, name, declared_type)
+
+    def literal(self, value, type):
+        # The value’s class is part of the key to keep 1, 1.0 and True apart, which are equal as
+        # dict keys.
+        return self._make(JavaLiteral, value, type, key=(JavaLiteral, value.__class__, value, type))
+
+    def null(self):
+        return self._make(JavaNullLiteral)
+
+    def method_call(self, receiver, method_name, *args):
+        return self._make(JavaMethodCall, receiver, method_name, *args)
+
+    def constructor_call(self, instantiated_type, *args):
+        return self._make(JavaConstructorCall, instantiated_type, *args)
+
+    def assignment(self, lhs, rhs):
+        return self._make(JavaAssignment, lhs, rhs)
+
+    def conditional(self, condition, if_true, if_false):
+        return self._make(JavaConditional, condition, if_true, if_false)
+
+    def intern(self, expr):
+        """Returns the shared equivalent of the given expression, built from this interner’s nodes.
+        The given expression itself is not modified.
+
+        Raises:
+            ValueError if the expression contains a kind of node the interner does not know
+        """
+        # Post-order walk with an explicit stack, so very deep expressions don’t hit the recursion
+        # limit. Each entry is a node and whether its children have been interned yet.
+        done = {}
+        results = []
+        stack = [(expr, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if id(node) in done:
+                results.append(done[id(node)])
+                continue
+            children = _subexpressions(node)
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children))
+                continue
+            interned_children = results[len(results) - len(children):]
+            del results[len(results) - len(children):]
+            shared = self._rebuild(node, interned_children)
+            done[id(node)] = shared
+            results.append(shared)
+        return results[0]
+
+    def _rebuild(self, node, children):
+        if isinstance(node, JavaNullLiteral):
+            return self.null()
+        if isinstance(node, JavaLiteral):
+            return self.literal(node.value, node.type)
+        if isinstance(node, JavaVariable):
+            return self.variable(node.name, node.declared_type)
+        if isinstance(node, JavaMethodCall):
+            return self.method_call(children[0], node.method_name, *children[1:])
+        if isinstance(node, JavaConstructorCall):
+            return self.constructor_call(node.instantiated_type, *children)
+        if isinstance(node, JavaAssignment):
+            return self.assignment(*children)
+        if isinstance(node, JavaConditional):
+            return self.conditional(*children)
+        raise ValueError("Cannot intern {0}".format(type(node).__name__))
+
+    def stats(self):
+        """Returns a dict describing how much sharing the interner has found so far:
+
+        - requested: number of nodes asked for
+        - unique: number of distinct nodes actually created
+        - saved: number of nodes that were reused instead of created
+        - dedup_ratio: requested / unique (1.0 means nothing was shared)
+        """
+        return {
+            "requested": self.requested,
+            "unique": self.created,
+            "saved": self.requested - self.created,
+            "dedup_ratio": self.requested / self.created if self.created else 1.0,
+        }
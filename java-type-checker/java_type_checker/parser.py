@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+
+"""Parsing Java source text into JavaExpressions.
+
+The parser understands the small part of Java that the expression classes model::
+
+    statement   := type name ["=" expression] ";" | expression ";" | "{" statement* "}" | ";"
+    expression  := postfix "=" expression | conditional
+    conditional := postfix ["?" expression ":" conditional]
+    postfix     := primary ("." name "(" arguments ")")*
+    primary     := name | literal | "new" type "(" arguments ")" | "(" expression ")"
+    arguments   := [expression ("," expression)*]
+
+where a type is a simple or qualified name (`Point`, `java.awt.Point`, `int`), and literals are
+`int` and `double` numbers, `true`, `false` and `null`. `//` and `/* */` comments are skipped.
+
+Names in expressions are variables, looked up in a table of declared variables: the table given
+to the parser, plus the local variables declared so far. A block’s declarations go out of scope at
+the end of the block. A declaration with an initializer, like `Point p = new Point(1.0, 2.0);`,
+becomes an assignment to the new variable, so checking it checks the initializer against the
+declared type.
+
+parse_statements() reads its source a chunk at a time and yields each statement as soon as it is
+parsed, so its memory use is bounded by the longest line and the largest statement, not by the size
+of the source.
+"""
+
+import re
+from collections import deque
+
+from .types import JavaBuiltInTypes
+from .expressions import (
+    JavaAssignment, JavaConditional, JavaConstructorCall, JavaLiteral, JavaMethodCall,
+    JavaNullLiteral, JavaVariable)
+from .serialization import _resolve
+
+
+class JavaParseError(ValueError):
+    """Raised when source text is not valid in the subset of Java that the parser understands, or
+    refers to an undeclared variable or unknown type.
+
+    Attributes:
+        line (int): The line where the error was found, starting at 1
+        column (int): The column where the error was found, starting at 1
+    """
+    def __init__(self, message, line, column):
+        super().__init__("line {0}, column {1}: {2}".format(line, column, message))
+        self.line = line
+        self.column = column
+
+
+CHUNK_SIZE = 1 << 16
+
+# Each match skips any spaces before the token, so that they don’t cost a match of their own. The
+# "space" group only matches spaces at the very end of the source.
+_TOKEN = re.compile(r"""
+    [ \t\r\f]*
+    (?:
+    (?P<newline>\n)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<double>\d+\.\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?|\d+[eE][+-]?\d+)
+  | (?P<int>\d+)
+  | (?P<name>[A-Za-z_$][A-Za-z0-9_$]*)
+  | (?P<punctuation>[.,;=(){}?:])
+  | (?P<space>$)
+    )
+""", re.VERBOSE | re.DOTALL)
+
+_SPACES = re.compile(r"[ \t\r\f]*")
+
+_KEYWORDS = {"new", "null", "true", "false"}
+
+# Token kinds other than the regex groups
+_KEYWORD = "keyword"
+_END = "end"
+
+
+def tokenize(source):
+    """Yields the tokens of Java source text as (kind, text, line, column) tuples, where kind is
+    "int", "double", "name", "keyword" or "punctuation", followed by one ("end", "", line, column)
+    token.
+
+    The source may be a string, a text file, or any iterable of strings. Files are read
+    CHUNK_SIZE characters at a time.
+
+    Raises:
+        JavaParseError on a character that cannot start a token, or an unterminated comment
+    """
+    line, line_start = 1, 0   # line_start is the offset of the current line within the buffer
+    buffer = ""
+    chunks = _chunks(source)
+    at_end = False
+    while not at_end:
+        chunk = next(chunks, None)
+        if chunk is None:
+            at_end = True
+        else:
+            buffer += chunk
+        # Only tokenize complete lines until the end, so that no token is split between chunks
+        limit = len(buffer) if at_end else buffer.rfind("\n") + 1
+        position = 0
+        while position < limit:
+            match = _TOKEN.match(buffer, position)
+            if match is None or match.end() > limit:
+                position = _SPACES.match(buffer, position).end()
+                if buffer.startswith("/*", position):
+                    if at_end:
+                        raise JavaParseError(
+                            "Unterminated comment", line, position - line_start + 1)
+                    break  # Wait for the rest of the comment
+                raise JavaParseError(
+                    "Unexpected character {0!r}".format(buffer[position]),
+                    line, position - line_start + 1)
+            kind = match.lastgroup
+            text = match.group(kind)
+            column = match.start(kind) - line_start + 1
+            position = match.end()
+            if kind == "newline":
+                line, line_start = line + 1, position
+            elif kind == "comment":
+                newlines = text.count("\n")
+                if newlines:
+                    line, line_start = line + newlines, match.start(kind) + text.rfind("\n") + 1
+            elif kind != "space":
+                if kind == "name" and text in _KEYWORDS:
+                    kind = _KEYWORD
+                yield (kind, text, line, column)
+        buffer = buffer[position:]
+        line_start -= position
+    yield (_END, "", line, len(buffer) - line_start + 1)
+
+
+def _chunks(source):
+    if isinstance(source, str):
+        return iter((source,))
+    if hasattr(source, "read"):
+        return iter(lambda: source.read(CHUNK_SIZE), "")
+    return iter(source)
+
+
+class _Tokens(object):
+    # A token stream with as much lookahead as the parser asks for. Past the end, it keeps
+    # returning the end token.
+
+    def __init__(self, tokens):
+        self._tokens = tokens
+        self._ahead = deque()
+        self._end = None
+
+    def peek(self, n=0):
+        if n < len(self._ahead):
+            return self._ahead[n]
+        while len(self._ahead) <= n:
+            if self._end is None:
+                token = next(self._tokens)
+                if token[0] == _END:
+                    self._end = token
+            else:
+                token = self._end
+            self._ahead.append(token)
+        return self._ahead[n]
+
+    def next(self):
+        token = self.peek()
+        self._ahead.popleft()
+        return token
+
+    def at(self, text, n=0):
+        token = self._ahead[n] if n < len(self._ahead) else self.peek(n)
+        return token[1] == text and token[0] == "punctuation"
+
+    def expect(self, text):
+        token = self.next()
+        if not _is_punctuation(token, text):
+            raise _error("Expected {0!r}".format(text), token)
+        return token
+
+    def expect_name(self, what):
+        token = self.next()
+        if token[0] != "name":
+            raise _error("Expected {0}".format(what), token)
+        return token
+
+
+def _is_punctuation(token, text):
+    return token[0] == "punctuation" and token[1] == text
+
+
+def _error(message, token):
+    kind, text, line, column = token
+    if kind == _END:
+        found = "end of input"
+    else:
+        found = repr(text)
+    return JavaParseError("{0}, found {1}".format(message, found), line, column)
+
+
+def parse_statements(source, types, variables=None):
+    """Parses Java statements and yields one (line, JavaExpression) pair for each expression
+    statement and each declaration with an initializer, as soon as it is parsed. The line is the
+    one where the statement starts.
+
+    Args:
+        source: The source text: a string, a text file, or an iterable of strings
+        types: A TypeRegistry (see `registry.TypeRegistry`) or dict of types by name, for the types
+            that declarations and constructor calls name
+        variables (dict): The variables in scope at the start, mapping each name to its JavaType
+
+    Raises:
+        JavaParseError at the first statement that cannot be parsed
+    """
+    tokens = _Tokens(tokenize(source))
+    scopes = [dict(variables or {})]
+    while tokens.peek()[0] != _END:
+        token = tokens.peek()
+        if tokens.at(";"):
+            tokens.next()
+        elif tokens.at("{"):
+            tokens.next()
+            scopes.append({})
+        elif tokens.at("}"):
+            if len(scopes) == 1:
+                raise _error("Unexpected '}'", token)
+            tokens.next()
+            scopes.pop()
+        else:
+            expr = _parse_statement(tokens, types, scopes)
+            if expr is not None:
+                yield (token[2], expr)
+    if len(scopes) > 1:
+        raise _error("Expected '}'", tokens.peek())
+
+
+def parse_expression(text, types, variables=None):
+    """Parses a single Java expression, such as `rect.setPosition(new Point(0.0, 0.0))`, and
+    returns it as a JavaExpression. See parse_statements() for the arguments.
+
+    Raises:
+        JavaParseError if the text is not exactly one expression
+    """
+    tokens = _Tokens(tokenize(text))
+    expr = _parse_expression(tokens, types, [dict(variables or {})])
+    if tokens.peek()[0] != _END:
+        raise _error("Expected end of expression", tokens.peek())
+    return expr
+
+
+def _parse_statement(tokens, types, scopes):
+    # A declaration starts with a possibly qualified type name followed by the variable name
+    n = 1
+    while tokens.at(".", n) and tokens.peek(n + 1)[0] == "name":
+        n += 2
+    if tokens.peek()[0] == "name" and tokens.peek(n)[0] == "name":
+        type_token = tokens.peek()
+        type_name = "".join(tokens.next()[1] for _ in range(n))
+        declared_type = _find_type(types, type_name, type_token)
+        name = tokens.expect_name("variable name")[1]
+        expr = None
+        if tokens.at("="):
+            tokens.next()
+            expr = JavaAssignment(
+                JavaVariable(name, declared_type), _parse_expression(tokens, types, scopes))
+        tokens.expect(";")
+        scopes[-1][name] = declared_type
+        return expr
+    expr = _parse_expression(tokens, types, scopes)
+    tokens.expect(";")
+    return expr
+
+
+def _find_type(types, name, token):
+    try:
+        return _resolve(types, name)
+    except ValueError as e:
+        raise JavaParseError(str(e), token[2], token[3]) from None
+
+
+def _find_variable(scopes, token):
+    for scope in reversed(scopes):
+        declared_type = scope.get(token[1])
+        if declared_type is not None:
+            return JavaVariable(token[1], declared_type)
+    raise JavaParseError("Unknown variable {0}".format(token[1]), token[2], token[3])
+
+
+# What an unfinished construct on the parser stack is waiting for
+_ASSIGN = "assign"        # The right-hand side: (_ASSIGN, lhs)
+_ARGUMENTS = "arguments"  # The next argument: (_ARGUMENTS, make_node, args so far)
+_PARENS = "parens"        # The expression inside: (_PARENS,)
+_THEN = "then"            # The value if true: (_THEN, condition)
+_ELSE = "else"            # The value if false: (_ELSE, condition, value if true)
+
+
+def _parse_expression(tokens, types, scopes):
+    # An operator-precedence parser with an explicit stack of unfinished constructs, so that
+    # expressions of any depth parse without Python recursion.
+    stack = []
+    while True:
+        # Parse a primary expression, or push the construct it opens and go round again
+        token = tokens.next()
+        kind, text = token[0], token[1]
+        if kind == "name":
+            node = _find_variable(scopes, token)
+        elif kind == "int":
+            node = JavaLiteral(text, JavaBuiltInTypes.INT)
+        elif kind == "double":
+            node = JavaLiteral(text, JavaBuiltInTypes.DOUBLE)
+        elif kind == _KEYWORD and text in ("true", "false"):
+            node = JavaLiteral(text, JavaBuiltInTypes.BOOLEAN)
+        elif kind == _KEYWORD and text == "null":
+            node = JavaNullLiteral()
+        elif kind == _KEYWORD and text == "new":
+            type_token = tokens.expect_name("type name")
+            type_name = type_token[1]
+            while tokens.at("."):
+                tokens.next()
+                type_name += "." + tokens.expect_name("type name")[1]
+            instantiated_type = _find_type(types, type_name, type_token)
+            tokens.expect("(")
+            make_node = lambda args, t=instantiated_type: JavaConstructorCall(t, *args)
+            if not tokens.at(")"):
+                stack.append((_ARGUMENTS, make_node, []))
+                continue
+            tokens.next()
+            node = make_node(())
+        elif _is_punctuation(token, "("):
+            stack.append((_PARENS,))
+            continue
+        else:
+            raise _error("Expected an expression", token)
+
+        # Apply the method calls that follow the node, and finish the constructs it completes,
+        # until one of them needs another expression
+        while node is not None:
+            if tokens.at("."):
+                tokens.next()
+                method_name = tokens.expect_name("method name")[1]
+                tokens.expect("(")
+                make_node = lambda args, r=node, m=method_name: JavaMethodCall(r, m, *args)
+                if tokens.at(")"):
+                    tokens.next()
+                    node = make_node(())
+                else:
+                    stack.append((_ARGUMENTS, make_node, []))
+                    node = None
+            elif tokens.at("="):
+                # The last operand of a conditional is not an assignment target: in
+                # `c ? a : b = x`, the target would be the whole conditional
+                if not isinstance(node, JavaVariable) or (stack and stack[-1][0] == _ELSE):
+                    raise _error("Can only assign to a variable", tokens.peek())
+                tokens.next()
+                stack.append((_ASSIGN, node))
+                node = None
+            elif tokens.at("?"):
+                tokens.next()
+                stack.append((_THEN, node))
+                node = None
+            else:
+                node, done = _finish(stack, node, tokens)
+                if done:
+                    return node
+
+
+def _finish(stack, node, tokens):
+    # Hands the completed node to the constructs waiting for it. Returns (node, done), where node
+    # is None if an argument list or conditional wants another operand, and done is True if the
+    # node is the whole expression. Otherwise the node completes a call or parenthesized expression, which can
+    # be followed by method calls of its own.
+    while stack:
+        construct = stack.pop()
+        if construct[0] == _ASSIGN:
+            node = JavaAssignment(construct[1], node)
+            continue
+        if construct[0] == _ELSE:
+            node = JavaConditional(construct[1], construct[2], node)
+            continue
+        if construct[0] == _THEN:
+            tokens.expect(":")
+            stack.append((_ELSE, construct[1], node))
+            return (None, False)
+        if construct[0] == _PARENS:
+            tokens.expect(")")
+            return (node, False)
+        _, make_node, args = construct
+        args.append(node)
+        if tokens.at(","):
+            tokens.next()
+            stack.append(construct)
+            return (None, False)
+        tokens.expect(")")
+        return (make_node(args), False)
+    return (node, True)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+from collections.abc import Mapping
+
+from .types import JavaBuiltInTypes, JavaConstructor, JavaObjectType
+
+
+class DuplicateTypeError(ValueError):
+    """Raised on an attempt to register a different type under a qualified name that is already
+    taken.
+
+    Attributes:
+        names (list of str): The qualified names that were declared more than once
+    """
+    def __init__(self, names):
+        self.names = list(names)
+        if len(self.names) == 1:
+            message = "Type {0} is declared more than once".format(self.names[0])
+        else:
+            message = "Types {0} are declared more than once".format(", ".join(self.names))
+        super().__init__(message)
+
+    def __reduce__(self):
+        return (type(self), (self.names,))
+
+
+class TypeRegistry(Mapping):
+    """A set of Java types indexed by qualified name, such as "java.awt.Point".
+
+    `JavaType.name` is only the simple name ("Point"), which need not be unique; the registry is
+    where each type gets a unique qualified name, made from the package it is registered in and
+    its simple name. Types in the default package (no package) are known by their simple name. The
+    built-in types are always registered, under their Java names ("int", "Object").
+
+    Registering a type in a package also records the package as the type’s `package`, so that
+    error messages can name it, and so that registering it again without a package (in this or
+    another registry) puts it in the same package.
+
+    A registry is a read-only Mapping from qualified name to type, so it can be used anywhere a dict
+    of types by name is expected. All lookups are dict lookups.
+    """
+    def __init__(self, types=(), package=None):
+        self._types = {}          # Qualified name -> type
+        self._names = {}          # Type -> qualified name
+        self._by_simple_name = {}  # Simple name -> list of types
+        for t in JavaBuiltInTypes.ALL:
+            self._add(t.name, t)
+        self.register_all(types, package)
+
+    def _add(self, qualified_name, t):
+        self._types[qualified_name] = t
+        self._names[t] = qualified_name
+        self._by_simple_name.setdefault(t.name, []).append(t)
+
+    def __getitem__(self, qualified_name):
+        return self._types[qualified_name]
+
+    def __iter__(self):
+        return iter(self._types)
+
+    def __len__(self):
+        return len(self._types)
+
+    def register(self, t, package=None):
+        """Registers the given type in the given package (e.g. "java.awt"), and returns its
+        qualified name. Registering a type again under the same name does nothing.
+
+        Raises:
+            DuplicateTypeError if a different type already has the same qualified name
+            ValueError if the type is already registered under a different name
+        """
+        return self.register_all([t], package)[0]
+
+    def register_all(self, types, package=None):
+        """Registers all the given types in the given package, and returns a list of their
+        qualified names. Either all of them are registered, or none are.
+
+        Raises:
+            DuplicateTypeError listing every qualified name that would be taken twice
+            ValueError if any of the types is already registered under a different name, or
+                already belongs to a different package
+        """
+        added = {}
+        duplicates = []
+        for t in types:
+            if package is None:
+                qualified_name = t.qualified_name
+            elif t.package is None or t.package == package:
+                qualified_name = f"{package}.{t.name}"
+            else:
+                raise ValueError("{0} already belongs to package {1}".format(t.name, t.package))
+            existing = added.get(qualified_name, self._types.get(qualified_name))
+            if existing is not None and existing is not t:
+                if qualified_name not in duplicates:
+                    duplicates.append(qualified_name)
+                continue
+            registered_as = self._names.get(t, qualified_name)
+            if registered_as != qualified_name:
+                raise ValueError(
+                    "{0} is already registered as {1}".format(qualified_name, registered_as))
+            added[qualified_name] = t
+        if duplicates:
+            raise DuplicateTypeError(duplicates)
+        for qualified_name, t in added.items():
+            if package is not None:
+                t.package = package
+            if qualified_name not in self._types:
+                self._add(qualified_name, t)
+        return [self._names[t] for t in types]
+
+    def declare(self, name, package=None, direct_supertypes=None, constructor=JavaConstructor()):
+        """Creates a new JavaObjectType, registers it in the given package, and returns it.
+
+        Raises:
+            DuplicateTypeError if the qualified name is already taken
+        """
+        qualified_name = name if package is None else f"{package}.{name}"
+        if qualified_name in self._types:
+            raise DuplicateTypeError([qualified_name])
+        t = JavaObjectType(name, direct_supertypes=direct_supertypes, constructor=constructor)
+        t.package = package
+        self._add(qualified_name, t)
+        return t
+
+    def qualified_name(self, t):
+        """Returns the qualified name the given type is registered under.
+
+        Raises:
+            KeyError if the type is not registered
+        """
+        return self._names[t]
+
+    def named(self, simple_name):
+        """Returns a tuple of all the registered types with the given simple name, in any package.
+        """
+        return tuple(self._by_simple_name.get(simple_name, ()))
+
+    def resolve(self, name, package=None):
+        """Finds the type that the given name refers to in code in the given package, following
+        Java’s rules as far as they apply here: a type in the same package first, then a qualified
+        name (or the name of a type in the default package), then a simple name that only one
+        registered type has.
+
+        Raises:
+            KeyError if no type, or more than one type, matches the name
+        """
+        if package is not None:
+            t = self._types.get(f"{package}.{name}")
+            if t is not None:
+                return t
+        t = self._types.get(name)
+        if t is not None:
+            return t
+        candidates = self._by_simple_name.get(name, ())
+        if len(candidates) == 1:
+            return candidates[0]
+        if candidates:
+            raise KeyError("Type name {0} is ambiguous: could be {1}".format(
+                name, ", ".join(sorted(self._names[t] for t in candidates))))
+        raise KeyError("Unknown type {0}".format(name))
+
+    def object_types(self):
+        """Returns a list of all the registered types that are not built in, in registration order.
+        """
+        return [t for t in self._types.values() if t not in JavaBuiltInTypes.ALL]
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+
+"""Reading and writing type universes and expressions as JSON.
+
+A universe is a JSON object with a list of type declarations. Types refer to one another by name,
+in any order, and the built-in types are available under their Java names (`void`, `boolean`,
+`int`, `double`, `null`, `Object`)::
+
+    {"types": [
+        {"name": "Point",
+         "supertypes": ["Object"],
+         "constructor": ["double", "double"],
+         "methods": [{"name": "getX", "parameters": [], "returns": "double"}]}
+    ]}
+
+`supertypes` defaults to `["Object"]`, and `constructor` and `methods` default to empty lists.
+A type with several constructors lists their parameter types as `"constructors": [[...], ...]`
+instead of `constructor`, and overloaded methods are simply listed once per overload.
+
+A type may be declared in a package, as `"package": "java.awt"`. Its qualified name is then
+`java.awt.Point`, and qualified names must be unique within a universe file. References to other
+types may use qualified names or simple names, which are resolved as TypeRegistry.resolve()
+describes.
+
+An expression is a JSON object whose first key says what kind of node it is::
+
+    {"var": "rect", "type": "Rectangle"}                         rect
+    {"lit": "0.0", "type": "double"}                             0.0
+    {"lit": "null", "type": "null"}                              null
+    {"call": "setPosition", "on": <expr>, "args": [<expr>, ...]} rect.setPosition(...)
+    {"new": "Point", "args": [<expr>, ...]}                      new Point(...)
+    {"assign": <var expr>, "value": <expr>}                      x = ...
+    {"if": <expr>, "then": <expr>, "else": <expr>}               c ? a : b
+
+`args` defaults to an empty list. A corpus is a file with one expression per line.
+"""
+
+import json
+
+from .types import JavaBuiltInTypes, JavaConstructor, JavaMethod, JavaObjectType, validate_hierarchy
+from .expressions import (
+    JavaAssignment, JavaConditional, JavaConstructorCall, JavaLiteral, JavaMethodCall,
+    JavaNullLiteral, JavaVariable)
+from .registry import DuplicateTypeError, TypeRegistry
+
+
+BUILT_IN_TYPES = {t.name: t for t in JavaBuiltInTypes.ALL}
+
+
+def universe_from_json(data):
+    """Builds the JavaObjectTypes declared in the given decoded JSON universe, and returns a
+    TypeRegistry of all types by qualified name, including the built-in types.
+
+    Raises:
+        DuplicateTypeError (a ValueError) listing every type that is declared more than once
+        ValueError if a type refers to an unknown type, or to a simple name that is ambiguous
+        CyclicHierarchyError (a ValueError) listing every cycle in the declared supertypes
+    """
+    types = TypeRegistry()
+    declared = [JavaObjectType(decl["name"]) for decl in data["types"]]
+    duplicates = []
+    for decl, t in zip(data["types"], declared):
+        try:
+            types.register(t, decl.get("package"))
+        except DuplicateTypeError as e:
+            duplicates.extend(name for name in e.names if name not in duplicates)
+    if duplicates:
+        raise DuplicateTypeError(duplicates)
+
+    for decl, t in zip(data["types"], declared):
+        package = decl.get("package")
+
+        def resolve(name):
+            return _resolve(types, name, package)
+
+        t.direct_supertypes = [resolve(s) for s in decl.get("supertypes", ["Object"])]
+        if "constructors" in decl:
+            t.constructor = JavaConstructor([resolve(p) for p in decl["constructors"][0]])
+            for parameters in decl["constructors"][1:]:
+                t.add_constructor(JavaConstructor([resolve(p) for p in parameters]))
+        else:
+            t.constructor = JavaConstructor([resolve(p) for p in decl.get("constructor", [])])
+        for method in decl.get("methods", []):
+            t.add_method(JavaMethod(
+                method["name"],
+                parameter_types=[resolve(p) for p in method.get("parameters", [])],
+                return_type=resolve(method["returns"])))
+    validate_hierarchy(declared)
+    return types
+
+
+def _resolve(types, name, package=None):
+    # Looks up a type name in a TypeRegistry or a plain dict of types by name
+    if isinstance(types, TypeRegistry):
+        try:
+            return types.resolve(name, package)
+        except KeyError as error:  # Says whether the name is unknown or ambiguous
+            raise ValueError(error.args[0]) from None
+    try:
+        return types[name]
+    except KeyError:
+        raise ValueError("Unknown type {0}".format(name)) from None
+
+
+def universe_to_json(object_types, registry=None):
+    """Returns the decoded JSON declaration of the given JavaObjectTypes. Built-in types are
+    left out.
+
+    If a TypeRegistry is given, each type is declared in the package it is registered in, and
+    refers to other types by their qualified names.
+    """
+    if registry is None:
+        name_of = _simple_name
+    else:
+        name_of = registry.qualified_name
+    return {
+        "types": [
+            _type_to_json(t, name_of, registry)
+            for t in object_types if t not in JavaBuiltInTypes.ALL]
+    }
+
+
+def _simple_name(t):
+    return t.name
+
+
+def _type_to_json(t, name_of, registry):
+    decl = {"name": t.name}
+    if registry is not None:
+        qualified_name = registry.qualified_name(t)
+        if qualified_name != t.name:
+            decl["package"] = qualified_name[:-len(t.name) - 1]
+    decl["supertypes"] = [name_of(s) for s in t.direct_supertypes]
+    constructors = [[name_of(p) for p in c.parameter_types] for c in t.constructors]
+    if len(constructors) == 1:
+        decl["constructor"] = constructors[0]
+    else:
+        decl["constructors"] = constructors
+    decl["methods"] = [
+        {
+            "name": m.name,
+            "parameters": [name_of(p) for p in m.parameter_types],
+            "returns": name_of(m.return_type),
+        }
+        for overloads in t.overloads.values()
+        for m in overloads
+    ]
+    return decl
+
+
+def load_universe(path):
+    """Reads a universe from the JSON file at the given path. See universe_from_json().
+    """
+    with open(path, encoding="utf-8") as file:
+        return universe_from_json(json.load(file))
+
+
+def expression_from_json(data, types, interner=None):
+    """Builds a JavaExpression from its decoded JSON form, looking up type names in the given
+    TypeRegistry (as returned by universe_from_json()) or dict of types by name.
+
+    If an ExpressionInterner is given, nodes are created through it, so that identical
+    subexpressions (here and in other expressions built with the same interner) are shared.
+
+    Raises:
+        ValueError if the expression is malformed (including an assignment to anything but a
+            variable) or refers to an unknown type
+        RecursionError if the expression is nested too deeply to decode
+    """
+    if interner is None:
+        interner = _PLAIN_NODES
+    return _decode(data, types, interner)
+
+
+def _decode(data, types, interner):
+    # A module-level function rather than a closure, so that decoding leaves no reference cycles
+    # behind for the garbage collector
+    if "var" in data:
+        return interner.variable(data["var"], _resolve(types, data["type"]))
+    if "lit" in data:
+        literal_type = _resolve(types, data["type"])
+        if literal_type is JavaBuiltInTypes.NULL:
+            return interner.null()
+        return interner.literal(data["lit"], literal_type)
+    if "call" in data:
+        return interner.method_call(
+            _decode(data["on"], types, interner),
+            data["call"],
+            *[_decode(arg, types, interner) for arg in data.get("args", [])])
+    if "new" in data:
+        return interner.constructor_call(
+            _resolve(types, data["new"]),
+            *[_decode(arg, types, interner) for arg in data.get("args", [])])
+    if "assign" in data:
+        lhs = _decode(data["assign"], types, interner)
+        if not isinstance(lhs, JavaVariable):
+            raise ValueError("Can only assign to a variable")
+        return interner.assignment(lhs, _decode(data["value"], types, interner))
+    if "if" in data:
+        return interner.conditional(
+            _decode(data["if"], types, interner),
+            _decode(data["then"], types, interner),
+            _decode(data["else"], types, interner))
+    raise ValueError("Unknown kind of expression: {0}".format(json.dumps(data)))
+
+
+class _PlainNodes(object):
+    # The same factory methods as ExpressionInterner, creating a new node every time.
+    variable = JavaVariable
+    literal = JavaLiteral
+    null = JavaNullLiteral
+    method_call = JavaMethodCall
+    constructor_call = JavaConstructorCall
+    assignment = JavaAssignment
+    conditional = JavaConditional
+
+_PLAIN_NODES = _PlainNodes()
+
+
+def expression_to_json(expr):
+    """Returns the decoded JSON form of the given expression, naming types by their qualified
+    names.
+    """
+    if isinstance(expr, JavaVariable):
+        return {"var": expr.name, "type": expr.declared_type.qualified_name}
+    if isinstance(expr, JavaLiteral):
+        return {"lit": expr.value, "type": expr.type.qualified_name}
+    if isinstance(expr, JavaMethodCall):
+        return {
+            "call": expr.method_name,
+            "on": expression_to_json(expr.receiver),
+            "args": [expression_to_json(arg) for arg in expr.args],
+        }
+    if isinstance(expr, JavaConstructorCall):
+        return {
+            "new": expr.instantiated_type.qualified_name,
+            "args": [expression_to_json(arg) for arg in expr.args],
+        }
+    if isinstance(expr, JavaAssignment):
+        return {"assign": expression_to_json(expr.lhs), "value": expression_to_json(expr.rhs)}
+    if isinstance(expr, JavaConditional):
+        return {
+            "if": expression_to_json(expr.condition),
+            "then": expression_to_json(expr.if_true),
+            "else": expression_to_json(expr.if_false),
+        }
+    raise ValueError("Cannot encode {0}".format(type(expr).__name__))
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+"""Long-running type checker that loads a universe once and answers check requests over JSON lines,
+so that callers don’t pay for starting Python and building the universe on every check.
+
+Usage::
+
+    python -m java_type_checker.server UNIVERSE [--socket PATH] [--threads N]
+
+Without --socket, requests are read from stdin and responses written to stdout until stdin is
+closed. With --socket, the server listens on a Unix socket at the given path, serves any number of
+clients at once, and runs until it gets a shutdown request (and its clients disconnect) or is
+interrupted.
+
+Each request is one JSON object per line. The `id`, which may be any JSON value, is copied into the
+response, which is also one line::
+
+    {"id": 1, "check": <expr>}      {"id": 1, "ok": true, "type": "double"}
+                                    {"id": 1, "ok": false, "error": "NoSuchJavaMethod",
+                                     "message": "Point has no method named getZ"}
+    {"id": 2, "stats": true}        {"id": 2, "stats": {"requests": 1, "latency_ms": {...}}}
+    {"id": 3, "shutdown": true}     {"id": 3, "shutdown": true}
+
+Expressions use the format described in `java_type_checker.serialization`. Requests that cannot be
+decoded get the error "InvalidRequest", and undecodable expressions "InvalidExpression". If handling
+a request fails in any other way, its response has the error "InternalError", and the server goes on
+serving.
+
+The universe is frozen when it is loaded (see `universe.freeze()`), so every method table is built
+before the first request and stays warm for the life of the server. With --threads, checks run on a
+thread pool, which frozen universes allow; responses then come back in the order checks finish,
+not necessarily the order requests were sent.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .batch import CheckResult
+from .cli import load_universe_bytes
+from .expressions import _check
+from .serialization import expression_from_json
+from .streaming import invalid_expression_result, result_to_json
+from .universe import freeze
+
+
+_TOO_LONG = (json.dumps({
+    "id": None, "ok": False, "error": "InvalidRequest", "message": "Request line is too long",
+}) + "\n").encode("utf-8")
+
+
+class LatencyStats(object):
+    """Latencies of the most recent requests a server handled, in seconds.
+
+    Attributes:
+        count (int): Number of requests recorded since the server started
+        window (deque of float): The latencies of the last `window_size` requests
+    """
+    def __init__(self, window_size=100000):
+        self.count = 0
+        self.window = deque(maxlen=window_size)
+
+    def record(self, seconds):
+        self.count += 1
+        self.window.append(seconds)
+
+    def percentile(self, p):
+        """Returns the latency that p percent of the requests in the window took at most, using the
+        nearest-rank method, or None if no requests have been recorded.
+        """
+        return _nearest_rank(sorted(self.window), p) if self.window else None
+
+    def summary(self):
+        """Returns a JSON-ready dict with the request count and latency percentiles in milliseconds.
+        """
+        summary = {"requests": self.count}
+        if self.window:
+            latencies = sorted(self.window)
+            summary["latency_ms"] = {
+                name: _nearest_rank(latencies, p) * 1000
+                for name, p in [("p50", 50), ("p90", 90), ("p99", 99), ("max", 100)]}
+        return summary
+
+
+def _nearest_rank(latencies, p):
+    return latencies[max(0, math.ceil(p / 100 * len(latencies)) - 1)]
+
+
+class TypeCheckServer(object):
+    """Answers JSON check requests against one universe of types. See the module documentation for
+    the protocol.
+
+    Attributes:
+        types (TypeRegistry): The types that expressions may refer to, frozen
+        latency (LatencyStats): How long requests have taken, from being read to being answered
+    """
+    def __init__(self, types, threads=0, max_pending=1000):
+        self.types = types
+        freeze(types.object_types())
+        self.latency = LatencyStats()
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(threads) if threads > 0 else None
+        self._shutdown = None
+
+    @classmethod
+    def from_bytes(cls, universe_data, **options):
+        """Creates a server for the contents of a JSON universe file or snapshot.
+        """
+        return cls(load_universe_bytes(universe_data), **options)
+
+    def handle_request(self, request):
+        """Returns the response to a decoded request. Never raises: an unexpected failure becomes
+        an "InternalError" response.
+        """
+        response = {"id": request.get("id")}
+        try:
+            self._respond(request, response)
+        except Exception as e:
+            # One bad request must not take down the connection, or the other requests on it
+            response = {
+                "id": response["id"], "ok": False, "error": "InternalError",
+                "message": "{0}: {1}".format(type(e).__name__, e)}
+        return response
+
+    def _respond(self, request, response):
+        if "check" in request:
+            try:
+                expr = expression_from_json(request["check"], self.types)
+            except (ValueError, KeyError, TypeError, RecursionError) as e:
+                response.update(invalid_expression_result(e))
+            else:
+                response.update(result_to_json(CheckResult(*_check(expr)), self.types))
+        elif request.get("stats"):
+            response["stats"] = self.latency.summary()
+        elif request.get("shutdown"):
+            response["shutdown"] = True
+            if self._shutdown is not None:
+                # This may run on a worker thread
+                loop, event = self._shutdown
+                loop.call_soon_threadsafe(event.set)
+        else:
+            response.update(ok=False, error="InvalidRequest", message="Unknown kind of request")
+
+    def handle_line(self, line):
+        """Returns the response to one line of JSON, as a line of JSON.
+        """
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+        except ValueError as e:
+            response = {"id": None, "ok": False, "error": "InvalidRequest", "message": str(e)}
+        except RecursionError:
+            response = {
+                "id": None, "ok": False, "error": "InvalidRequest",
+                "message": "Request is nested too deeply"}
+        else:
+            response = self.handle_request(request)
+        return (json.dumps(response) + "\n").encode("utf-8")
+
+    async def serve_stream(self, reader, writer):
+        """Answers every request line from an asyncio StreamReader until it reaches the end, writing
+        responses to a StreamWriter (or anything with `write()` and `drain()`) as they are ready.
+        """
+        loop = asyncio.get_running_loop()
+        pending = set()
+        slots = asyncio.Semaphore(self.max_pending)
+
+        async def respond(line, start):
+            try:
+                if line is None:
+                    response = _TOO_LONG
+                elif self._executor is None:
+                    response = self.handle_line(line)
+                else:
+                    response = await loop.run_in_executor(self._executor, self.handle_line, line)
+                writer.write(response)
+                await writer.drain()
+                self.latency.record(time.perf_counter() - start)
+            finally:
+                slots.release()
+
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # Longer than the reader’s limit. The reader skips what it has read of it.
+                line = None
+            else:
+                if not line:
+                    break
+            start = time.perf_counter()
+            if line is not None and not line.strip():
+                continue
+            await slots.acquire()
+            task = asyncio.ensure_future(respond(line, start))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def serve_unix(self, path):
+        """Listens on a Unix socket at the given path, serving each client with serve_stream(),
+        until a client sends a shutdown request. Clients that are still connected then are served
+        until they disconnect, but no new ones are accepted.
+        """
+        shutdown = asyncio.Event()
+        self._shutdown = (asyncio.get_running_loop(), shutdown)
+
+        async def client(reader, writer):
+            try:
+                await self.serve_stream(reader, writer)
+            finally:
+                writer.close()
+
+        server = await asyncio.start_unix_server(client, path)
+        async with server:
+            await shutdown.wait()
+
+    async def serve_stdio(self):
+        """Serves requests from stdin, writing responses to stdout, until stdin is closed.
+        """
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        await self.serve_stream(reader, _StdoutWriter())
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+
+
+class _StdoutWriter(object):
+    # The part of StreamWriter that serve_stream() uses, writing to stdout
+    def write(self, data):
+        sys.stdout.buffer.write(data)
+
+    async def drain(self):
+        sys.stdout.buffer.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m java_type_checker.server",
+        description="Serves type check requests for Java expressions against a type universe.")
+    parser.add_argument("universe", help="JSON file or snapshot declaring the Java types")
+    parser.add_argument("--socket", help="listen on a Unix socket at this path instead of stdin")
+    parser.add_argument("--threads", type=int, default=0,
+                        help="check on a pool of this many threads (default: check inline)")
+    parser.add_argument("--stats", action="store_true",
+                        help="print request latency percentiles to stderr on exit")
+    args = parser.parse_args(argv)
+
+    with open(args.universe, "rb") as file:
+        server = TypeCheckServer.from_bytes(file.read(), threads=args.threads)
+    try:
+        if args.socket:
+            asyncio.run(server.serve_unix(args.socket))
+        else:
+            asyncio.run(server.serve_stdio())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        if args.stats:
+            sys.stderr.write(json.dumps(server.latency.summary()) + "\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+"""A compact binary snapshot format for type universes that loads much faster than rebuilding the
+universe by calling `JavaObjectType(...)` and `add_method(...)`.
+
+A snapshot stores every JavaObjectType reachable from the saved types (see `universe.freeze()`),
+numbered in discovery order, with its name and package, and refers to types by number, so forward
+references and cycles need no special handling. Built-in types are not stored; references to them
+load as the shared `JavaBuiltInTypes` objects.
+
+`snapshot_from_bytes()` itself does not mind two types with the same qualified name, but a
+TypeRegistry does, so a snapshot with them cannot be used as a universe file (see
+`cli.load_universe_bytes()`).
+
+The payload is written with `marshal`, so snapshots are tied to the major Python version that
+wrote them, and should only be loaded from trusted sources.
+"""
+
+import marshal
+
+from .types import (
+    JavaBuiltInTypes, JavaConstructor, JavaMethod, JavaObjectType, JavaType, validate_hierarchy)
+from .universe import reachable_types
+
+
+SNAPSHOT_MAGIC = b"JTCSNAP\x03"
+
+
+def snapshot_to_bytes(types):
+    """Returns a snapshot of the given types and all types reachable from them.
+
+    Raises:
+        ValueError if a declaration refers to something that is not a JavaType
+    """
+    built_in_refs = {t: -1 - i for i, t in enumerate(JavaBuiltInTypes.ALL)}
+    object_types = [
+        t for t in reachable_types(types)
+        if isinstance(t, JavaObjectType) and t not in built_in_refs]
+    refs = {t: i for i, t in enumerate(object_types)}
+    refs.update(built_in_refs)
+
+    def ref(t):
+        try:
+            return refs[t]
+        except (KeyError, TypeError):
+            raise ValueError("Cannot snapshot reference to {0!r}".format(t)) from None
+
+    def refs_of(types):
+        return tuple(ref(t) for t in types)
+
+    payload = (
+        tuple(t.name for t in object_types),
+        tuple(t.package for t in object_types),
+        tuple(refs_of(t.direct_supertypes) for t in object_types),
+        tuple(tuple(refs_of(c.parameter_types) for c in t.constructors) for t in object_types),
+        tuple(
+            tuple(
+                (m.name, refs_of(m.parameter_types), None if m.return_type is None else ref(m.return_type))
+                for overloads in t.overloads.values()
+                for m in overloads)
+            for t in object_types),
+    )
+    return SNAPSHOT_MAGIC + marshal.dumps(payload)
+
+
+def snapshot_from_bytes(data):
+    """Loads the JavaObjectTypes from a snapshot made by snapshot_to_bytes(), and returns them as a
+    list in the order they were numbered (so the types originally passed in come first). Each type
+    has the package it had when it was saved; `TypeRegistry(types)` registers them all in theirs.
+
+    Raises:
+        ValueError if the data is not a snapshot
+        CyclicHierarchyError (a ValueError) listing every cycle in the loaded supertypes
+    """
+    if not data.startswith(SNAPSHOT_MAGIC):
+        raise ValueError("Not a type universe snapshot")
+    names, packages, supertypes, constructors, methods = marshal.loads(data[len(SNAPSHOT_MAGIC):])
+
+    # Built-in type i has ref -1 - i, so appending the built-ins in reverse lets negative refs
+    # index this same list from the end.
+    types = [JavaObjectType.__new__(JavaObjectType) for _ in names]
+    by_ref = types + list(reversed(JavaBuiltInTypes.ALL))
+
+    for t, name, package, supertype_refs, constructor_refs, method_decls in zip(
+            types, names, packages, supertypes, constructors, methods):
+        JavaType.__init__(t, name)
+        t.package = package
+        t._set_declaration(
+            tuple([by_ref[i] for i in supertype_refs]),
+            [JavaConstructor([by_ref[i] for i in refs]) for refs in constructor_refs],
+            [
+                JavaMethod(
+                    method_name,
+                    [by_ref[i] for i in parameter_refs],
+                    None if return_ref is None else by_ref[return_ref])
+                for method_name, parameter_refs, return_ref in method_decls
+            ])
+    validate_hierarchy(types)
+    return types
+
+
+def save_snapshot(types, path):
+    """Writes a snapshot of the given types (see snapshot_to_bytes()) to the given file path.
+    """
+    with open(path, "wb") as file:
+        file.write(snapshot_to_bytes(types))
+
+
+def load_snapshot(path):
+    """Loads the types in the snapshot file at the given path (see snapshot_from_bytes()).
+    """
+    with open(path, "rb") as file:
+        return snapshot_from_bytes(file.read())
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+"""Type checking JSON-lines corpora as streams, one record at a time.
+
+The stages are generators, so nothing is decoded or checked until the consumer asks for the next
+result, and each expression can be freed as soon as its result is out. Memory use is bounded by the
+largest single expression, not the size of the corpus::
+
+    with open("corpus.jsonl") as corpus, open("results.jsonl", "w") as output:
+        counts = write_results(check_lines(corpus, types), output)
+
+Unlike `cli.check_corpus_lines()`, which checks a whole list of lines at once, expressions are not
+interned unless an ExpressionInterner is given, so identical subexpressions in different records are
+checked again. An interner holds on to every node it creates, so one should only be shared by a
+bounded number of lines, as `cli.iter_corpus()` does. (An ill-typed node and the error it remembers
+refer to each other, so those are freed by Python’s cyclic garbage collector rather than right away;
+it runs often enough that memory use still does not grow.)
+"""
+
+import json
+
+from .batch import CheckResult
+from .expressions import _check
+from .registry import TypeRegistry
+from .serialization import expression_from_json
+
+
+CHUNK_SIZE = 1 << 16
+
+
+def check_lines(lines, types, interner=None):
+    """Decodes and type checks JSON-encoded expressions one at a time, and yields one JSON-ready
+    result dict for each line that is not blank.
+
+    Args:
+        lines: Any iterable of lines, such as an open corpus file
+        types: A TypeRegistry or dict of types by name, as for expression_from_json()
+        interner: An optional ExpressionInterner, which identical subexpressions are shared
+            through, as for expression_from_json()
+    """
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            expr = expression_from_json(json.loads(line), types, interner)
+        except (ValueError, KeyError, TypeError, RecursionError) as e:
+            yield invalid_expression_result(e)
+            continue
+        yield result_to_json(CheckResult(*_check(expr)), types)
+
+
+def result_to_json(result, types):
+    """Returns the JSON-ready dict for a CheckResult, naming types by their qualified name if
+    `types` is a TypeRegistry.
+    """
+    if result.ok:
+        if isinstance(types, TypeRegistry):
+            return {"ok": True, "type": types.qualified_name(result.static_type)}
+        return {"ok": True, "type": result.static_type.qualified_name}
+    return {"ok": False, "error": result.error_class.__name__, "message": result.message}
+
+
+def invalid_expression_result(error):
+    """Returns the JSON-ready result dict for a line that could not be decoded.
+    """
+    if isinstance(error, RecursionError):
+        message = "Expression is nested too deeply"
+    else:
+        message = str(error)
+    return {"ok": False, "error": "InvalidExpression", "message": message}
+
+
+def encode_chunks(results, chunk_size=CHUNK_SIZE):
+    """Encodes result dicts as JSON lines, and yields them in strings of at least `chunk_size`
+    characters (except for the last one), so that they can be written with few, large writes.
+
+    At most one chunk is held at a time, and the next one is only encoded when the consumer asks
+    for it, so a slow output slows down the stages before it instead of piling up results.
+    """
+    chunk = []
+    size = 0
+    for result in results:
+        line = json.dumps(result) + "\n"
+        chunk.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield "".join(chunk)
+            chunk = []
+            size = 0
+    if chunk:
+        yield "".join(chunk)
+
+
+def write_results(results, output, chunk_size=CHUNK_SIZE):
+    """Writes result dicts to a text stream as JSON lines, in chunks (see encode_chunks()), flushing
+    after each one. Returns a dict with the number of results written ("expressions") and how many
+    of them were errors ("errors").
+    """
+    counts = {"expressions": 0, "errors": 0}
+
+    def counted(results):
+        for result in results:
+            counts["expressions"] += 1
+            if not result["ok"]:
+                counts["errors"] += 1
+            yield result
+
+    for chunk in encode_chunks(counted(results), chunk_size):
+        output.write(chunk)
+        output.flush()
+    return counts
@@ -1,18 +1,55 @@
 # -*- coding: utf-8 -*-
 
+import sys
+
+
+class _UniverseVersion:
+    """Counts changes to the declarations of all Java types.
+
+    Anything derived from type declarations (such as the memoized static type of an expression)
+    remembers the version it was computed at, and recomputes once the version has moved on.
+
+    Attributes:
+        current (int): Moves on every change to any type declaration
+        hierarchy (int): Moves only when some type's direct_supertypes change
+    """
+    current = 0
+    hierarchy = 0
+
+    @classmethod
+    def bump(cls, hierarchy=False):
+        cls.current += 1
+        if hierarchy:
+            cls.hierarchy += 1
+
 
 class JavaType(object):
     """The base type for all Java types, including object types, primitives, and special types.
 
     Attributes:
         name (str): Name of this type. **Note:** Names are not necessarily unique.
+        package (str): The package this type is declared in, such as "java.awt", or None for the
+            default package. Set when a TypeRegistry registers the type in a package.
     """
 
     is_object_type = False   #: Indicates whether members of this type are objects (bool)
     is_instantiable = False  #: Indicates whether `new` can create instances of this type (bool)
 
+    __slots__ = ("name", "package", "_universe", "_type_id", "_ancestor_bits")
+
     def __init__(self, name):
         self.name = name
+        self.package = None
+        self._universe = None     # The FrozenTypeUniverse this type belongs to, if any
+        self._type_id = None      # Index of this type within _universe
+        self._ancestor_bits = 0   # Bit i is set iff this type is a subtype of the type with _type_id i
+
+    @property
+    def qualified_name(self):
+        """The name of this type qualified by its package, such as "java.awt.Point", or just its
+        name if it is in the default package.
+        """
+        return self.name if self.package is None else f"{self.package}.{self.name}"
 
     def is_subtype_of(self, other):
         """Returns True if and only if a value of this type can be used in a context that expects
@@ -28,12 +65,35 @@ class JavaType(object):
         return other.is_subtype_of(self)
 
     def method_named(self, method_name):
-        """Returns the JavaMethod with the given name, which may come from a supertype.
+        """Returns the JavaMethod with the given name, which may come from a supertype. If the name
+        is overloaded, returns the first of its overloads (see find_overloads()).
 
         Raises:
             NoSuchJavaMethod if the type has no method with the give name (or no methods at all)
         """
-        raise NoSuchJavaMethod("Type {0} does not have methods".format(self.name))
+        method = self.find_method(method_name)
+        if method is None:
+            raise NoSuchJavaMethod(receiver_type=self, method_name=method_name)
+        return method
+
+    def find_method(self, method_name):
+        """Same as method_named(), but returns None instead of raising if there is no such method.
+        """
+        overloads = self.find_overloads(method_name)
+        return None if overloads is None else overloads.members[0]
+
+    def find_overloads(self, method_name):
+        """Returns the OverloadSet of all methods with the given name, declared or inherited, or
+        None if there are none.
+
+        Subclasses that have methods must override this.
+        """
+        return None
+
+    def no_such_method_message(self, method_name):
+        """Returns the error message for a failed lookup of the given method name.
+        """
+        return "Type {0} does not have methods".format(self.qualified_name)
 
 
 class JavaConstructor(object):
@@ -50,10 +110,12 @@ class JavaConstructor(object):
         new Foo(34)              // This is a JavaConstructorCall
 
     Attributes:
-        parameter_types (list of JavaType): Declared parameter types
+        parameter_types (tuple of JavaType): Declared parameter types
     """
-    def __init__(self, parameter_types=[]):
-        self.parameter_types = parameter_types
+    __slots__ = ("parameter_types",)
+
+    def __init__(self, parameter_types=()):
+        self.parameter_types = tuple(parameter_types)
 
 
 class JavaMethod(object):
@@ -74,20 +136,97 @@ class JavaMethod(object):
 
     Attributes:
         name (str): Name of this method
-        parameter_types (list of JavaType): Declared parameter types
+        parameter_types (tuple of JavaType): Declared parameter types
         return_type (JavaType): Method’s declared return type
     """
-    def __init__(self, name, parameter_types=[], return_type=None):
-        self.name = name
-        self.parameter_types = parameter_types
+    __slots__ = ("name", "parameter_types", "return_type")
+
+    def __init__(self, name, parameter_types=(), return_type=None):
+        self.name = sys.intern(name)
+        self.parameter_types = tuple(parameter_types)
         self.return_type = return_type
 
 
+class OverloadSet(object):
+    """All the methods with one name that a type has, or all the constructors of a type, indexed by
+    number of parameters.
+
+    Attributes:
+        members (tuple of JavaMethod or JavaConstructor): The overloads, in declaration order, with a
+            type’s own methods before inherited ones
+        by_arity (dict): For each number of parameters, a tuple of the members that take that many
+        return_type (JavaType): The return type all the members share, or None if they differ (or
+            are constructors)
+    """
+    __slots__ = ("members", "by_arity", "return_type")
+
+    def __init__(self, members):
+        self.members = tuple(members)
+        self.by_arity = {}
+        for member in self.members:
+            arity = len(member.parameter_types)
+            self.by_arity[arity] = self.by_arity.get(arity, ()) + (member,)
+        return_types = {getattr(member, "return_type", None) for member in self.members}
+        self.return_type = return_types.pop() if len(return_types) == 1 else None
+
+    def __len__(self):
+        return len(self.members)
+
+    def __iter__(self):
+        return iter(self.members)
+
+    def merged_with(self, inherited):
+        """Returns an OverloadSet with these members followed by the inherited ones that they do not
+        override, i.e. that have different parameter types. Returns self if there are none.
+        """
+        signatures = {member.parameter_types for member in self.members}
+        added = [member for member in inherited.members if member.parameter_types not in signatures]
+        return OverloadSet(self.members + tuple(added)) if added else self
+
+    def applicable(self, arg_types):
+        """Returns a tuple of the members that accept arguments of the given types.
+        """
+        return tuple(
+            member for member in self.by_arity.get(len(arg_types), ())
+            if all(a.is_subtype_of(p) for a, p in zip(arg_types, member.parameter_types)))
+
+    @staticmethod
+    def most_specific(candidates):
+        """Returns a tuple of the candidates that no other candidate is more specific than, per
+        Java’s rule: a member is more specific than another with the same number of parameters
+        if each of its parameter types is a subtype of the other’s.
+        """
+        if len(candidates) < 2:
+            return tuple(candidates)
+        return tuple(
+            member for member in candidates
+            if not any(
+                other is not member
+                and other.parameter_types != member.parameter_types
+                and _more_specific(other, member)
+                for other in candidates))
+
+
+def _more_specific(a, b):
+    return all(p.is_subtype_of(q) for p, q in zip(a.parameter_types, b.parameter_types))
+
+
+def _add_overload(overloads, member):
+    # Returns the tuple of overloads with the given member added, replacing any with the same
+    # parameter types.
+    for i, existing in enumerate(overloads):
+        if existing.parameter_types == member.parameter_types:
+            return overloads[:i] + (member,) + overloads[i + 1:]
+    return overloads + (member,)
+
+
 class JavaPrimitiveType(JavaType):
     """A primitive type such as int or double.
 
     Primitive types are not object types and do not have methods.
     """
+    __slots__ = ()
+
     def is_subtype_of(self, other):
         return self == other
 
@@ -102,40 +241,232 @@ class JavaObjectType(JavaType):
 
     Attributes:
         name (str): The name of this class
-        direct_supertypes (list of JavaObjectType): types this class extends or implements
-        constructor (JavaConstructor): Class’s constructor (we only allow one)
-        methods (list of JavaMethod): Class's methods
+        direct_supertypes (tuple of JavaObjectType): types this class extends or implements. To
+            change them, assign a new sequence to this attribute.
+        constructors (tuple of JavaConstructor): Class’s constructors. Use add_constructor() to
+            add one.
+        constructor (JavaConstructor): Class’s first constructor. Assigning to this attribute
+            replaces all the constructors with the given one.
+        overloads (dict): Class’s own methods: for each name, a tuple of the methods with that name,
+            in declaration order
+        methods (dict): Class’s own methods by name, with only the first method declared for each
+            name. Use add_method() to add methods.
+
+    As in Java, methods (and constructors) with the same name but different parameter types are
+    overloads of each other, and calls pick the most specific one that accepts the arguments. A
+    method with the same name and parameter types as an existing one replaces it, and one with the
+    same name and parameter types as an inherited one overrides it.
     """
 
     is_object_type = True
     is_instantiable = True
 
-    def __init__(self, name, direct_supertypes=None, constructor=JavaConstructor([])):
+    __slots__ = (
+        "_direct_supertypes", "_constructors", "_constructor_set", "overloads", "methods",
+        "_ancestor_set", "_ancestors_version", "_method_table", "_method_table_version",
+        "_declaration_version")
+
+    def __init__(self, name, direct_supertypes=None, constructor=JavaConstructor()):
         super().__init__(name)
         self.name = name
         if direct_supertypes is None:
-            self.direct_supertypes = [JavaBuiltInTypes.OBJECT]
-        else:
-            self.direct_supertypes = direct_supertypes
-        self.constructor = constructor
+            direct_supertypes = (JavaBuiltInTypes.OBJECT,)
+        self._set_declaration(tuple(direct_supertypes), (constructor,), ())
+
+    def _set_declaration(self, direct_supertypes, constructors, methods):
+        # Fills in a new type without the checks and version bumps the public setters make, so that
+        # loaders can create types with `JavaObjectType.__new__` and link them together afterwards.
+        self._direct_supertypes = direct_supertypes
+        self._constructors = ()
+        for constructor in constructors:
+            self._constructors = _add_overload(self._constructors, constructor)
+        self._constructor_set = None
+        self.overloads = {}
         self.methods = {}
+        for method in methods:
+            self._declare_method(method)
+        self._ancestor_set = None
+        self._ancestors_version = None
+        self._method_table = None
+        self._method_table_version = None
+        self._declaration_version = _UniverseVersion.current
+
+    @property
+    def constructor(self):
+        return self._constructors[0]
+
+    @constructor.setter
+    def constructor(self, constructor):
+        self._check_not_frozen()
+        self._constructors = (constructor,)
+        self._constructor_set = None
+        _UniverseVersion.bump()
+
+    @property
+    def constructors(self):
+        return self._constructors
+
+    def add_constructor(self, constructor):
+        """Adds a constructor, replacing any existing one with the same parameter types.
+        """
+        self._check_not_frozen()
+        self._constructors = _add_overload(self._constructors, constructor)
+        self._constructor_set = None
+        _UniverseVersion.bump()
+
+    def constructor_overloads(self):
+        """Returns the OverloadSet of this type’s constructors.
+        """
+        if self._constructor_set is None:
+            self._constructor_set = OverloadSet(self._constructors)
+        return self._constructor_set
+
+    @property
+    def direct_supertypes(self):
+        return self._direct_supertypes
+
+    @direct_supertypes.setter
+    def direct_supertypes(self, direct_supertypes):
+        self._check_not_frozen()
+        self._direct_supertypes = tuple(direct_supertypes)
+        _UniverseVersion.bump(hierarchy=True)
+        self._declaration_version = _UniverseVersion.current
+
+    def ancestors(self):
+        """Returns the set of all types this type is a subtype of, including itself.
+
+        The set is computed once and cached until the type hierarchy changes. Supertypes share their
+        own cached sets, so the work for a diamond-shaped hierarchy is proportional to its size.
+        Types in a FrozenTypeUniverse compute theirs when they are frozen, and never again.
+        """
+        if self._ancestors_version != _UniverseVersion.hierarchy and self._universe is None:
+            self._update_supertypes_first(
+                lambda t: t._ancestors_version != _UniverseVersion.hierarchy,
+                JavaObjectType._update_ancestors)
+        return self._ancestor_set
+
+    def _update_ancestors(self):
+        ancestors = {self}
+        for supertype in self._direct_supertypes:
+            ancestors |= supertype._ancestor_set
+        self._ancestor_set = frozenset(ancestors)
+        self._ancestors_version = _UniverseVersion.hierarchy
+
+    def method_table(self):
+        """Returns a dict of all the methods this type has, whether declared or inherited, as an
+        OverloadSet for each name.
+
+        Each set lists the type’s own overloads first, then those of each direct supertype’s table,
+        in the order the supertypes are declared, leaving out any whose parameter types are already
+        in the set. So when several supertypes provide a method with the same signature, the one
+        that wins is the one a depth-first, left-to-right search of the hierarchy would find first.
+
+        Do not modify the returned dict.
+
+        The table is cached until the methods or supertypes of this type or one of its ancestors
+        change, and is rebuilt from the supertypes’ own tables, so only stale tables are ever
+        recomputed. Types in a FrozenTypeUniverse build theirs when they are frozen, and never again.
+        """
+        if self._method_table_version != _UniverseVersion.current and self._universe is None:
+            self._update_supertypes_first(
+                JavaObjectType._method_table_is_stale, JavaObjectType._update_method_table)
+        return self._method_table
+
+    def _method_table_is_stale(self):
+        # A table is stale if this type or any of its ancestors has changed its declaration since
+        # the table was built or last found fresh. Changes to unrelated types only cost this check.
+        # (A type that gains a supertype records that as a change to its own declaration, so the
+        # ancestors that come with it need not be newer than the table to make it stale.)
+        version = self._method_table_version
+        if version == _UniverseVersion.current:
+            return False
+        if version is None or any(t._declaration_version > version for t in self.ancestors()):
+            return True
+        self._method_table_version = _UniverseVersion.current
+        return False
+
+    def _update_method_table(self):
+        table = {name: OverloadSet(overloads) for name, overloads in self.overloads.items()}
+        for supertype in self._direct_supertypes:
+            for name, inherited in supertype._method_table.items():
+                own = table.get(name)
+                if own is None:
+                    table[name] = inherited  # Shared with the supertype until something overrides it
+                elif own is not inherited:
+                    table[name] = own.merged_with(inherited)
+        self._method_table = table
+        self._method_table_version = _UniverseVersion.current
+
+    def _update_supertypes_first(self, is_stale, update):
+        # Calls update() on this type and all of its stale transitive supertypes, supertypes first,
+        # using an explicit stack so that very deep hierarchies do not exhaust the recursion limit.
+        # Frozen types are never stale: their caches were filled in when they were frozen, and
+        # writing to them again could race with threads reading them.
+        path = set()
+        stack = [(self, False)]
+        while stack:
+            current, supertypes_done = stack.pop()
+            if supertypes_done:
+                update(current)
+                path.discard(current)
+            elif current._universe is None and is_stale(current):
+                if current in path:
+                    validate_hierarchy([self])
+                path.add(current)
+                stack.append((current, True))
+                stack.extend((s, False) for s in current._direct_supertypes)
 
     def add_method(self, method):
-        self.methods[method.name] = method
-
-    def method_named(self, name):
-        try:
-            return self.methods[name]
-        except KeyError:
-            for supertype in self.direct_supertypes:
-                try:
-                    return supertype.method_named(name)
-                except NoSuchJavaMethod:
-                    pass
-            raise NoSuchJavaMethod("{0} has no method named {1}".format(self.name, name))
+        """Adds a method, replacing any existing one with the same name and parameter types.
+        """
+        self._check_not_frozen()
+        self._declare_method(method)
+        _UniverseVersion.bump()
+        self._declaration_version = _UniverseVersion.current
+
+    def remove_method(self, method):
+        """Removes the given method, which must be one of this type’s own methods.
+
+        Raises:
+            ValueError if the type does not declare the method
+        """
+        self._check_not_frozen()
+        overloads = self.overloads.get(method.name, ())
+        if method not in overloads:
+            raise ValueError("{0} does not declare {1}".format(self.qualified_name, method.name))
+        overloads = tuple(m for m in overloads if m is not method)
+        if overloads:
+            self.overloads[method.name] = overloads
+            self.methods[method.name] = overloads[0]
+        else:
+            del self.overloads[method.name]
+            del self.methods[method.name]
+        _UniverseVersion.bump()
+        self._declaration_version = _UniverseVersion.current
+
+    def _declare_method(self, method):
+        overloads = _add_overload(self.overloads.get(method.name, ()), method)
+        self.overloads[method.name] = overloads
+        self.methods[method.name] = overloads[0]
+
+    def _check_not_frozen(self):
+        if self._universe is not None:
+            raise FrozenTypeUniverseError(
+                "Cannot modify {0}: it belongs to a frozen type universe".format(self.qualified_name))
+
+    def find_overloads(self, name):
+        return self.method_table().get(name)
+
+    def no_such_method_message(self, name):
+        return "{0} has no method named {1}".format(self.qualified_name, name)
     
     def is_subtype_of(self, other):
-        return self == other or any(filter(lambda supertypes: supertypes.is_subtype_of(other), self.direct_supertypes))
+        universe = self._universe
+        if universe is not None:
+            other_universe = getattr(other, "_universe", None)
+            if other_universe is universe or other_universe is JavaBuiltInTypes.UNIVERSE:
+                return self._ancestor_bits >> other._type_id & 1 == 1
+        return other in self.ancestors()
 
 
 class JavaVoidType(JavaType):
@@ -144,6 +475,7 @@ class JavaVoidType(JavaType):
     It is never legal to use the result of a method returning void inside a larger expression.
     Void is therefore subtype only of itself, and not any other type.
     """
+    __slots__ = ()
     
     is_object_type = False
     is_instantiable = False
@@ -161,6 +493,7 @@ class JavaNullType(JavaType):
     Null acts as though it is a subtype of all object types. However, it raises an exception for any
     attempt to look up a method.
     """
+    __slots__ = ()
     
     is_object_type = True
     is_instantiable = False
@@ -174,16 +507,93 @@ class JavaNullType(JavaType):
 
 class JavaTypeError(Exception):
     """Indicates a compile-time type error in an expression.
+
+    The errors the type checker raises describe what went wrong with structured fields (see each
+    subclass), and only format their message when somebody asks for it with `str()`. An error can
+    also be created with a ready-made message, as in `JavaTypeError("Something is wrong")`.
+
+    Attributes:
+        expression (JavaExpression): The expression where the error was found, or None
     """
-    pass
+    expression = None
+
+    def __init__(self, message=None, **fields):
+        super().__init__(*(() if message is None else (message,)))
+        self._message = message
+        self.__dict__.update(fields)
+
+    def __str__(self):
+        if self._message is None:
+            self._message = self._format()
+        return self._message
+
+    def __repr__(self):
+        return f"{type(self).__name__}({str(self)!r})"
+
+    def __reduce__(self):
+        # The fields refer to types and expressions that belong to this process, so only the
+        # message is pickled.
+        return (type(self), (str(self),))
+
+    def _format(self):
+        # Returns the message for an error created from fields. Subclasses override this.
+        return ""
 
 
 class NoSuchJavaMethod(JavaTypeError):
     """Indicates a call to a nonexistent method on a Java object.
+
+    Attributes:
+        receiver_type (JavaType): The type that was searched for the method
+        method_name (str): The name of the missing method
+    """
+    receiver_type = None
+    method_name = None
+
+    def _format(self):
+        if self.expression is not None and self.receiver_type is JavaBuiltInTypes.NULL:
+            return f"Cannot invoke method {self.method_name}() on null"
+        return self.receiver_type.no_such_method_message(self.method_name)
+
+
+class FrozenTypeUniverseError(Exception):
+    """Raised on an attempt to modify a type that belongs to a FrozenTypeUniverse.
     """
     pass
 
 
+class CyclicHierarchyError(ValueError):
+    """Raised when types are, directly or indirectly, their own supertypes. See validate_hierarchy().
+
+    Attributes:
+        cycles (list of tuple of JavaObjectType): One cycle for each group of types that are
+            supertypes of each other, such as (Chicken, Egg) when Chicken extends Egg and Egg
+            extends Chicken. Each type on a cycle directly extends the next, and the last one
+            extends the first.
+        involved (list of tuple of JavaObjectType): For each cycle, all the types in its group,
+            which can include types on other cycles through the same types
+    """
+    def __init__(self, cycles=(), involved=None, message=None):
+        self.cycles = list(cycles)
+        self.involved = list(self.cycles if involved is None else involved)
+        if message is None:
+            message = "Cyclic type hierarchy: " + "; ".join(
+                _describe_cycle(cycle, group) for cycle, group in zip(self.cycles, self.involved))
+        super().__init__(message)
+
+    def __reduce__(self):
+        # The cycles refer to types that belong to this process, so only the message is pickled.
+        return (type(self), ((), (), str(self)))
+
+
+def _describe_cycle(cycle, group):
+    description = " extends ".join(t.qualified_name for t in cycle + cycle[:1])
+    others = [t.qualified_name for t in group if t not in cycle]
+    if others:
+        description += ", also involving " + ", ".join(others)
+    return description
+
+
 class JavaBuiltInTypes:
     """The types that are built into the Java language itself.
 
@@ -203,3 +613,164 @@ class JavaBuiltInTypes:
     )
     OBJECT.add_method(JavaMethod("equals", parameter_types=[OBJECT], return_type=BOOLEAN))
     OBJECT.add_method(JavaMethod("hashCode", return_type=INT))
+
+    ALL = (VOID, BOOLEAN, INT, DOUBLE, NULL, OBJECT)  #: All of the above
+
+    #: The FrozenTypeUniverse of just the types above, which they belong to from the first time any
+    #: universe is frozen, or None until then. They count as members of every other universe too.
+    UNIVERSE = None
+
+
+def least_upper_bounds(a, b):
+    """Returns the least upper bounds of two types: the frozenset of their common supertypes that
+    are not supertypes of another common supertype.
+
+    If one type is a subtype of the other, the result is just the other, so null joins with any
+    object type to give that type. When neither is, the result can have several members: two
+    classes that both implement the unrelated interfaces Strokable and Fillable have the least
+    upper bounds {Strokable, Fillable}, while Object, a common supertype of every pair of object
+    types, is not a least one. Primitive types and void are only subtypes of themselves, so they
+    have no upper bound in common with any other type, and the result is empty.
+
+    Results are cached until the type hierarchy changes. For two members of the same
+    FrozenTypeUniverse, they come from the universe (see FrozenTypeUniverse.least_upper_bounds()).
+    The built-in types are members of every universe.
+    """
+    universe, b_universe = a._universe, b._universe
+    if universe is JavaBuiltInTypes.UNIVERSE:
+        universe = b_universe
+    elif b_universe is not universe and b_universe is not JavaBuiltInTypes.UNIVERSE:
+        universe = None
+    if universe is not None:
+        result = universe._joins.get((a, b))
+        return universe.least_upper_bounds(a, b) if result is None else result
+    if _Joins.version != _UniverseVersion.hierarchy:
+        _Joins.cache = {}
+        _Joins.version = _UniverseVersion.hierarchy
+    cache = _Joins.cache
+    result = cache.get((a, b))
+    if result is None:
+        result = cache[(a, b)] = cache[(b, a)] = _compute_least_upper_bounds(a, b)
+    return result
+
+
+class _Joins:
+    # The results of least_upper_bounds() for types outside frozen universes, by pair of types, and
+    # the hierarchy version they are valid for
+    version = None
+    cache = {}
+
+
+def _compute_least_upper_bounds(a, b):
+    if a.is_subtype_of(b):
+        return frozenset((b,))
+    if b.is_subtype_of(a):
+        return frozenset((a,))
+    if not (isinstance(a, JavaObjectType) and isinstance(b, JavaObjectType)):
+        return frozenset()
+    common = a.ancestors() & b.ancestors()
+    # Every proper supertype of a common supertype is itself common, and not least. Ancestor sets
+    # are closed, so a type already known not to be least has had its supertypes collected too.
+    not_least = set()
+    for t in common:
+        for supertype in t.direct_supertypes:
+            if supertype not in not_least:
+                not_least |= supertype.ancestors()
+    return frozenset(common - not_least)
+
+
+def validate_hierarchy(types):
+    """Checks that none of the given types, or the types they extend, is its own supertype, in
+    time proportional to the number of types and supertype declarations.
+
+    Loaders and FrozenTypeUniverse run this before building anything from the hierarchy, so that a
+    bad universe fails right away. Caches that are built lazily detect cycles as they go, and then
+    run it to report them all.
+
+    Raises:
+        CyclicHierarchyError listing every cycle
+    """
+    components = _cyclic_components(types)
+    if components:
+        raise CyclicHierarchyError(
+            [_cycle_through(component) for component in components], components)
+
+
+def find_hierarchy_cycles(types):
+    """Returns a list with one cycle (see CyclicHierarchyError.cycles) for each group of types that
+    are supertypes of each other, among the given types and the types they extend.
+    """
+    return [_cycle_through(component) for component in _cyclic_components(types)]
+
+
+def _cyclic_components(types):
+    # Tarjan’s strongly connected components algorithm, with an explicit stack so that very deep
+    # hierarchies do not exhaust the recursion limit. Returns the components that contain a cycle,
+    # as tuples in the order their first type was reached, each starting with that type.
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    component_stack = []
+    components = []
+    for root in types:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        component_stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(_direct_supertypes(root)))]
+        while work:
+            t, supertypes = work[-1]
+            for supertype in supertypes:
+                if supertype not in index:
+                    index[supertype] = lowlink[supertype] = len(index)
+                    component_stack.append(supertype)
+                    on_stack.add(supertype)
+                    work.append((supertype, iter(_direct_supertypes(supertype))))
+                    break
+                if supertype in on_stack and index[supertype] < lowlink[t]:
+                    lowlink[t] = index[supertype]
+            else:
+                work.pop()
+                if work and lowlink[t] < lowlink[work[-1][0]]:
+                    lowlink[work[-1][0]] = lowlink[t]
+                if lowlink[t] == index[t]:
+                    component = []
+                    while True:
+                        member = component_stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member is t:
+                            break
+                    if len(component) > 1 or t in _direct_supertypes(t):
+                        component.sort(key=index.__getitem__)
+                        components.append(tuple(component))
+    components.sort(key=lambda component: index[component[0]])
+    return components
+
+
+def _direct_supertypes(t):
+    return t._direct_supertypes if isinstance(t, JavaObjectType) else ()
+
+
+def _cycle_through(component):
+    # Returns a shortest cycle through the first type of a strongly connected component, found by
+    # a breadth-first search of the component.
+    start = component[0]
+    members = set(component)
+    came_from = {}
+    frontier = [start]
+    while frontier:
+        next_frontier = []
+        for t in frontier:
+            for supertype in t._direct_supertypes:
+                if supertype is start:
+                    cycle = [t]
+                    while cycle[-1] is not start:
+                        cycle.append(came_from[cycle[-1]])
+                    cycle.reverse()
+                    return tuple(cycle)
+                if supertype in members and supertype not in came_from:
+                    came_from[supertype] = t
+                    next_frontier.append(supertype)
+        frontier = next_frontier
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+import sys
+from types import MappingProxyType
+
+from .types import JavaBuiltInTypes, JavaObjectType, JavaType, validate_hierarchy
+
+
+class FrozenTypeUniverse(object):
+    """A fixed set of Java types that can no longer change, numbered so that subtype tests are
+    cheap.
+
+    Every type in the universe gets a dense integer ID, and a bitset (stored as a Python int) of the
+    IDs of all the types it is a subtype of. Once frozen, `JavaObjectType.is_subtype_of()` between
+    two members of the same universe is a single bit test.
+
+    Any attempt to modify a frozen type (`add_method`, `add_constructor`, assigning
+    `direct_supertypes` or `constructor`, or changing its `methods` or `overloads`) raises
+    FrozenTypeUniverseError.
+
+    Freezing also builds every member’s ancestor set, method table and constructor OverloadSet up
+    front, and makes the tables read-only. From then on, nothing about a frozen type is written
+    again, even when other, unfrozen types change.
+
+    Every universe includes the built-in types, as its first members, so they have the same IDs in
+    all of them. They are frozen only once, into `JavaBuiltInTypes.UNIVERSE`, the first time any
+    universe is frozen (until then they can be changed like any other type), and each universe
+    keeps its own view of them in its indexes: freezing another universe does not write to them.
+    Other types that are frozen again, as part of a new universe, join the new one.
+
+    Thread safety: once frozen, any number of threads may type check expressions over the
+    universe’s types at the same time, without locks, including on free-threaded Python builds.
+    The expressions may be shared between threads: the only state checking writes is each node’s
+    memo and the universe’s cache of least upper bounds, and every value a thread writes there is
+    correct for the frozen types, so it does not matter which thread’s write wins. The memo and the
+    caches of unfrozen types are not protected, so do not modify unfrozen types that checked
+    expressions depend on while other threads are checking, do not freeze a new universe that
+    includes types of one that other threads are checking over, and do not share an
+    ExpressionInterner between threads.
+
+    Use `freeze()` to create one, before starting the threads.
+
+    Attributes:
+        types (tuple of JavaType): All types in the universe, indexed by their ID
+    """
+    def __init__(self, types):
+        self.types = JavaBuiltInTypes.ALL + tuple(t for t in types if t not in _BUILT_IN_SET)
+        validate_hierarchy(self.types)
+        if JavaBuiltInTypes.UNIVERSE is None and len(self.types) > len(JavaBuiltInTypes.ALL):
+            FrozenTypeUniverse(())  # Freezes the built-in types on their own first
+        self._ids = {t: i for i, t in enumerate(self.types)}
+        self._ancestor_bits = [self._compute_ancestor_bits(t) for t in self.types]
+        self._joins = {}  # Results of least_upper_bounds() by pair of types
+
+        # Only JavaBuiltInTypes.UNIVERSE freezes the built-in types
+        first_member = 0 if JavaBuiltInTypes.UNIVERSE is None else len(JavaBuiltInTypes.ALL)
+
+        # Fill in all the lazily computed caches while the types can still write to them
+        object_types = [t for t in self.types[first_member:] if isinstance(t, JavaObjectType)]
+        for t in object_types:
+            t.method_table()
+            t.constructor_overloads()
+
+        for type_id in range(first_member, len(self.types)):
+            t = self.types[type_id]
+            t._universe = self
+            t._type_id = type_id
+            t._ancestor_bits = self._ancestor_bits[type_id]
+        for t in object_types:
+            t.overloads = MappingProxyType(dict(t.overloads))
+            t.methods = MappingProxyType(dict(t.methods))
+            t._method_table = MappingProxyType(dict(t._method_table))
+            for overload_set in t._method_table.values():
+                _freeze_overload_set(overload_set)
+            _freeze_overload_set(t._constructor_set)
+        if first_member == 0:
+            JavaBuiltInTypes.UNIVERSE = self
+
+    def _compute_ancestor_bits(self, t):
+        bits = 0
+        if isinstance(t, JavaObjectType):
+            supertypes = t.ancestors()
+        else:
+            supertypes = [other for other in self.types if t.is_subtype_of(other)]
+        for supertype in supertypes:
+            bits |= 1 << self._ids[supertype]
+        return bits
+
+    def __len__(self):
+        return len(self.types)
+
+    def __contains__(self, t):
+        return t in self._ids
+
+    def type_id(self, t):
+        """Returns the integer ID of the given type within this universe.
+
+        Raises:
+            KeyError if the type is not part of this universe
+        """
+        return self._ids[t]
+
+    def is_subtype(self, subtype, supertype):
+        """Equivalent to `subtype.is_subtype_of(supertype)` for any two members of this universe,
+        including primitive and special types.
+        """
+        return self._ancestor_bits[self._ids[subtype]] >> self._ids[supertype] & 1 == 1
+
+    def least_upper_bounds(self, a, b):
+        """Equivalent to `types.least_upper_bounds(a, b)` for any two members of this universe.
+        Computed from the two types’ ancestor bitsets, and cached for the life of the universe.
+        """
+        result = self._joins.get((a, b))
+        if result is None:
+            bits = self._ancestor_bits
+            common = bits[self._ids[a]] & bits[self._ids[b]]
+            # Clear the bits of every proper supertype of each common supertype
+            least = common
+            remaining = common
+            while remaining:
+                lowest = remaining & -remaining
+                least &= ~bits[lowest.bit_length() - 1] | lowest
+                remaining ^= lowest
+            result = frozenset(self.types[i] for i in _bit_indexes(least))
+            self._joins[(a, b)] = self._joins[(b, a)] = result
+        return result
+
+    def stats(self):
+        """Returns a dict describing the size of this universe and the memory its indexes use.
+        """
+        object_types = [t for t in self.types if isinstance(t, JavaObjectType)]
+        bitset_bytes = sum(sys.getsizeof(bits) for bits in self._ancestor_bits)
+        index_bytes = (
+            sys.getsizeof(self.types)
+            + sys.getsizeof(self._ids)
+            + sys.getsizeof(self._ancestor_bits))
+        return {
+            "types": len(self.types),
+            "object_types": len(object_types),
+            "methods": sum(len(overloads) for t in object_types for overloads in t.overloads.values()),
+            "subtype_pairs": sum(bin(bits).count("1") for bits in self._ancestor_bits),
+            "bitset_bytes": bitset_bytes,
+            "index_bytes": index_bytes,
+            "total_bytes": bitset_bytes + index_bytes,
+        }
+
+
+def _bit_indexes(bits):
+    indexes = []
+    while bits:
+        lowest = bits & -bits
+        indexes.append(lowest.bit_length() - 1)
+        bits ^= lowest
+    return indexes
+
+
+def _freeze_overload_set(overload_set):
+    if not isinstance(overload_set.by_arity, MappingProxyType):
+        overload_set.by_arity = MappingProxyType(overload_set.by_arity)
+
+
+def freeze(types):
+    """Freezes the given types and every type reachable from them into a new FrozenTypeUniverse,
+    which also includes the built-in types.
+
+    A type is reachable if it is a supertype, constructor parameter type, method parameter type, or
+    method return type of a type that is itself reachable.
+
+    Raises:
+        CyclicHierarchyError if any of the types is its own supertype, before anything is frozen
+    """
+    return FrozenTypeUniverse(reachable_types(JavaBuiltInTypes.ALL + tuple(types)))
+
+
+_BUILT_IN_SET = frozenset(JavaBuiltInTypes.ALL)
+
+
+def reachable_types(types):
+    """Returns a list of the given types and all types reachable from them (see freeze()), in the
+    order they are discovered.
+    """
+    reachable = {}  # Used as an ordered set
+    pending = list(types)
+    pending.reverse()
+    while pending:
+        t = pending.pop()
+        if t in reachable or not isinstance(t, JavaType):
+            continue
+        reachable[t] = None
+        if isinstance(t, JavaObjectType):
+            pending.extend(reversed(_referenced_types(t)))
+    return list(reachable)
+
+
+def _referenced_types(object_type):
+    referenced = list(object_type.direct_supertypes)
+    for constructor in object_type.constructors:
+        referenced.extend(constructor.parameter_types)
+    for overloads in object_type.overloads.values():
+        for method in overloads:
+            referenced.extend(method.parameter_types)
+            referenced.append(method.return_type)
+    return referenced
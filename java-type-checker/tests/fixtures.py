@@ -91,7 +91,7 @@ class Graphics:
     color = JavaObjectType(
         "Color",
         direct_supertypes=[paint],
-        constructor=JavaConstructor([int, int, int])
+        constructor=JavaConstructor([JavaBuiltInTypes.INT, JavaBuiltInTypes.INT, JavaBuiltInTypes.INT])
     )
 
     # interface Fillable {
@@ -166,3 +166,83 @@ class Graphics:
     window.add_method(
         JavaMethod("getSize",
             return_type=size))
+
+
+def graphics_types():
+    """
+    Returns all the object types declared in Graphics.
+    """
+    return [t for t in vars(Graphics).values() if isinstance(t, JavaObjectType)]
+
+
+class CountingType(JavaObjectType):
+    """
+    An object type that counts how many times its methods are looked up, for tests that check how
+    much work the type checker does.
+    """
+    def __init__(self, name):
+        super().__init__(name)
+        self.lookups = 0
+
+    def find_overloads(self, name):
+        self.lookups += 1
+        return super().find_overloads(name)
+
+
+def sample_expressions():
+    """
+    A mix of well-typed and ill-typed expressions over the Graphics types, for tests that compare
+    different ways of checking the same expressions. Returns new nodes on every call.
+    """
+    rect = JavaVariable("rect", Graphics.rectangle)
+    group = JavaVariable("group", Graphics.graphics_group)
+    gobj = JavaVariable("gobj", Graphics.graphics_object)
+    red = JavaVariable("red", Graphics.color)
+    window = JavaVariable("window", Graphics.window)
+    x = JavaVariable("x", JavaBuiltInTypes.INT)
+    zero = JavaLiteral("0.0", JavaBuiltInTypes.DOUBLE)
+
+    return [
+        # Well-typed
+        rect,
+        zero,
+        JavaNullLiteral(),
+        JavaMethodCall(rect, "getPosition"),
+        JavaMethodCall(JavaMethodCall(rect, "getSize"), "getWidth"),
+        JavaMethodCall(rect, "setFillColor", red),
+        JavaMethodCall(rect, "setFillColor", JavaNullLiteral()),
+        JavaMethodCall(rect, "equals", group),
+        JavaMethodCall(group, "add", JavaMethodCall(group, "getElementAt", JavaMethodCall(rect, "getPosition"))),
+        JavaAssignment(gobj, rect),
+        JavaAssignment(gobj, JavaMethodCall(group, "getElementAt", JavaConstructorCall(Graphics.point, zero, zero))),
+        JavaConstructorCall(Graphics.rectangle, JavaMethodCall(rect, "getPosition"), JavaMethodCall(window, "getSize")),
+
+        # Ill-typed
+        JavaMethodCall(rect, "getFunky"),
+        JavaMethodCall(x, "hashCode"),
+        JavaMethodCall(JavaNullLiteral(), "hashCode"),
+        JavaMethodCall(rect, "setPosition", zero),
+        JavaMethodCall(rect, "setPosition", zero, JavaLiteral("true", JavaBuiltInTypes.BOOLEAN)),
+        JavaMethodCall(rect, "setFillColor", JavaMethodCall(group, "getElementAt", red)),
+        JavaMethodCall(JavaMethodCall(window, "getSize", JavaLiteral("37", JavaBuiltInTypes.INT)), "getWidth"),
+        JavaMethodCall(JavaMethodCall(rect, "setFillColor", red), "hashCode"),
+        JavaAssignment(JavaVariable("r", Graphics.rectangle), JavaVariable("f", Graphics.fillable)),
+        JavaAssignment(gobj, JavaMethodCall(group, "getElementAt", rect)),
+        JavaAssignment(JavaVariable("o", JavaBuiltInTypes.OBJECT), JavaMethodCall(rect, "setFillColor", red)),
+        JavaConstructorCall(JavaBuiltInTypes.INT),
+        JavaConstructorCall(JavaBuiltInTypes.NULL, JavaMethodCall(rect, "getFunky")),
+        JavaConstructorCall(Graphics.rectangle, JavaVariable("p", Graphics.point)),
+        JavaConstructorCall(Graphics.rectangle, JavaVariable("p", Graphics.point), JavaMethodCall(rect, "getFunky")),
+    ]
+
+
+def check_types_outcome(expr):
+    """
+    Returns (error class, error message) for the error check_types() raises on the given expression,
+    or None if it raises no error.
+    """
+    try:
+        expr.check_types()
+    except JavaTypeError as error:
+        return (type(error), str(error))
+    return None
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import CountingType, Graphics, check_types_outcome, sample_expressions
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestCheckMany(TypeTest):
+
+    def test_00_results_agree_with_check_types(self):
+        expressions = sample_expressions()
+        batch = check_many(expressions)
+        self.assertEqual(len(expressions), len(batch.results))
+        for expr, result in zip(expressions, batch.results):
+            expected = check_types_outcome(expr)
+            if expected is None:
+                self.assertTrue(result.ok)
+                self.assertEqual(expr.static_type(), result.static_type)
+            else:
+                self.assertFalse(result.ok)
+                self.assertEqual(expected, (result.error_class, result.message))
+
+    def test_01_reports_aggregates(self):
+        batch = check_many(sample_expressions())
+        summary = batch.summary()
+        self.assertEqual(len(batch.results), summary["expressions"])
+        self.assertEqual(12, summary["ok"])
+        self.assertEqual(batch.error_count, sum(summary["errors"].values()))
+        self.assertEqual(5, summary["errors"]["NoSuchJavaMethod"])
+        self.assertGreaterEqual(batch.elapsed, 0)
+
+    def test_02_checks_shared_nodes_once(self):
+        builder = CountingType("Builder")
+        builder.add_method(JavaMethod("next", return_type=builder))
+        builder.add_method(JavaMethod("wrap", parameter_types=[builder], return_type=builder))
+        shared = JavaMethodCall(JavaMethodCall(JavaVariable("b", builder), "next"), "next")
+        broken = JavaMethodCall(shared, "frob")
+
+        batch = check_many(
+            [JavaMethodCall(shared, "wrap", shared) for i in range(10)]
+            + [JavaMethodCall(broken, "next") for i in range(10)])
+        self.assertEqual(10, batch.ok_count)
+        self.assertEqual(
+            ["Builder has no method named frob"] * 10,
+            [r.message for r in batch.results[10:]])
+        self.assertEqual(2 + 10 + 1 + 10, batch.unique_nodes)
+        self.assertEqual(2 + 10 + 1, builder.lookups)  # Calls on the broken receiver are never looked up
+
+    def test_03_accepts_any_iterable(self):
+        batch = check_many(iter([JavaVariable("p", Graphics.point), JavaNullLiteral()]))
+        self.assertEqual([True, True], [r.ok for r in batch.results])
+
+
+if __name__ == '__main__':
+    unittest.main()
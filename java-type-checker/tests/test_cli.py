@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker import cli
+from java_type_checker.cli import iter_corpus, main
+from java_type_checker.serialization import expression_to_json, universe_from_json, universe_to_json
+from java_type_checker.snapshot import save_snapshot
+from tests.fixtures import check_types_outcome, graphics_types, sample_expressions
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestCommandLine(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.universe_path = os.path.join(self.directory.name, "universe.json")
+        self.corpus_path = os.path.join(self.directory.name, "corpus.jsonl")
+        self.output_path = os.path.join(self.directory.name, "results.jsonl")
+        with open(self.universe_path, "w") as file:
+            json.dump(universe_to_json(graphics_types()), file)
+        self.expressions = sample_expressions() * 5
+        with open(self.corpus_path, "w") as file:
+            for expr in self.expressions:
+                file.write(json.dumps(expression_to_json(expr)) + "\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_main(self, *args):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            status = main([self.universe_path, self.corpus_path, "--output", self.output_path] + list(args))
+        with open(self.output_path) as file:
+            results = [json.loads(line) for line in file]
+        return status, results, stderr.getvalue()
+
+    def test_00_writes_results_in_input_order(self):
+        status, results, _ = self.run_main()
+        self.assertEqual(1, status)
+        self.assertEqual(len(self.expressions), len(results))
+        for expr, result in zip(self.expressions, results):
+            expected = check_types_outcome(expr)
+            if expected is None:
+                self.assertEqual({"ok": True, "type": expr.static_type().name}, result)
+            else:
+                self.assertEqual(
+                    {"ok": False, "error": expected[0].__name__, "message": expected[1]},
+                    result)
+
+    def test_01_parallel_results_match_serial_results(self):
+        _, serial, _ = self.run_main()
+        status, parallel, stats = self.run_main("--jobs", "2", "--shard-size", "7", "--stats")
+        self.assertEqual(1, status)
+        self.assertEqual(serial, parallel)
+        self.assertIn("total: {0} expressions".format(len(self.expressions)), stats)
+
+    def test_02_reports_undecodable_lines(self):
+        with open(self.corpus_path, "w") as file:
+            file.write('{"var": "x", "type": "Nope"}\n')
+            file.write('{"var": "x", "type": "int"}\n')
+        status, results, _ = self.run_main()
+        self.assertEqual(1, status)
+        self.assertEqual(
+            [
+                {"ok": False, "error": "InvalidExpression", "message": "Unknown type Nope"},
+                {"ok": True, "type": "int"},
+            ],
+            results)
+
+    def test_03_exit_status_is_zero_when_all_expressions_are_well_typed(self):
+        with open(self.corpus_path, "w") as file:
+            file.write('{"call": "getX", "on": {"var": "p", "type": "Point"}}\n')
+        status, results, _ = self.run_main()
+        self.assertEqual(0, status)
+        self.assertEqual([{"ok": True, "type": "double"}], results)
+
+    def test_04_accepts_snapshot_universe(self):
+        _, from_json, _ = self.run_main()
+        save_snapshot(graphics_types(), self.universe_path)
+        _, from_snapshot, _ = self.run_main("--jobs", "2")
+        self.assertEqual(from_json, from_snapshot)
+
+    def test_05_accepts_snapshot_with_packages(self):
+        types = universe_from_json({"types": [
+            {"name": "Point", "package": "a", "methods": [{"name": "getX", "returns": "double"}]},
+            {"name": "Point", "package": "b", "methods": [{"name": "toA", "returns": "a.Point"}]},
+        ]})
+        save_snapshot(types.object_types(), self.universe_path)
+        with open(self.corpus_path, "w") as file:
+            file.write('{"call": "toA", "on": {"var": "p", "type": "b.Point"}}\n')
+            file.write('{"call": "getX", "on": {"var": "p", "type": "Point"}}\n')
+        expected = [
+            {"ok": True, "type": "a.Point"},
+            {"ok": False, "error": "InvalidExpression",
+                "message": "Type name Point is ambiguous: could be a.Point, b.Point"},
+        ]
+        for args in [(), ("--jobs", "2")]:
+            status, results, _ = self.run_main(*args)
+            self.assertEqual(1, status)
+            self.assertEqual(expected, results)
+
+        # The same names in the default package cannot be told apart
+        save_snapshot([JavaObjectType("Point"), JavaObjectType("Point")], self.universe_path)
+        for args in [(), ("--jobs", "2")]:
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit) as context:
+                main([self.universe_path, self.corpus_path] + list(args))
+            self.assertEqual(2, context.exception.code)
+            self.assertIn("cannot load", stderr.getvalue())
+            self.assertIn("Type Point is declared more than once", stderr.getvalue())
+
+    def test_06_reports_assignments_to_non_variables_and_deep_nesting(self):
+        depth = 100000
+        with open(self.corpus_path, "w") as file:
+            file.write('{"assign": {"lit": "1", "type": "int"}, "value": {"lit": "true", "type": "boolean"}}\n')
+            file.write('{"call": "getX", "on": ' * depth + '{"var": "p", "type": "Point"}' + '}' * depth + "\n")
+            file.write('{"var": "x", "type": "int"}\n')
+        expected = [
+            {"ok": False, "error": "InvalidExpression", "message": "Can only assign to a variable"},
+            {"ok": False, "error": "InvalidExpression", "message": "Expression is nested too deeply"},
+            {"ok": True, "type": "int"},
+        ]
+        for args in [(), ("--jobs", "2")]:
+            status, results, _ = self.run_main(*args)
+            self.assertEqual(1, status)
+            self.assertEqual(expected, results)
+
+    def test_07_serial_runs_share_subexpressions_within_shards(self):
+        interners = []
+
+        class RecordingInterner(ExpressionInterner):
+            def __init__(self):
+                super().__init__()
+                interners.append(self)
+
+        with open(self.universe_path, "rb") as file:
+            universe_data = file.read()
+        with open(self.corpus_path) as corpus, mock.patch.object(cli, "ExpressionInterner", RecordingInterner):
+            results = list(iter_corpus(universe_data, corpus, shard_size=len(sample_expressions())))
+        _, expected, _ = self.run_main()
+        self.assertEqual(expected, results)
+        self.assertEqual(5, len(interners))
+        for interner in interners:
+            self.assertLess(interner.created, interner.requested)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker.columnar import ExpressionColumns, METHOD_CALL
+from java_type_checker.serialization import (
+    expression_from_json, expression_to_json, universe_from_json, universe_to_json)
+from tests.fixtures import graphics_types, sample_expressions
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestColumnar(TypeTest):
+
+    def setUp(self):
+        # A private copy of the Graphics types, so that freezing it leaves the shared fixtures alone
+        self.types = universe_from_json(universe_to_json(graphics_types()))
+        self.universe = freeze(self.types.object_types())
+
+    def sample_expressions(self):
+        return [
+            expression_from_json(expression_to_json(expr), self.types)
+            for expr in sample_expressions()]
+
+    def assertSameResults(self, expressions):
+        expected = check_many(expressions).results
+        actual = ExpressionColumns.from_expressions(self.universe, expressions).check()
+        self.assertEqual(
+            [(r.static_type, r.error_class, r.message) for r in expected],
+            [(r.static_type, r.error_class, r.message) for r in actual])
+
+    def test_00_results_agree_with_object_model(self):
+        self.assertSameResults(self.sample_expressions())
+
+    def test_01_stores_expressions_in_columns(self):
+        expressions = self.sample_expressions()
+        columns = ExpressionColumns.from_expressions(self.universe, expressions)
+        self.assertEqual(len(expressions), len(columns))
+        for i, expr in enumerate(expressions):
+            self.assertEqual(expression_to_json(expr), expression_to_json(columns.expression(i)))
+
+        # rect.getSize().getWidth()
+        root = columns.roots[4]
+        self.assertEqual(METHOD_CALL, columns.kinds[root])
+        self.assertEqual("getWidth", columns.strings[columns.name_ids[root]])
+        self.assertEqual(1, columns.child_counts[root])
+        receiver = columns.children[columns.child_starts[root]]
+        self.assertEqual(root - 1, receiver)
+        self.assertEqual("getSize", columns.strings[columns.name_ids[receiver]])
+        self.assertEqual(
+            columns.node_count * 21 + (len(columns.children) + len(columns)) * 4, columns.nbytes())
+
+    def test_02_overloads_constructors_and_null(self):
+        # class Shape { Shape() }
+        # class Circle extends Shape { Circle(double r) }
+        # class Canvas {
+        #     void draw(Shape s)
+        #     void draw(Circle c)
+        #     Shape pick(Shape a, Shape b)
+        # }
+        shape = self.types.declare("Shape", constructor=JavaConstructor([]))
+        circle = self.types.declare(
+            "Circle", direct_supertypes=[shape],
+            constructor=JavaConstructor([JavaBuiltInTypes.DOUBLE]))
+        canvas = self.types.declare("Canvas")
+        canvas.add_method(JavaMethod("draw", [shape], JavaBuiltInTypes.VOID))
+        canvas.add_method(JavaMethod("draw", [circle], JavaBuiltInTypes.VOID))
+        canvas.add_method(JavaMethod("pick", [shape, shape], shape))
+        self.universe = freeze([canvas])
+
+        c = JavaVariable("c", canvas)
+        new_shape = JavaConstructorCall(shape)
+        new_circle = JavaConstructorCall(circle, JavaLiteral("1.0", JavaBuiltInTypes.DOUBLE))
+        null = JavaNullLiteral()
+        self.assertSameResults([
+            new_shape,
+            new_circle,
+            JavaConstructorCall(circle),
+            JavaConstructorCall(canvas),
+            JavaMethodCall(c, "draw", new_circle),
+            JavaMethodCall(c, "draw", null),  # Ambiguous
+            JavaMethodCall(c, "pick", new_circle, null),
+            JavaMethodCall(c, "pick", null, c),
+            JavaMethodCall(JavaMethodCall(c, "pick", new_shape, new_circle), "hashCode"),
+            JavaMethodCall(JavaMethodCall(c, "draw", new_shape), "hashCode"),
+            JavaAssignment(JavaVariable("s", shape), JavaMethodCall(c, "pick", null, null)),
+            JavaAssignment(JavaVariable("k", circle), JavaMethodCall(c, "pick", null, null)),
+        ])
+
+    def test_03_well_typed_calls_are_checked_in_columns(self):
+        rect = self.types["Rectangle"]
+        position = JavaMethodCall(JavaVariable("rect", rect), "getPosition")
+        chain = position
+        for _ in range(10000):
+            chain = JavaMethodCall(chain, "add", position)
+        expressions = self.sample_expressions()[:12] + [chain]
+        columns = ExpressionColumns.from_expressions(self.universe, expressions)
+
+        node_types = columns._check_nodes()
+        self.assertTrue(all(node_types[root] >= 0 for root in columns.roots))
+        self.assertEqual(
+            [expr.static_type() for expr in expressions],
+            [result.static_type for result in columns.check()])
+
+    def test_04_rejects_types_outside_the_universe(self):
+        columns = ExpressionColumns(self.universe)
+        columns.append(JavaVariable("rect", self.types["Rectangle"]))
+        stranger = JavaObjectType("Stranger")
+        with self.assertRaises(KeyError):
+            columns.append(JavaMethodCall(JavaVariable("s", stranger), "hashCode"))
+        self.assertEqual((1, 1), (len(columns), columns.node_count))
+
+    def test_05_conditionals(self):
+        rect = JavaVariable("rect", self.types["Rectangle"])
+        group = JavaVariable("group", self.types["GraphicsGroup"])
+        flag = JavaVariable("flag", JavaBuiltInTypes.BOOLEAN)
+        number = JavaVariable("n", JavaBuiltInTypes.INT)
+        expressions = [
+            JavaConditional(flag, rect, group),
+            JavaMethodCall(JavaConditional(flag, rect, group), "getPosition"),
+            JavaConditional(flag, JavaNullLiteral(), rect),
+            JavaConditional(number, rect, group),  # Not boolean
+            JavaConditional(flag, rect, number),  # No common supertype
+            JavaConditional(flag, JavaMethodCall(rect, "getSize"), JavaMethodCall(rect, "getSize")),
+        ]
+        self.assertSameResults(expressions)
+        columns = ExpressionColumns.from_expressions(self.universe, expressions)
+        self.assertEqual(
+            [expression_to_json(expr) for expr in expressions],
+            [expression_to_json(columns.expression(i)) for i in range(len(columns))])
+        self.assertEqual(
+            [self.types["GraphicsObject"], self.types["Point"], self.types["Rectangle"]],
+            [columns.universe.types[columns._check_nodes()[root]] for root in columns.roots[:3]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+import unittest
+
+
+class TestCompactLayout(unittest.TestCase):
+
+    def test_00_nodes_and_declarations_have_no_instance_dict(self):
+        rect = JavaVariable("rect", Graphics.rectangle)
+        for obj in [
+            rect,
+            JavaLiteral("0.0", JavaBuiltInTypes.DOUBLE),
+            JavaNullLiteral(),
+            JavaMethodCall(rect, "getSize"),
+            JavaConstructorCall(Graphics.point),
+            JavaAssignment(rect, rect),
+            JavaMethod("getSize", return_type=Graphics.size),
+            JavaConstructor(),
+            JavaObjectType("Widget"),
+            JavaBuiltInTypes.INT,
+            JavaBuiltInTypes.NULL,
+            JavaBuiltInTypes.VOID,
+        ]:
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj).__name__)
+
+    def test_01_parameter_types_are_immutable_tuples(self):
+        params = [JavaBuiltInTypes.DOUBLE]
+        method = JavaMethod("scale", parameter_types=params, return_type=JavaBuiltInTypes.VOID)
+        params.append(JavaBuiltInTypes.INT)
+        self.assertEqual((JavaBuiltInTypes.DOUBLE,), method.parameter_types)
+        self.assertEqual((), JavaMethod("getX").parameter_types)
+        self.assertIs(JavaMethod("getX").parameter_types, JavaConstructor().parameter_types)
+
+    def test_02_method_names_are_interned(self):
+        name = "".join(["get", "Size"])
+        self.assertIs(
+            JavaMethodCall(JavaVariable("r", Graphics.rectangle), "getSize").method_name,
+            JavaMethodCall(JavaVariable("r", Graphics.rectangle), name).method_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker.serialization import (
+    expression_from_json, expression_to_json, universe_from_json, universe_to_json)
+from java_type_checker.types import _compute_least_upper_bounds
+from tests.fixtures import Graphics, graphics_types
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestConditional(TypeTest):
+
+    def setUp(self):
+        # class Polygon implements Strokable, Fillable { }
+        self.polygon = JavaObjectType(
+            "Polygon", direct_supertypes=[Graphics.strokable, Graphics.fillable])
+
+        self.flag = JavaVariable("flag", JavaBuiltInTypes.BOOLEAN)
+        self.rect = JavaVariable("rect", Graphics.rectangle)
+        self.group = JavaVariable("group", Graphics.graphics_group)
+
+    def assertBounds(self, expected, a, b):
+        self.assertEqual(frozenset(expected), least_upper_bounds(a, b))
+        self.assertEqual(frozenset(expected), least_upper_bounds(b, a))
+
+    def test_00_least_upper_bounds(self):
+        self.assertBounds([Graphics.graphics_object], Graphics.rectangle, Graphics.graphics_group)
+        self.assertBounds([Graphics.graphics_object], Graphics.rectangle, Graphics.graphics_object)
+        self.assertBounds([Graphics.rectangle], Graphics.rectangle, Graphics.rectangle)
+        self.assertBounds([Graphics.paint], Graphics.color, Graphics.paint)
+        self.assertBounds([JavaBuiltInTypes.OBJECT], Graphics.rectangle, Graphics.window)
+        self.assertBounds([Graphics.strokable, Graphics.fillable], Graphics.rectangle, self.polygon)
+
+        self.assertBounds([Graphics.point], Graphics.point, JavaBuiltInTypes.NULL)
+        self.assertBounds([JavaBuiltInTypes.NULL], JavaBuiltInTypes.NULL, JavaBuiltInTypes.NULL)
+        self.assertBounds([JavaBuiltInTypes.INT], JavaBuiltInTypes.INT, JavaBuiltInTypes.INT)
+        self.assertBounds([], JavaBuiltInTypes.INT, JavaBuiltInTypes.DOUBLE)
+        self.assertBounds([], JavaBuiltInTypes.INT, JavaBuiltInTypes.NULL)
+        self.assertBounds([], JavaBuiltInTypes.VOID, JavaBuiltInTypes.OBJECT)
+
+    def test_01_cache_follows_hierarchy_changes(self):
+        base = JavaObjectType("Base")
+        a = JavaObjectType("A", direct_supertypes=[base])
+        b = JavaObjectType("B")
+        self.assertBounds([JavaBuiltInTypes.OBJECT], a, b)
+        self.assertIs(least_upper_bounds(a, b), least_upper_bounds(b, a))
+
+        b.direct_supertypes = [base]
+        self.assertBounds([base], a, b)
+
+    def test_02_frozen_universe_agrees(self):
+        types = universe_from_json(universe_to_json(graphics_types() + [self.polygon]))
+        universe = freeze(types.object_types())
+        for a in universe.types:
+            for b in universe.types:
+                self.assertEqual(_compute_least_upper_bounds(a, b), least_upper_bounds(a, b))
+        self.assertEqual(
+            {types["Strokable"], types["Fillable"]},
+            universe.least_upper_bounds(types["Rectangle"], types["Polygon"]))
+
+    def test_03_static_type_is_the_least_upper_bound(self):
+        expr = JavaConditional(self.flag, self.rect, self.group)
+        self.assertEqual(Graphics.graphics_object, infer(expr))
+        self.assertEqual(Graphics.graphics_object, expr.static_type())
+        self.assertEqual(
+            Graphics.rectangle, infer(JavaConditional(self.flag, JavaNullLiteral(), self.rect)))
+        self.assertNoCompileErrors(JavaMethodCall(expr, "getPosition"))
+        self.assertNoCompileErrors(JavaAssignment(JavaVariable("g", Graphics.graphics_object), expr))
+
+    def test_04_errors(self):
+        self.assertCompileError(
+            JavaConditionTypeError,
+            "Condition must be boolean, but got int",
+            JavaConditional(JavaVariable("x", JavaBuiltInTypes.INT), self.rect, self.group))
+        self.assertCompileError(
+            JavaIncompatibleBranchesError,
+            "Conditional branches of type int and double have no common supertype",
+            JavaConditional(
+                self.flag,
+                JavaLiteral("1", JavaBuiltInTypes.INT),
+                JavaLiteral("1.0", JavaBuiltInTypes.DOUBLE)))
+        polygon = JavaVariable("polygon", self.polygon)
+        expr = JavaConditional(self.flag, self.rect, polygon)
+        self.assertCompileError(
+            JavaIncompatibleBranchesError,
+            "Conditional branches of type Rectangle and Polygon have no single common supertype: "
+            "could be Fillable or Strokable",
+            expr)
+        with self.assertRaises(JavaIncompatibleBranchesError) as context:
+            expr.static_type()
+        self.assertEqual((Graphics.rectangle, self.polygon), context.exception.actual)
+        self.assertCompileError(
+            NoSuchJavaMethod,
+            "GraphicsObject has no method named getSize",
+            JavaMethodCall(JavaConditional(self.flag, self.rect, self.group), "getSize"))
+
+    def test_05_void_branches(self):
+        void_call = JavaMethodCall(self.rect, "setFillColor", JavaVariable("red", Graphics.color))
+        for expr, branch in [
+            (JavaConditional(self.flag, void_call, self.rect), "true"),
+            (JavaConditional(self.flag, self.rect, void_call), "false"),
+            (JavaConditional(self.flag, void_call, void_call), "true"),
+        ]:
+            self.assertCompileError(
+                JavaVoidBranchError, f"The {branch} branch of a conditional cannot be void", expr)
+            with self.assertRaises(JavaVoidBranchError) as context:
+                expr.static_type()
+            self.assertEqual(branch, context.exception.branch)
+
+    def test_06_parsing_serialization_and_interning(self):
+        types = TypeRegistry(graphics_types())
+        variables = {
+            "flag": JavaBuiltInTypes.BOOLEAN,
+            "rect": Graphics.rectangle,
+            "group": Graphics.graphics_group,
+            "g": Graphics.graphics_object,
+        }
+        g = JavaVariable("g", Graphics.graphics_object)
+        expected = JavaAssignment(
+            g,
+            JavaConditional(
+                self.flag, JavaAssignment(g, self.rect),
+                JavaConditional(self.flag, self.group, JavaNullLiteral())))
+        expr = parse_expression("g = flag ? g = rect : flag ? group : null", types, variables)
+        self.assertEqual(expression_to_json(expected), expression_to_json(expr))
+        self.assertEqual(Graphics.graphics_object, infer(expr))
+
+        for text, message in [
+            ("flag ? rect : g = rect", "line 1, column 17: Can only assign to a variable"),
+            ("flag ? rect group", "line 1, column 13: Expected ':', found 'group'"),
+            ("(flag ? rect : group) = g", "line 1, column 23: Can only assign to a variable"),
+        ]:
+            with self.assertRaises(JavaParseError) as context:
+                parse_expression(text, types, variables)
+            self.assertIn(message, str(context.exception))
+
+        data = expression_to_json(expr)
+        self.assertEqual(data, expression_to_json(expression_from_json(data, types)))
+        interner = ExpressionInterner()
+        self.assertIs(
+            expression_from_json(data, types, interner), expression_from_json(data, types, interner))
+
+    def test_07_incremental_rechecks_after_supertype_change(self):
+        a = JavaObjectType("A")
+        b = JavaObjectType("B")
+        expr = JavaMethodCall(
+            JavaConditional(self.flag, JavaVariable("a", a), JavaVariable("b", b)), "hashCode")
+        join = JavaAssignment(
+            JavaVariable("s", Graphics.graphics_object),
+            JavaConditional(self.flag, JavaVariable("a", a), JavaVariable("b", b)))
+        checker = IncrementalChecker([expr, join])
+        self.assertEqual([True, False], [r.ok for r in checker.results])
+
+        a.direct_supertypes = [Graphics.graphics_object]
+        b.direct_supertypes = [Graphics.graphics_object]
+        changes = checker.recheck([a, b])
+        self.assertEqual([1], [change.index for change in changes])
+        self.assertTrue(checker.results[1].ok)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+from tests.helpers import TypeTest
+import sys
+import unittest
+
+
+DEPTH = sys.getrecursionlimit() * 5
+
+
+class TestDeepExpressions(TypeTest):
+
+    def setUp(self):
+        # class Builder {
+        #     Builder next()
+        #     Builder wrap(Builder b)
+        #     Point point()
+        # }
+        self.builder = JavaObjectType("Builder")
+        self.builder.add_method(JavaMethod("next", return_type=self.builder))
+        self.builder.add_method(JavaMethod("wrap", parameter_types=[self.builder], return_type=self.builder))
+        self.builder.add_method(JavaMethod("point", return_type=Graphics.point))
+        self.b = JavaVariable("b", self.builder)
+
+    def test_00_static_type_of_deep_receiver_chain(self):
+        expr = self.b
+        for i in range(DEPTH):
+            expr = JavaMethodCall(expr, "next")
+        self.assertEqual(self.builder, expr.static_type())
+
+    def test_01_checks_deep_receiver_chain(self):
+        expr = self.b
+        for i in range(DEPTH):
+            expr = JavaMethodCall(expr, "next")
+        self.assertNoCompileErrors(expr)
+        self.assertCompileError(
+            JavaArgumentCountError,
+            "Wrong number of arguments for Builder.next(): expected 0, got 1",
+            JavaMethodCall(expr, "next", self.b))
+
+    def test_02_checks_deeply_nested_arguments(self):
+        expr = self.b
+        for i in range(DEPTH):
+            expr = JavaMethodCall(self.b, "wrap", expr)
+        self.assertNoCompileErrors(expr)
+        self.assertEqual(self.builder, expr.static_type())
+
+    def test_03_reports_innermost_error_first(self):
+        # p.add(p.add(...p.add(b.wrap(b.point()))...)) has a type error at every level, but the
+        # innermost one is detected first.
+        expr = JavaMethodCall(self.b, "wrap", JavaMethodCall(self.b, "point"))
+        for i in range(DEPTH):
+            expr = JavaMethodCall(JavaVariable("p", Graphics.point), "add", expr)
+        self.assertCompileError(
+            JavaTypeMismatchError,
+            "Builder.wrap() expects arguments of type (Builder), but got (Point)",
+            expr)
+
+    def test_04_checks_deep_assignment_chain(self):
+        expr = self.b
+        for i in range(DEPTH):
+            expr = JavaAssignment(JavaVariable("b{0}".format(i), self.builder), expr)
+        self.assertNoCompileErrors(expr)
+        self.assertCompileError(
+            JavaTypeMismatchError,
+            "Cannot assign Builder to variable p of type Point",
+            JavaAssignment(JavaVariable("p", Graphics.point), expr))
+
+
+if __name__ == '__main__':
+    unittest.main()
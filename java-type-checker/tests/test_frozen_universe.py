@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.helpers import TypeTest
+import os
+import subprocess
+import sys
+import textwrap
+import unittest
+
+
+class TestFrozenUniverse(TypeTest):
+
+    def setUp(self):
+        # interface Shape { }
+        # interface Named { String getName() }
+        # class Circle implements Shape, Named { }
+        # class Unrelated { }
+        self.shape = JavaObjectType("Shape")
+        self.named = JavaObjectType("Named")
+        self.circle = JavaObjectType("Circle", direct_supertypes=[self.shape, self.named])
+        self.unrelated = JavaObjectType("Unrelated")
+        self.unrelated.add_method(JavaMethod("getShape", return_type=self.shape))
+        self.universe = freeze([self.circle, self.unrelated])
+
+    def test_00_includes_reachable_and_built_in_types(self):
+        for t in [self.shape, self.named, self.circle, self.unrelated,
+                  JavaBuiltInTypes.OBJECT, JavaBuiltInTypes.NULL, JavaBuiltInTypes.VOID,
+                  JavaBuiltInTypes.INT, JavaBuiltInTypes.DOUBLE, JavaBuiltInTypes.BOOLEAN]:
+            self.assertIn(t, self.universe)
+        self.assertEqual(10, len(self.universe))
+
+    def test_01_assigns_dense_ids(self):
+        self.assertEqual(
+            list(range(len(self.universe))),
+            sorted(self.universe.type_id(t) for t in self.universe.types))
+
+    def test_02_subtype_relationships_are_unchanged(self):
+        for subtype in self.universe.types:
+            for supertype in self.universe.types:
+                if type(subtype) == JavaObjectType:
+                    expected = supertype in subtype.ancestors()
+                else:
+                    expected = type(subtype).is_subtype_of(subtype, supertype)
+                self.assertEqual(expected, subtype.is_subtype_of(supertype))
+                self.assertEqual(expected, self.universe.is_subtype(subtype, supertype))
+
+        self.assertSubtype(self.circle, self.named)
+        self.assertSubtype(JavaBuiltInTypes.NULL, self.circle)
+        self.assertNotSubtype(self.shape, self.circle)
+        self.assertNotSubtype(self.circle, JavaBuiltInTypes.INT)
+
+    def test_03_frozen_types_cannot_be_modified(self):
+        with self.assertRaises(FrozenTypeUniverseError):
+            self.circle.add_method(JavaMethod("getRadius", return_type=JavaBuiltInTypes.DOUBLE))
+        with self.assertRaises(FrozenTypeUniverseError):
+            self.circle.direct_supertypes = [self.unrelated]
+        with self.assertRaises(FrozenTypeUniverseError):
+            self.circle.constructor = JavaConstructor([JavaBuiltInTypes.DOUBLE])
+        with self.assertRaises(TypeError):
+            self.unrelated.methods["getShape"] = None
+        self.assertEqual(self.shape, self.unrelated.method_named("getShape").return_type)
+
+    def test_04_frozen_types_can_still_be_extended(self):
+        oval = JavaObjectType("Oval", direct_supertypes=[self.circle])
+        self.assertSubtype(oval, self.shape)
+        self.assertNotSubtype(self.circle, oval)
+
+    def test_05_reports_stats(self):
+        stats = self.universe.stats()
+        self.assertEqual(10, stats["types"])
+        self.assertEqual(5, stats["object_types"])
+        self.assertGreater(stats["total_bytes"], 0)
+
+    def test_06_built_ins_stay_mutable_until_something_is_frozen(self):
+        # In a new interpreter, since the other tests here freeze universes
+        script = textwrap.dedent("""
+            from java_type_checker import *
+            assert JavaBuiltInTypes.UNIVERSE is None
+            getClass = JavaMethod("getClass", return_type=JavaBuiltInTypes.OBJECT)
+            JavaBuiltInTypes.OBJECT.add_method(getClass)
+            t = JavaObjectType("T")
+            assert t.method_named("getClass") is getClass
+            assert JavaBuiltInTypes.UNIVERSE is None
+
+            universe = freeze([t])
+            assert JavaBuiltInTypes.OBJECT._universe is JavaBuiltInTypes.UNIVERSE is not universe
+            assert JavaBuiltInTypes.UNIVERSE.types == JavaBuiltInTypes.ALL
+            assert universe.is_subtype(t, JavaBuiltInTypes.OBJECT)
+            try:
+                JavaBuiltInTypes.OBJECT.add_method(JavaMethod("toString"))
+            except FrozenTypeUniverseError:
+                print("ok")
+            """)
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual("ok\n", result.stdout, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker.serialization import universe_from_json
+from java_type_checker.snapshot import snapshot_from_bytes, snapshot_to_bytes
+from tests.fixtures import Graphics, graphics_types
+from tests.helpers import TypeTest
+import pickle
+import unittest
+
+
+class TestHierarchyValidation(TypeTest):
+
+    def setUp(self):
+        # A <-> B, C extends C, and D -> E -> F -> D with a shortcut E -> D.
+        # G extends A, and reaches a cycle without being on one.
+        self.a = JavaObjectType("A")
+        self.b = JavaObjectType("B", direct_supertypes=[self.a])
+        self.a.direct_supertypes = [self.b]
+        self.c = JavaObjectType("C")
+        self.c.direct_supertypes = [self.c]
+        self.d = JavaObjectType("D")
+        self.f = JavaObjectType("F", direct_supertypes=[self.d])
+        self.e = JavaObjectType("E", direct_supertypes=[self.f, self.d])
+        self.d.direct_supertypes = [self.e]
+        self.g = JavaObjectType("G", direct_supertypes=[self.a])
+
+    def test_00_reports_every_cycle(self):
+        with self.assertRaises(CyclicHierarchyError) as context:
+            validate_hierarchy([self.g, self.c, self.d, Graphics.rectangle, JavaBuiltInTypes.INT])
+        error = context.exception
+        self.assertEqual([(self.a, self.b), (self.c,), (self.d, self.e)], error.cycles)
+        self.assertEqual([(self.a, self.b), (self.c,), (self.d, self.e, self.f)], error.involved)
+        self.assertEqual(
+            "Cyclic type hierarchy: A extends B extends A; C extends C; "
+            "D extends E extends D, also involving F",
+            str(error))
+        self.assertEqual(error.cycles, find_hierarchy_cycles([self.g, self.c, self.d]))
+        self.assertEqual(str(error), str(pickle.loads(pickle.dumps(error))))
+
+    def test_01_accepts_acyclic_hierarchies(self):
+        validate_hierarchy(graphics_types() + list(JavaBuiltInTypes.ALL))
+        top = JavaObjectType("Top")
+        left = JavaObjectType("Left", direct_supertypes=[top])
+        right = JavaObjectType("Right", direct_supertypes=[top])
+        bottom = JavaObjectType("Bottom", direct_supertypes=[left, right, top])
+        self.assertEqual([], find_hierarchy_cycles([bottom]))
+
+    def test_02_deep_hierarchies_do_not_recurse(self):
+        types = [JavaObjectType("T0")]
+        for i in range(1, 50000):
+            types.append(JavaObjectType(f"T{i}", direct_supertypes=[types[-1]]))
+        self.assertEqual([], find_hierarchy_cycles([types[-1]]))
+        types[0].direct_supertypes = [types[-1]]
+        [cycle] = find_hierarchy_cycles([types[-1]])
+        self.assertEqual(50000, len(cycle))
+        self.assertIs(types[-1], cycle[0])
+
+    def test_03_lazy_caches_report_every_reachable_cycle(self):
+        t = JavaObjectType("T", direct_supertypes=[self.g, self.c])
+        with self.assertRaises(CyclicHierarchyError) as context:
+            t.method_named("hashCode")
+        self.assertEqual([(self.a, self.b), (self.c,)], context.exception.cycles)
+
+    def test_04_loaders_and_freezing_fail_fast(self):
+        with self.assertRaisesRegex(CyclicHierarchyError, "^Cyclic type hierarchy: Egg extends Chicken extends Egg$"):
+            universe_from_json({"types": [
+                {"name": "Egg", "supertypes": ["Chicken"]},
+                {"name": "Chicken", "supertypes": ["Egg"]},
+                {"name": "Farm", "methods": [{"name": "lay", "returns": "Egg"}]},
+            ]})
+
+        data = snapshot_to_bytes([self.g])
+        with self.assertRaisesRegex(CyclicHierarchyError, "A extends B extends A"):
+            snapshot_from_bytes(data)
+
+        with self.assertRaises(CyclicHierarchyError):
+            freeze([self.g])
+        self.assertIsNone(self.g._universe)
+        self.a.direct_supertypes = []
+        self.assertIn(self.g, freeze([self.g]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics, check_types_outcome, sample_expressions
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestIncrementalChecking(TypeTest):
+
+    def setUp(self):
+        # class Shape { }
+        # class Circle extends Shape { double getRadius() }
+        # class Group { Shape getElementAt(Point p); void add(Shape s) }
+
+        self.shape = JavaObjectType("Shape")
+        self.circle = JavaObjectType("Circle", direct_supertypes=[self.shape])
+        self.circle.add_method(JavaMethod("getRadius", return_type=JavaBuiltInTypes.DOUBLE))
+        self.group = JavaObjectType("Group")
+        self.group.add_method(
+            JavaMethod("getElementAt", parameter_types=[Graphics.point], return_type=self.shape))
+        self.group.add_method(
+            JavaMethod("add", parameter_types=[self.shape], return_type=JavaBuiltInTypes.VOID))
+
+        group = JavaVariable("group", self.group)
+        circle = JavaVariable("circle", self.circle)
+        self.get_element = JavaMethodCall(group, "getElementAt", JavaVariable("p", Graphics.point))
+        self.get_radius = JavaMethodCall(circle, "getRadius")
+        self.get_area = JavaMethodCall(circle, "getArea")
+        self.add_circle = JavaMethodCall(group, "add", circle)
+        self.new_circle = JavaConstructorCall(self.circle)
+        self.checker = IncrementalChecker([
+            self.get_element, self.get_radius, self.get_area, self.add_circle, self.new_circle])
+
+    def test_00_initial_results_agree_with_check_types(self):
+        expressions = sample_expressions()
+        checker = IncrementalChecker(expressions)
+        for expr, result in zip(expressions, checker.results):
+            expected = check_types_outcome(expr)
+            self.assertEqual(expected, None if result.ok else (result.error_class, result.message))
+
+    def test_01_changed_method_rechecks_only_its_callers(self):
+        self.group.remove_method(self.group.methods["getElementAt"])
+        self.group.add_method(
+            JavaMethod("getElementAt",
+                parameter_types=[Graphics.point, JavaBuiltInTypes.INT],
+                return_type=self.shape))
+
+        changes = self.checker.recheck([(self.group, "getElementAt")])
+        self.assertEqual(1, self.checker.rechecked)
+        self.assertEqual(1, len(changes))
+        self.assertIs(self.get_element, changes[0].expression)
+        self.assertTrue(changes[0].before.ok)
+        self.assertEqual(JavaArgumentCountError, changes[0].after.error_class)
+        self.assertEqual(
+            "Wrong number of arguments for Group.getElementAt(): expected 2, got 1",
+            changes[0].after.message)
+        self.assertEqual(changes[0].after.message, self.checker.results[0].message)
+
+    def test_02_inherited_method_is_a_dependency(self):
+        self.shape.add_method(JavaMethod("getArea", return_type=JavaBuiltInTypes.DOUBLE))
+
+        changes = self.checker.recheck([(self.shape, "getArea")])
+        self.assertEqual(1, self.checker.rechecked)
+        self.assertEqual([2], [change.index for change in changes])
+        self.assertFalse(changes[0].before.ok)
+        self.assertEqual(JavaBuiltInTypes.DOUBLE, changes[0].after.static_type)
+
+    def test_03_supertype_change_rechecks_subtype_tests(self):
+        self.circle.direct_supertypes = []
+
+        changes = self.checker.recheck([self.circle])
+        self.assertEqual([3], [change.index for change in changes])
+        self.assertEqual(JavaTypeMismatchError, changes[0].after.error_class)
+        self.assertEqual(
+            "Group.add() expects arguments of type (Shape), but got (Circle)",
+            changes[0].after.message)
+
+    def test_04_constructor_change(self):
+        self.circle.constructor = JavaConstructor(parameter_types=[JavaBuiltInTypes.DOUBLE])
+
+        changes = self.checker.recheck([self.circle])
+        self.assertEqual([4], [change.index for change in changes])
+        self.assertEqual(JavaArgumentCountError, changes[0].after.error_class)
+
+    def test_05_unrelated_changes_recheck_nothing(self):
+        window = JavaObjectType("Window")
+        window.add_method(JavaMethod("close", return_type=JavaBuiltInTypes.VOID))
+        self.assertEqual([], self.checker.recheck([window]))
+        self.assertEqual(0, self.checker.rechecked)
+
+        self.assertEqual([], self.checker.recheck([(self.group, "remove")]))
+        self.assertEqual(0, self.checker.rechecked)
+
+    def test_06_dependencies_follow_the_latest_check(self):
+        self.assertIn((self.group, "getElementAt"), self.checker.dependencies(0))
+        self.assertIn((self.shape, "getArea"), self.checker.dependencies(2))
+        self.assertIn((self.circle, "<constructor>"), self.checker.dependencies(4))
+
+        self.circle.direct_supertypes = []
+        self.checker.recheck([self.circle])
+        self.assertNotIn((self.shape, "getArea"), self.checker.dependencies(2))
+        self.assertEqual([], self.checker.recheck([(self.shape, "getArea")]))
+
+
+if __name__ == '__main__':
+    unittest.main()
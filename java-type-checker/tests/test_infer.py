@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import CountingType, Graphics, check_types_outcome, sample_expressions
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestInfer(TypeTest):
+
+    def test_00_returns_static_type_of_well_typed_expressions(self):
+        for expr in sample_expressions():
+            if check_types_outcome(expr) is None:
+                self.assertEqual(expr.static_type(), infer(expr))
+
+    def test_01_raises_same_errors_as_check_types(self):
+        for expr in sample_expressions():
+            expected = check_types_outcome(expr)
+            if expected is not None:
+                with self.assertRaises(expected[0]) as context:
+                    infer(expr)
+                self.assertEqual(expected[1], str(context.exception))
+
+    def test_02_visits_each_node_once(self):
+        # For example:
+        #
+        #     Builder b;
+        #
+        #     b.wrap(b.next()).wrap(b.next().next())
+        #
+        builder = CountingType("Builder")
+        builder.add_method(JavaMethod("next", return_type=builder))
+        builder.add_method(JavaMethod("wrap", parameter_types=[builder], return_type=builder))
+        b = JavaVariable("b", builder)
+        expr = JavaMethodCall(
+            JavaMethodCall(b, "wrap", JavaMethodCall(b, "next")),
+            "wrap",
+            JavaMethodCall(JavaMethodCall(b, "next"), "next"))
+
+        self.assertEqual(builder, infer(expr))
+        self.assertEqual(5, builder.lookups)
+        self.assertEqual(builder, expr.static_type())
+        self.assertEqual(5, builder.lookups)
+
+    def test_03_leaf_expressions(self):
+        self.assertEqual(Graphics.point, infer(JavaVariable("p", Graphics.point)))
+        self.assertEqual(JavaBuiltInTypes.NULL, infer(JavaNullLiteral()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker.expressions import JavaExpression
+from tests.fixtures import Graphics
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestInstrumentation(TypeTest):
+
+    def test_00_counts_checker_events(self):
+        builder = JavaObjectType("Builder")
+        builder.add_method(JavaMethod("wrap", parameter_types=[JavaBuiltInTypes.OBJECT], return_type=builder))
+        expr = JavaMethodCall(
+            JavaMethodCall(JavaVariable("b", builder), "wrap", JavaVariable("p", Graphics.point)),
+            "wrap",
+            JavaVariable("s", Graphics.size))
+
+        with instrument() as counts:
+            expr.check_types()
+            expr.static_type()
+
+        self.assertEqual(1, counts.calls["check_types"])
+        self.assertEqual(2, counts.calls["check_steps"])
+        self.assertEqual({"JavaMethodCall": 2}, counts.calls_by["check_steps"])
+        self.assertEqual(0, counts.calls["static_type_steps"])  # Already known from checking
+        self.assertEqual(2, counts.calls_by["find_overloads"]["Builder"])
+        self.assertEqual(1, counts.calls_by["method_table_build"]["Builder"])
+        self.assertEqual({"Point": 1, "Size": 1}, counts.calls_by["is_subtype_of"])
+        self.assertGreaterEqual(counts.seconds["check_types"], counts.seconds["find_overloads"])
+
+    def test_01_counts_errors_and_exceptions(self):
+        expr = JavaMethodCall(JavaVariable("p", Graphics.point), "getArea")
+        with instrument() as counts:
+            self.assertFalse(expr.is_well_typed())
+            with self.assertRaises(NoSuchJavaMethod):
+                Graphics.point.method_named("getArea")
+
+        self.assertEqual({"NoSuchJavaMethod": 1}, counts.calls_by["type_error"])
+        self.assertEqual(1, counts.raised["method_named", "NoSuchJavaMethod"])
+        report = counts.report()
+        self.assertEqual({"NoSuchJavaMethod": 1}, report["method_named"]["raised"])
+        self.assertEqual({"Point": 1}, report["method_named"]["by"])
+        self.assertIn("method_named", counts.format_report())
+
+    def test_02_methods_are_restored_afterwards(self):
+        before = dict(vars(JavaObjectType)), dict(vars(JavaExpression))
+        with instrument():
+            self.assertNotEqual(before[0]["find_overloads"], vars(JavaObjectType)["find_overloads"])
+        self.assertEqual(before, (dict(vars(JavaObjectType)), dict(vars(JavaExpression))))
+
+        with self.assertRaises(ValueError):
+            with instrument():
+                raise ValueError()
+        self.assertEqual(before, (dict(vars(JavaObjectType)), dict(vars(JavaExpression))))
+
+    def test_03_cannot_nest(self):
+        with instrument():
+            with self.assertRaises(RuntimeError):
+                with instrument():
+                    pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker.serialization import expression_from_json, expression_to_json
+from tests.fixtures import CountingType, Graphics, check_types_outcome, sample_expressions
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestInterning(TypeTest):
+
+    def test_00_identical_expressions_are_the_same_node(self):
+        interner = ExpressionInterner()
+        first = interner.method_call(interner.variable("window", Graphics.window), "getSize")
+        second = interner.method_call(interner.variable("window", Graphics.window), "getSize")
+        self.assertIs(first, second)
+        self.assertIs(interner.null(), interner.null())
+        self.assertIsNot(
+            interner.variable("window", Graphics.window),
+            interner.variable("window", Graphics.rectangle))
+        self.assertIsNot(
+            interner.literal(1, JavaBuiltInTypes.INT),
+            interner.literal(True, JavaBuiltInTypes.INT))
+
+    def test_01_intern_builds_a_dag_from_trees(self):
+        def get_size():
+            return JavaMethodCall(JavaVariable("window", Graphics.window), "getSize")
+
+        interner = ExpressionInterner()
+        expr = interner.intern(
+            JavaConstructorCall(Graphics.rectangle,
+                JavaMethodCall(get_size(), "getWidth"),
+                JavaMethodCall(get_size(), "getWidth")))
+        self.assertIs(expr.args[0], expr.args[1])
+        self.assertIs(expr.args[0].receiver, interner.intern(get_size()))
+
+    def test_02_intern_preserves_results(self):
+        interner = ExpressionInterner()
+        for expr in sample_expressions():
+            shared = interner.intern(expr)
+            self.assertEqual(expression_to_json(expr), expression_to_json(shared))
+            self.assertEqual(check_types_outcome(expr), check_types_outcome(shared))
+
+    def test_03_shared_subexpressions_are_checked_once(self):
+        # Each level is `new Builder(e, e)` for the previous level’s e: as a tree the expression
+        # has 2^40 nodes, but as a DAG it has only 41.
+        builder = CountingType("Builder")
+        builder.constructor = JavaConstructor(parameter_types=[builder, builder])
+        builder.add_method(JavaMethod("next", return_type=builder))
+        expr = JavaMethodCall(JavaVariable("b", builder), "next")
+        for i in range(40):
+            expr = JavaConstructorCall(builder, expr, expr)
+
+        self.assertNoCompileErrors(expr)
+        self.assertEqual(builder, expr.static_type())
+        self.assertEqual(1, builder.lookups)
+
+    def test_04_checking_one_occurrence_answers_for_all(self):
+        counting = CountingType("Counting")
+        counting.add_method(JavaMethod("next", return_type=counting))
+        interner = ExpressionInterner()
+        broken = interner.method_call(interner.variable("c", counting), "getArea")
+        self.assertCompileError(
+            NoSuchJavaMethod, "Counting has no method named getArea", broken)
+        self.assertEqual(1, counting.lookups)
+
+        wrapped = interner.method_call(
+            interner.method_call(interner.variable("c", counting), "getArea"), "next")
+        self.assertCompileError(
+            NoSuchJavaMethod, "Counting has no method named getArea", wrapped)
+        self.assertEqual(1, counting.lookups)
+
+    def test_05_stats_report_sharing(self):
+        interner = ExpressionInterner()
+        self.assertEqual(
+            {"requested": 0, "unique": 0, "saved": 0, "dedup_ratio": 1.0}, interner.stats())
+        for i in range(3):
+            interner.intern(JavaMethodCall(JavaVariable("window", Graphics.window), "getSize"))
+        self.assertEqual(
+            {"requested": 6, "unique": 2, "saved": 4, "dedup_ratio": 3.0}, interner.stats())
+
+    def test_06_decoding_json_through_an_interner(self):
+        types = {"Window": Graphics.window}
+        data = {"call": "getSize", "on": {"var": "window", "type": "Window"}}
+        interner = ExpressionInterner()
+        self.assertIs(
+            expression_from_json(data, types, interner),
+            expression_from_json(data, types, interner))
+        self.assertIsNot(expression_from_json(data, types), expression_from_json(data, types))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestMethodTables(TypeTest):
+
+    def test_00_table_includes_declared_and_inherited_methods(self):
+        self.assertEqual(
+            {
+                "getSize", "getX", "getY", "getPosition", "setPosition", "setStrokeColor",
+                "getStrokeColor", "setFillColor", "getFillColor", "equals", "hashCode",
+            },
+            set(Graphics.rectangle.method_table().keys()))
+
+    def test_01_own_methods_win_over_inherited_methods(self):
+        self.assertIs(
+            Graphics.graphics_object.methods["getX"],
+            Graphics.rectangle.method_named("getX"))
+
+    def test_02_earlier_supertypes_win_over_later_supertypes(self):
+        # interface Left { Point get() }
+        # interface Right { Size get() }
+        # class Both implements Left, Right { }
+        left = JavaObjectType("Left")
+        left.add_method(JavaMethod("get", return_type=Graphics.point))
+        right = JavaObjectType("Right")
+        right.add_method(JavaMethod("get", return_type=Graphics.size))
+        self.assertEqual(
+            Graphics.point,
+            JavaObjectType("Both", direct_supertypes=[left, right]).method_named("get").return_type)
+        self.assertEqual(
+            Graphics.size,
+            JavaObjectType("Both", direct_supertypes=[right, left]).method_named("get").return_type)
+
+    def test_03_adding_method_to_ancestor_updates_descendants(self):
+        base = JavaObjectType("Base")
+        derived = JavaObjectType("Derived", direct_supertypes=[base])
+        with self.assertRaises(NoSuchJavaMethod):
+            derived.method_named("getSize")
+
+        base.add_method(JavaMethod("getSize", return_type=Graphics.size))
+        self.assertEqual(Graphics.size, derived.method_named("getSize").return_type)
+
+    def test_04_finds_methods_through_very_deep_hierarchy(self):
+        deep_subtype = Graphics.rectangle
+        for i in range(1500):
+            deep_subtype = JavaObjectType("DeepType{0}".format(i), direct_supertypes=[deep_subtype])
+        self.assertEqual("hashCode", deep_subtype.method_named("hashCode").name)
+        with self.assertRaisesRegex(NoSuchJavaMethod, "DeepType1499 has no method named frob"):
+            deep_subtype.method_named("frob")
+
+    def test_05_tables_survive_changes_to_unrelated_types(self):
+        base = JavaObjectType("Base")
+        middle = JavaObjectType("Middle", direct_supertypes=[base])
+        derived = JavaObjectType("Derived", direct_supertypes=[middle])
+        stranger = JavaObjectType("Stranger")
+        table = derived.method_table()
+
+        stranger.add_method(JavaMethod("getSize", return_type=Graphics.size))
+        self.assertIs(table, derived.method_table())
+
+        # A new supertype brings its older methods along
+        middle.direct_supertypes = [stranger]
+        self.assertEqual(Graphics.size, derived.method_named("getSize").return_type)
+        middle.direct_supertypes = [base]
+        with self.assertRaises(NoSuchJavaMethod):
+            derived.method_named("getSize")
+
+        get_position = JavaMethod("getPosition", return_type=Graphics.point)
+        base.add_method(get_position)
+        self.assertEqual(Graphics.point, derived.method_named("getPosition").return_type)
+        base.remove_method(get_position)
+        with self.assertRaises(NoSuchJavaMethod):
+            derived.method_named("getPosition")
+
+
+if __name__ == '__main__':
+    unittest.main()
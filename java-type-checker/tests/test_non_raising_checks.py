@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics, check_types_outcome, sample_expressions
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestNonRaisingChecks(TypeTest):
+
+    def test_00_find_method_returns_method(self):
+        self.assertEqual("getX", Graphics.point.find_method("getX").name)
+        self.assertEqual("hashCode", Graphics.rectangle.find_method("hashCode").name)
+
+    def test_01_find_method_returns_none_for_missing_method(self):
+        self.assertIsNone(Graphics.point.find_method("ergleflopse"))
+        self.assertIsNone(JavaBuiltInTypes.INT.find_method("hashCode"))
+        self.assertIsNone(JavaBuiltInTypes.NULL.find_method("hashCode"))
+
+    def test_02_is_well_typed_agrees_with_check_types(self):
+        for expr in sample_expressions():
+            self.assertEqual(check_types_outcome(expr) is None, expr.is_well_typed())
+
+    def test_03_first_error_agrees_with_check_types(self):
+        for expr in sample_expressions():
+            error = expr.first_error()
+            if error is None:
+                self.assertIsNone(check_types_outcome(expr))
+            else:
+                self.assertEqual(check_types_outcome(expr), (error.error_class, error.message))
+
+    def test_04_is_well_typed_does_not_format_messages(self):
+        class UnprintableType(JavaObjectType):
+            @property
+            def name(self):
+                raise AssertionError("Should not format an error message")
+
+            @name.setter
+            def name(self, name):
+                pass
+
+        unprintable = UnprintableType("Unprintable")
+        self.assertFalse(
+            JavaMethodCall(JavaVariable("u", unprintable), "frob").is_well_typed())
+        self.assertFalse(
+            JavaAssignment(JavaVariable("u", unprintable), JavaVariable("r", Graphics.rectangle)).is_well_typed())
+        self.assertFalse(
+            JavaMethodCall(JavaVariable("u", unprintable), "equals").is_well_typed())
+
+
+if __name__ == '__main__':
+    unittest.main()
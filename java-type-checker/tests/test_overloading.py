@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker.serialization import universe_from_json, universe_to_json
+from java_type_checker.snapshot import snapshot_from_bytes, snapshot_to_bytes
+from java_type_checker.universe import reachable_types
+from tests.fixtures import Graphics
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestOverloading(TypeTest):
+
+    def setUp(self):
+        # class Printer {
+        #     void println()
+        #     boolean println(Object o)
+        #     int println(GraphicsObject g)
+        #     double println(int i)
+        #     void println(int i, int j)
+        #     void mark(Strokable s)
+        #     void mark(Fillable f)
+        # }
+        self.printer = JavaObjectType("Printer")
+        for parameter_types, return_type in [
+            ([], JavaBuiltInTypes.VOID),
+            ([JavaBuiltInTypes.OBJECT], JavaBuiltInTypes.BOOLEAN),
+            ([Graphics.graphics_object], JavaBuiltInTypes.INT),
+            ([JavaBuiltInTypes.INT], JavaBuiltInTypes.DOUBLE),
+            ([JavaBuiltInTypes.INT, JavaBuiltInTypes.INT], JavaBuiltInTypes.VOID),
+        ]:
+            self.printer.add_method(JavaMethod("println", parameter_types, return_type))
+        self.printer.add_method(
+            JavaMethod("mark", [Graphics.strokable], JavaBuiltInTypes.VOID))
+        self.printer.add_method(
+            JavaMethod("mark", [Graphics.fillable], JavaBuiltInTypes.VOID))
+
+    def println(self, *args):
+        return JavaMethodCall(JavaVariable("out", self.printer), "println", *args)
+
+    def test_00_add_method_keeps_overloads(self):
+        self.assertEqual(5, len(self.printer.overloads["println"]))
+        self.assertEqual([], list(self.printer.methods["println"].parameter_types))
+        self.assertIs(self.printer.methods["println"], self.printer.method_named("println"))
+        by_arity = self.printer.find_overloads("println").by_arity
+        self.assertEqual({0: 1, 1: 3, 2: 1}, {n: len(ms) for n, ms in by_arity.items()})
+
+    def test_01_same_signature_replaces(self):
+        replacement = JavaMethod("println", [JavaBuiltInTypes.INT], JavaBuiltInTypes.BOOLEAN)
+        self.printer.add_method(replacement)
+        self.assertEqual(5, len(self.printer.overloads["println"]))
+        self.assertIn(replacement, self.printer.overloads["println"])
+        self.assertEqual(
+            JavaBuiltInTypes.BOOLEAN,
+            self.println(JavaLiteral("1", JavaBuiltInTypes.INT)).static_type())
+
+    def test_02_picks_most_specific_overload(self):
+        cases = [
+            ((), JavaBuiltInTypes.VOID),
+            ((JavaVariable("p", Graphics.point),), JavaBuiltInTypes.BOOLEAN),
+            ((JavaVariable("g", Graphics.graphics_object),), JavaBuiltInTypes.INT),
+            ((JavaVariable("r", Graphics.rectangle),), JavaBuiltInTypes.INT),
+            ((JavaNullLiteral(),), JavaBuiltInTypes.INT),
+            ((JavaLiteral("1", JavaBuiltInTypes.INT),), JavaBuiltInTypes.DOUBLE),
+            ((JavaLiteral("1", JavaBuiltInTypes.INT),) * 2, JavaBuiltInTypes.VOID),
+        ]
+        for args, return_type in cases:
+            self.assertEqual(return_type, infer(self.println(*args)))
+            self.assertEqual(return_type, self.println(*args).static_type())
+
+    def test_03_wrong_number_of_arguments(self):
+        self.assertCompileError(
+            JavaArgumentCountError,
+            "Wrong number of arguments for Printer.println(): expected 0, 1 or 2, got 3",
+            self.println(*[JavaLiteral("1", JavaBuiltInTypes.INT)] * 3))
+
+    def test_04_no_applicable_overload(self):
+        self.assertCompileError(
+            JavaTypeMismatchError,
+            "Printer.println() expects arguments of type (Object), (GraphicsObject) or (int),"
+            " but got (boolean)",
+            self.println(JavaLiteral("true", JavaBuiltInTypes.BOOLEAN)))
+
+    def test_05_ambiguous_call(self):
+        self.assertCompileError(
+            JavaAmbiguousCallError,
+            "Ambiguous call to Printer.mark() with arguments (Rectangle): could be (Strokable) or (Fillable)",
+            JavaMethodCall(
+                JavaVariable("out", self.printer), "mark", JavaVariable("r", Graphics.rectangle)))
+        self.assertNoCompileErrors(
+            JavaMethodCall(
+                JavaVariable("out", self.printer), "mark", JavaVariable("s", Graphics.strokable)))
+
+    def test_06_inherited_overloads_are_merged(self):
+        # class FancyPrinter extends Printer {
+        #     int println(int i)          // overrides
+        #     void println(Point p)       // new overload
+        # }
+        fancy = JavaObjectType("FancyPrinter", direct_supertypes=[self.printer])
+        fancy.add_method(JavaMethod("println", [JavaBuiltInTypes.INT], JavaBuiltInTypes.INT))
+        fancy.add_method(JavaMethod("println", [Graphics.point], JavaBuiltInTypes.VOID))
+
+        overloads = fancy.find_overloads("println")
+        self.assertEqual(6, len(overloads))
+        self.assertEqual(
+            [(JavaBuiltInTypes.INT,), (Graphics.point,)],
+            [m.parameter_types for m in overloads.members[:2]])
+
+        out = JavaVariable("out", fancy)
+        for arg, return_type in [
+            (JavaLiteral("1", JavaBuiltInTypes.INT), JavaBuiltInTypes.INT),
+            (JavaVariable("p", Graphics.point), JavaBuiltInTypes.VOID),
+            (JavaVariable("r", Graphics.rectangle), JavaBuiltInTypes.INT),
+            (JavaVariable("s", Graphics.size), JavaBuiltInTypes.BOOLEAN),
+        ]:
+            self.assertEqual(return_type, infer(JavaMethodCall(out, "println", arg)))
+
+        # Unrelated names keep sharing the supertype’s set
+        self.assertIs(self.printer.find_overloads("mark"), fancy.find_overloads("mark"))
+
+    def test_07_remove_method(self):
+        self.printer.remove_method(self.printer.methods["println"])
+        self.assertCompileError(
+            JavaArgumentCountError,
+            "Wrong number of arguments for Printer.println(): expected 1 or 2, got 0",
+            self.println())
+        for method in self.printer.overloads["mark"]:
+            self.printer.remove_method(method)
+        self.assertNotIn("mark", self.printer.methods)
+        self.assertIsNone(self.printer.find_method("mark"))
+        with self.assertRaises(ValueError):
+            self.printer.remove_method(JavaMethod("mark"))
+
+    def test_08_multiple_constructors(self):
+        # class Box {
+        #     Box()
+        #     Box(int size)
+        #     Box(Paint p)
+        #     Box(Color c)
+        # }
+        box = JavaObjectType("Box")
+        box.add_constructor(JavaConstructor([JavaBuiltInTypes.INT]))
+        box.add_constructor(JavaConstructor([Graphics.paint]))
+        box.add_constructor(JavaConstructor([Graphics.color]))
+        self.assertEqual(4, len(box.constructors))
+        self.assertEqual((), box.constructor.parameter_types)
+
+        self.assertNoCompileErrors(JavaConstructorCall(box))
+        self.assertNoCompileErrors(JavaConstructorCall(box, JavaLiteral("3", JavaBuiltInTypes.INT)))
+        self.assertNoCompileErrors(JavaConstructorCall(box, JavaVariable("c", Graphics.color)))
+        self.assertNoCompileErrors(JavaConstructorCall(box, JavaNullLiteral()))
+        self.assertCompileError(
+            JavaTypeMismatchError,
+            "Box constructor expects arguments of type (int), (Paint) or (Color), but got (double)",
+            JavaConstructorCall(box, JavaLiteral("3.0", JavaBuiltInTypes.DOUBLE)))
+
+        box.constructor = JavaConstructor([JavaBuiltInTypes.DOUBLE])
+        self.assertEqual(1, len(box.constructors))
+        self.assertNoCompileErrors(JavaConstructorCall(box, JavaLiteral("3.0", JavaBuiltInTypes.DOUBLE)))
+
+    def test_09_overloads_survive_serialization(self):
+        box = JavaObjectType("Box")
+        box.add_constructor(JavaConstructor([JavaBuiltInTypes.INT]))
+        for t in [self.printer, box]:
+            copy = universe_from_json(universe_to_json(reachable_types([t])))[t.name]
+            self.assertEqual(self.signatures(t), self.signatures(copy))
+            copy = snapshot_from_bytes(snapshot_to_bytes([t]))[0]
+            self.assertEqual(self.signatures(t), self.signatures(copy))
+
+    def signatures(self, t):
+        return (
+            [[p.name for p in c.parameter_types] for c in t.constructors],
+            {
+                name: [([p.name for p in m.parameter_types], m.return_type.name) for m in overloads]
+                for name, overloads in t.overloads.items()
+            })
+
+
+if __name__ == '__main__':
+    unittest.main()
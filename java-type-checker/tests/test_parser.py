@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker.parser import tokenize
+from java_type_checker.serialization import expression_to_json
+from tests.fixtures import Graphics, check_types_outcome, graphics_types
+from tests.helpers import TypeTest
+import io
+import unittest
+
+
+class TestParser(TypeTest):
+
+    def setUp(self):
+        self.types = TypeRegistry(graphics_types())
+        self.variables = {
+            "rect": Graphics.rectangle,
+            "group": Graphics.graphics_group,
+            "red": Graphics.color,
+            "x": JavaBuiltInTypes.INT,
+        }
+
+    def parse(self, text):
+        return parse_expression(text, self.types, self.variables)
+
+    def assertParsesTo(self, expected, text):
+        self.assertEqual(expression_to_json(expected), expression_to_json(self.parse(text)))
+
+    def test_00_builds_expression_nodes(self):
+        rect = JavaVariable("rect", Graphics.rectangle)
+        zero = JavaLiteral("0.0", JavaBuiltInTypes.DOUBLE)
+        self.assertParsesTo(rect, "rect")
+        self.assertParsesTo(JavaLiteral("37", JavaBuiltInTypes.INT), "37")
+        self.assertParsesTo(JavaLiteral("1.5e3", JavaBuiltInTypes.DOUBLE), "1.5e3")
+        self.assertParsesTo(JavaLiteral("true", JavaBuiltInTypes.BOOLEAN), "true")
+        self.assertParsesTo(JavaNullLiteral(), "null")
+        self.assertParsesTo(
+            JavaMethodCall(JavaMethodCall(rect, "getSize"), "getWidth"),
+            "rect.getSize().getWidth()")
+        self.assertParsesTo(
+            JavaMethodCall(rect, "setPosition", JavaConstructorCall(Graphics.point, zero, zero)),
+            "rect . setPosition(new Point(0.0, 0.0))")
+        self.assertParsesTo(
+            JavaMethodCall(JavaConstructorCall(Graphics.point, zero, zero), "getX"),
+            "new Point(0.0,0.0).getX()")
+        self.assertParsesTo(
+            JavaMethodCall(JavaMethodCall(rect, "getPosition"), "getX"),
+            "((rect).getPosition()).getX()")
+
+    def test_01_assignments_are_right_associative(self):
+        a = JavaVariable("a", Graphics.graphics_object)
+        b = JavaVariable("b", Graphics.rectangle)
+        self.variables.update(a=a.declared_type, b=b.declared_type)
+        self.assertParsesTo(
+            JavaAssignment(a, JavaAssignment(b, JavaVariable("rect", Graphics.rectangle))),
+            "a = b = rect")
+        self.assertParsesTo(
+            JavaMethodCall(
+                JavaVariable("group", Graphics.graphics_group), "add", JavaAssignment(a, b)),
+            "group.add(a = b)")
+
+    def test_02_statements_declare_variables(self):
+        source = """
+            // Declarations with initializers become assignments
+            Point p = new Point(1.0, 2.0);
+            double width;
+            width = rect.getSize().getWidth();
+            {
+                /* A block’s variables
+                   go out of scope at its end */
+                Rectangle r = new Rectangle(p, rect.getSize());
+                r.setFillColor(red);
+            }
+            ;
+            java.lang.Object o = p.getX();
+        """
+        self.types.register(JavaObjectType("Object", direct_supertypes=[]), package="java.lang")
+        statements = list(parse_statements(source, self.types, self.variables))
+        self.assertEqual([3, 5, 9, 10, 13], [line for line, expr in statements])
+        self.assertEqual(
+            [True, True, True, True, False],
+            [expr.is_well_typed() for line, expr in statements])
+        self.assertIs(Graphics.point, statements[0][1].lhs.declared_type)
+
+        with self.assertRaisesRegex(JavaParseError, "line 1, column 25: Unknown variable r"):
+            list(parse_statements("{ Rectangle r = rect; } r.getSize();", self.types, self.variables))
+
+    def test_03_reports_syntax_errors_with_positions(self):
+        for text, message in [
+            ("rect.", "line 1, column 6: Expected method name, found end of input"),
+            ("rect.getSize(", "line 1, column 14: Expected an expression, found end of input"),
+            ("rect.getSize(x x)", "line 1, column 16: Expected ')', found 'x'"),
+            ("rect\n  .getSize() = x", "line 2, column 14: Can only assign to a variable"),
+            ("rect @ x", "line 1, column 6: Unexpected character '@'"),
+            ("rect /* ...", "line 1, column 6: Unterminated comment"),
+            ("nope.getSize()", "line 1, column 1: Unknown variable nope"),
+            ("new Nope()", "line 1, column 5: Unknown type Nope"),
+            ("rect rect", "line 1, column 6: Expected end of expression, found 'rect'"),
+        ]:
+            with self.assertRaises(JavaParseError) as context:
+                self.parse(text)
+            self.assertIn(message, str(context.exception))
+
+        with self.assertRaises(JavaParseError) as context:
+            self.parse("rect\n  .getSize() = x")
+        self.assertEqual((2, 14), (context.exception.line, context.exception.column))
+
+    def test_04_streams_from_chunks_and_files(self):
+        source = "Point p = new Point(1.0, 2.0); /* comment\n spanning lines */ p.getX();\n" * 50
+        expected = [
+            (line, expression_to_json(expr))
+            for line, expr in parse_statements(source, self.types)]
+        self.assertEqual(100, len(expected))
+        self.assertEqual(100, expected[-1][0])
+        for chunks in [iter(source), io.StringIO(source), [source[:7], source[7:]]]:
+            self.assertEqual(
+                expected,
+                [(line, expression_to_json(expr))
+                 for line, expr in parse_statements(chunks, self.types)])
+
+        tokens = tokenize(io.StringIO("a\n  .b()"))
+        self.assertEqual(("name", "a", 1, 1), next(tokens))
+        self.assertEqual(("punctuation", ".", 2, 3), next(tokens))
+
+    def test_05_parses_deep_expressions_without_recursion(self):
+        depth = 10000
+        self.assertParsesTo(
+            JavaVariable("rect", Graphics.rectangle), "(" * depth + "rect" + ")" * depth)
+
+        expr = self.parse("rect" + ".getSize()" * depth)
+        for _ in range(depth):
+            self.assertIsInstance(expr, JavaMethodCall)
+            expr = expr.receiver
+        self.assertEqual("rect", expr.name)
+
+        box = self.types.declare("Box")
+        box.constructor = JavaConstructor([JavaBuiltInTypes.OBJECT, JavaBuiltInTypes.INT])
+        self.assertIsNone(check_types_outcome(self.parse("new Box(" * depth + "null" + ", x)" * depth)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker.cli import check_corpus_lines, load_universe_bytes
+from java_type_checker.serialization import (
+    expression_from_json, expression_to_json, universe_from_json, universe_to_json)
+from java_type_checker.snapshot import snapshot_to_bytes
+from tests.fixtures import Graphics
+from tests.helpers import TypeTest
+import json
+import pickle
+import unittest
+
+
+class TestTypeRegistry(TypeTest):
+
+    def setUp(self):
+        self.registry = TypeRegistry()
+        self.awt_point = self.registry.declare("Point", package="java.awt")
+        self.geom_point = self.registry.declare("Point", package="geom")
+        self.shape = self.registry.declare("Shape")
+
+    def test_00_lookup_by_qualified_name(self):
+        self.assertIs(self.awt_point, self.registry["java.awt.Point"])
+        self.assertIs(self.shape, self.registry["Shape"])
+        self.assertIs(JavaBuiltInTypes.OBJECT, self.registry["Object"])
+        self.assertNotIn("Point", self.registry)
+        self.assertEqual("geom.Point", self.registry.qualified_name(self.geom_point))
+        self.assertEqual("int", self.registry.qualified_name(JavaBuiltInTypes.INT))
+        self.assertEqual(
+            (self.awt_point, self.geom_point), self.registry.named("Point"))
+        self.assertEqual(
+            [self.awt_point, self.geom_point, self.shape], self.registry.object_types())
+
+    def test_01_resolve(self):
+        self.assertIs(self.geom_point, self.registry.resolve("Point", package="geom"))
+        self.assertIs(self.awt_point, self.registry.resolve("java.awt.Point", package="geom"))
+        self.assertIs(self.shape, self.registry.resolve("Shape", package="geom"))
+        with self.assertRaisesRegex(KeyError, "ambiguous: could be geom.Point, java.awt.Point"):
+            self.registry.resolve("Point")
+        with self.assertRaisesRegex(KeyError, "Unknown type Circle"):
+            self.registry.resolve("Circle")
+
+    def test_02_duplicates(self):
+        self.assertEqual("java.awt.Point", self.registry.register(self.awt_point, "java.awt"))
+        with self.assertRaisesRegex(DuplicateTypeError, "Type Shape is declared more than once"):
+            self.registry.declare("Shape")
+        with self.assertRaisesRegex(ValueError, "already registered as Shape"):
+            self.registry.register(self.shape, "geom")
+
+        size = len(self.registry)
+        with self.assertRaises(DuplicateTypeError) as context:
+            self.registry.register_all(
+                [JavaObjectType("Circle"), JavaObjectType("Point"), JavaObjectType("Circle")],
+                package="geom")
+        self.assertEqual(["geom.Point", "geom.Circle"], context.exception.names)
+        self.assertEqual(size, len(self.registry))  # Nothing registered
+        self.assertEqual(
+            ["geom.Point", "geom.Circle"], pickle.loads(pickle.dumps(context.exception)).names)
+
+    def test_03_universe_with_packages_round_trips(self):
+        data = {"types": [
+            {"name": "Point", "package": "java.awt"},
+            {"name": "Point", "package": "geom",
+                "methods": [{"name": "toAwt", "returns": "java.awt.Point"}]},
+            {"name": "Shape", "package": "geom",
+                "methods": [{"name": "getCenter", "returns": "Point"}]},
+        ]}
+        types = universe_from_json(data)
+        shape = types["geom.Shape"]
+        self.assertIs(types["geom.Point"], shape.method_named("getCenter").return_type)
+        self.assertIs(
+            types["java.awt.Point"], types["geom.Point"].method_named("toAwt").return_type)
+
+        copy = universe_from_json(json.loads(json.dumps(
+            universe_to_json(types.object_types(), types))))
+        self.assertEqual(sorted(types), sorted(copy))
+        self.assertEqual("geom.Point", copy.qualified_name(
+            copy["geom.Shape"].method_named("getCenter").return_type))
+
+        with self.assertRaisesRegex(
+                ValueError, "^Type name Point is ambiguous: could be geom.Point, java.awt.Point$"):
+            universe_from_json({"types": data["types"][:2] + [{"name": "Shape", "supertypes": ["Point"]}]})
+        with self.assertRaisesRegex(ValueError, "^Unknown type Circle$"):
+            universe_from_json({"types": data["types"] + [{"name": "Ring", "supertypes": ["Circle"]}]})
+        with self.assertRaisesRegex(ValueError, "^Type name Point is ambiguous"):
+            expression_from_json({"var": "p", "type": "Point"}, types)
+
+    def test_04_all_duplicates_are_reported(self):
+        with self.assertRaisesRegex(DuplicateTypeError, "Types A, geom.B are declared more than once"):
+            universe_from_json({"types": [
+                {"name": "A"}, {"name": "B", "package": "geom"}, {"name": "A"},
+                {"name": "B", "package": "geom"}, {"name": "B"}]})
+        snapshot = snapshot_to_bytes([Graphics.point, JavaObjectType("Point")])
+        with self.assertRaisesRegex(ValueError, "Type Point is declared more than once"):
+            load_universe_bytes(snapshot)
+
+    def test_05_corpus_results_use_qualified_names(self):
+        types = universe_from_json({"types": [
+            {"name": "Point", "package": "geom"},
+            {"name": "Shape", "package": "geom",
+                "methods": [{"name": "getCenter", "returns": "Point"}]},
+        ]})
+        line = json.dumps({"call": "getCenter", "on": {"var": "s", "type": "Shape"}})
+        self.assertEqual([{"ok": True, "type": "geom.Point"}], check_corpus_lines([line], types))
+
+    def test_06_errors_use_qualified_names(self):
+        types = universe_from_json({"types": [
+            {"name": "Point", "package": "a"},
+            {"name": "Point", "package": "b"},
+            {"name": "Shape"},
+        ]})
+        a_point, b_point = JavaVariable("p", types["a.Point"]), JavaVariable("q", types["b.Point"])
+        self.assertCompileError(
+            NoSuchJavaMethod, "b.Point has no method named getZ",
+            JavaMethodCall(b_point, "getZ"))
+        self.assertCompileError(
+            JavaTypeMismatchError, "Cannot assign b.Point to variable p of type a.Point",
+            JavaAssignment(a_point, b_point))
+        self.assertCompileError(
+            NoSuchJavaMethod, "Shape has no method named getZ",
+            JavaMethodCall(JavaVariable("s", types["Shape"]), "getZ"))
+        self.assertEqual(
+            {"var": "q", "type": "b.Point"}, expression_to_json(b_point))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker.serialization import (
+    expression_from_json, expression_to_json, universe_from_json, universe_to_json)
+from tests.fixtures import check_types_outcome, graphics_types, sample_expressions
+from tests.helpers import TypeTest
+import json
+import unittest
+
+
+class TestSerialization(TypeTest):
+
+    def setUp(self):
+        self.types = universe_from_json(json.loads(json.dumps(universe_to_json(graphics_types()))))
+
+    def test_00_universe_round_trips(self):
+        for original in graphics_types():
+            copy = self.types[original.name]
+            self.assertIsNot(original, copy)
+            self.assertEqual(
+                [s.name for s in original.direct_supertypes],
+                [s.name for s in copy.direct_supertypes])
+            self.assertEqual(
+                [p.name for p in original.constructor.parameter_types],
+                [p.name for p in copy.constructor.parameter_types])
+            self.assertEqual(sorted(original.methods), sorted(copy.methods))
+
+    def test_01_built_in_types_are_shared(self):
+        self.assertIs(JavaBuiltInTypes.OBJECT, self.types["Object"])
+        self.assertIs(JavaBuiltInTypes.DOUBLE, self.types["Point"].method_named("getX").return_type)
+
+    def test_02_resolves_forward_and_self_references(self):
+        types = universe_from_json({"types": [
+            {"name": "Child", "supertypes": ["Parent"]},
+            {"name": "Parent", "methods": [{"name": "self", "returns": "Parent"}]},
+        ]})
+        self.assertSubtype(types["Child"], types["Parent"])
+        self.assertIs(types["Parent"], types["Child"].method_named("self").return_type)
+
+    def test_03_rejects_bad_universes(self):
+        with self.assertRaisesRegex(ValueError, "Unknown type Nope"):
+            universe_from_json({"types": [{"name": "A", "supertypes": ["Nope"]}]})
+        with self.assertRaisesRegex(ValueError, "declared more than once"):
+            universe_from_json({"types": [{"name": "A"}, {"name": "A"}]})
+
+    def test_04_expressions_round_trip_with_same_outcome(self):
+        for expr in sample_expressions():
+            data = json.loads(json.dumps(expression_to_json(expr)))
+            copy = expression_from_json(data, self.types)
+            self.assertEqual(data, expression_to_json(copy))
+            expected = check_types_outcome(expr)
+            actual = check_types_outcome(copy)
+            self.assertEqual(expected is None, actual is None)
+            if expected is not None:
+                self.assertEqual(expected[1], actual[1])
+
+    def test_05_rejects_unknown_expression_kind(self):
+        with self.assertRaisesRegex(ValueError, "Unknown kind of expression"):
+            expression_from_json({"frob": 1}, self.types)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker.serialization import expression_to_json, universe_to_json
+from java_type_checker.server import LatencyStats, TypeCheckServer
+from tests.fixtures import check_types_outcome, graphics_types, sample_expressions
+import asyncio
+import functools
+import json
+import os
+import socket
+import tempfile
+import unittest
+
+
+class _CollectingWriter(object):
+    def __init__(self):
+        self.lines = []
+
+    def write(self, data):
+        self.lines.append(json.loads(data))
+
+    async def drain(self):
+        await asyncio.sleep(0)
+
+
+class _BrokenType(JavaObjectType):
+    # A type whose method lookups fail, to stand in for a bug in the checker
+    def find_overloads(self, name):
+        raise RuntimeError("lookup failed")
+
+
+class TestServer(unittest.TestCase):
+
+    def setUp(self):
+        universe = json.dumps(universe_to_json(graphics_types())).encode("utf-8")
+        self.server = TypeCheckServer.from_bytes(universe)
+        self.requests = [
+            {"id": i, "check": expression_to_json(expr)}
+            for i, expr in enumerate(sample_expressions())]
+
+    def tearDown(self):
+        self.server.close()
+
+    def expected_response(self, request_id, expr):
+        outcome = check_types_outcome(expr)
+        if outcome is None:
+            return {"id": request_id, "ok": True, "type": expr.static_type().name}
+        return {"id": request_id, "ok": False, "error": outcome[0].__name__, "message": outcome[1]}
+
+    def serve(self, lines):
+        writer = _CollectingWriter()
+
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_data("".join(line + "\n" for line in lines).encode("utf-8"))
+            reader.feed_eof()
+            await self.server.serve_stream(reader, writer)
+
+        asyncio.run(run())
+        return writer.lines
+
+    def test_00_answers_check_requests(self):
+        responses = self.serve([json.dumps(request) for request in self.requests])
+        expected = [
+            self.expected_response(i, expr) for i, expr in enumerate(sample_expressions())]
+        self.assertEqual(expected, responses)
+        self.assertEqual(len(self.requests), self.server.latency.count)
+
+    def test_01_reports_bad_requests(self):
+        responses = self.serve([
+            "not json",
+            "[1, 2]",
+            json.dumps({"id": "a", "frobnicate": True}),
+            json.dumps({"id": "b", "check": {"var": "x", "type": "Nope"}}),
+        ])
+        self.assertEqual(
+            [None, None, "a", "b"], [response["id"] for response in responses])
+        self.assertEqual(
+            ["InvalidRequest"] * 3 + ["InvalidExpression"],
+            [response["error"] for response in responses])
+        self.assertEqual("Unknown type Nope", responses[3]["message"])
+
+    def test_02_reports_latency_percentiles(self):
+        self.serve([json.dumps(request) for request in self.requests])
+        response = self.server.handle_request({"id": 9, "stats": True})
+        self.assertEqual(len(self.requests), response["stats"]["requests"])
+        latency = response["stats"]["latency_ms"]
+        self.assertEqual(["p50", "p90", "p99", "max"], list(latency))
+        self.assertTrue(0 <= latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["max"])
+
+        stats = LatencyStats(window_size=4)
+        self.assertIsNone(stats.percentile(50))
+        for seconds in [5, 1, 4, 2, 3]:
+            stats.record(seconds)
+        self.assertEqual(5, stats.count)
+        # The window only holds the last 4: 1, 4, 2, 3
+        self.assertEqual(1, stats.percentile(25))
+        self.assertEqual(2, stats.percentile(50))
+        self.assertEqual(4, stats.percentile(99))
+
+    def test_03_concurrent_clients_over_unix_socket(self):
+        if not hasattr(socket, "AF_UNIX"):
+            self.skipTest("Unix sockets are not available")
+        server = TypeCheckServer(self.server.types, threads=4)
+        self.addCleanup(server.close)
+        expected = {
+            i: self.expected_response(i, expr) for i, expr in enumerate(sample_expressions())}
+
+        async def client(path):
+            reader, writer = await asyncio.open_unix_connection(path)
+            for request in self.requests:
+                writer.write((json.dumps(request) + "\n").encode("utf-8"))
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in self.requests]
+            writer.close()
+            return responses
+
+        async def run(path):
+            serving = asyncio.ensure_future(server.serve_unix(path))
+            while not os.path.exists(path):
+                await asyncio.sleep(0.01)
+            results = await asyncio.gather(*[client(path) for _ in range(5)])
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b'{"id": "bye", "shutdown": true}\n')
+            shutdown = json.loads(await reader.readline())
+            writer.close()
+            await asyncio.wait_for(serving, timeout=10)
+            return results, shutdown
+
+        with tempfile.TemporaryDirectory() as directory:
+            results, shutdown = asyncio.run(run(os.path.join(directory, "server.sock")))
+        for responses in results:
+            # With threads, responses can come back in any order
+            self.assertEqual(expected, {response["id"]: response for response in responses})
+        self.assertEqual({"id": "bye", "shutdown": True}, shutdown)
+        self.assertEqual(5 * len(self.requests) + 1, server.latency.count)
+
+    def test_04_failed_requests_do_not_stop_the_server(self):
+        server = TypeCheckServer(TypeRegistry([_BrokenType("Broken")]))
+        self.addCleanup(server.close)
+        self.server = server
+        depth = 2000
+        responses = self.serve([
+            json.dumps({"id": 1, "check": {"call": "m", "on": {"var": "b", "type": "Broken"}}}),
+            '{"id": 2, "check": ' + '{"call": "m", "on": ' * depth + '{"var": "b", "type": "Broken"}' + '}' * depth + '}',
+            json.dumps({"id": 3, "check": {"var": "x", "type": "int"}}),
+            json.dumps({"id": 4, "check": {"var": "x" * 100000, "type": "int"}}),
+            json.dumps({"id": 5, "check": {"var": "x", "type": "int"}}),
+        ])
+        self.assertEqual(
+            [
+                {"id": 1, "ok": False, "error": "InternalError", "message": "RuntimeError: lookup failed"},
+                {"id": None, "ok": False, "error": "InvalidRequest", "message": "Request is nested too deeply"},
+                {"id": 3, "ok": True, "type": "int"},
+                {"id": None, "ok": False, "error": "InvalidRequest", "message": "Request line is too long"},
+                {"id": 5, "ok": True, "type": "int"},
+            ],
+            responses)
+        self.assertEqual(
+            {"id": 6, "ok": False, "error": "InvalidExpression", "message": "Expression is nested too deeply"},
+            server.handle_request({"id": 6, "check": functools.reduce(
+                lambda expr, _: {"call": "m", "on": expr}, range(depth), {"var": "x", "type": "int"})}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker.serialization import universe_from_json
+from java_type_checker.snapshot import load_snapshot, save_snapshot, snapshot_from_bytes, snapshot_to_bytes
+from tests.fixtures import Graphics, graphics_types
+from tests.helpers import TypeTest
+import os
+import tempfile
+import unittest
+
+
+def describe(types):
+    """Returns a structure describing the declarations of the given types, with references to other
+    types given as indexes into the list (or names, for built-in types).
+    """
+    index = {t: i for i, t in enumerate(types)}
+    for t in JavaBuiltInTypes.ALL:
+        index[t] = t.name
+
+    def refs(ts):
+        return [index[t] for t in ts]
+
+    return [
+        (
+            t.name,
+            refs(t.direct_supertypes),
+            refs(t.constructor.parameter_types),
+            [(m.name, refs(m.parameter_types), index[m.return_type]) for m in t.methods.values()],
+        )
+        for t in types
+    ]
+
+
+class TestSnapshot(TypeTest):
+
+    def test_00_round_trips_exactly(self):
+        loaded = snapshot_from_bytes(snapshot_to_bytes(graphics_types()))
+        self.assertEqual(len(graphics_types()), len(loaded))
+        self.assertEqual(describe(graphics_types()), describe(loaded))
+
+    def test_01_loaded_types_are_new_objects_that_share_built_ins(self):
+        loaded = snapshot_from_bytes(snapshot_to_bytes([Graphics.rectangle]))
+        self.assertIsNot(Graphics.rectangle, loaded[0])
+        self.assertIs(JavaBuiltInTypes.OBJECT, loaded[0].direct_supertypes[0].direct_supertypes[0])
+        self.assertIs(JavaBuiltInTypes.OBJECT.methods["hashCode"], loaded[0].method_named("hashCode"))
+        self.assertSubtype(loaded[0], JavaBuiltInTypes.OBJECT)
+        self.assertEqual(JavaBuiltInTypes.DOUBLE, loaded[0].method_named("getX").return_type)
+
+    def test_02_includes_reachable_types(self):
+        loaded = snapshot_from_bytes(snapshot_to_bytes([Graphics.rectangle]))
+        self.assertEqual(
+            ["Rectangle", "GraphicsObject", "Point", "Strokable", "Paint", "Fillable", "Size"],
+            [t.name for t in loaded])
+
+    def test_03_preserves_duplicate_names_and_cycles(self):
+        # class Node { Node next() }, and an unrelated class also called Node
+        node = JavaObjectType("Node")
+        node.add_method(JavaMethod("next", return_type=node))
+        other_node = JavaObjectType("Node", direct_supertypes=[node])
+        loaded = snapshot_from_bytes(snapshot_to_bytes([other_node]))
+        self.assertEqual(["Node", "Node"], [t.name for t in loaded])
+        self.assertIs(loaded[1], loaded[0].direct_supertypes[0])
+        self.assertIs(loaded[1], loaded[1].method_named("next").return_type)
+        self.assertIs(loaded[1], loaded[0].method_named("next").return_type)
+
+    def test_04_loaded_types_can_be_modified(self):
+        loaded = snapshot_from_bytes(snapshot_to_bytes([Graphics.point]))[0]
+        loaded.add_method(JavaMethod("getZ", return_type=JavaBuiltInTypes.DOUBLE))
+        self.assertEqual("getZ", loaded.method_named("getZ").name)
+        self.assertIsNone(Graphics.point.find_method("getZ"))
+
+    def test_05_rejects_other_data(self):
+        with self.assertRaisesRegex(ValueError, "Not a type universe snapshot"):
+            snapshot_from_bytes(b'{"types": []}')
+
+    def test_06_saves_and_loads_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "graphics.snapshot")
+            save_snapshot(graphics_types(), path)
+            self.assertEqual(describe(graphics_types()), describe(load_snapshot(path)))
+
+    def test_07_preserves_packages(self):
+        types = universe_from_json({"types": [
+            {"name": "Point", "package": "a"},
+            {"name": "Point", "package": "b", "supertypes": ["a.Point"]},
+            {"name": "Shape", "methods": [{"name": "getCenter", "returns": "b.Point"}]},
+        ]})
+        loaded = snapshot_from_bytes(snapshot_to_bytes(types.object_types()))
+        self.assertEqual(["a", "b", None], [t.package for t in loaded])
+        registry = TypeRegistry(loaded)
+        self.assertEqual(sorted(types), sorted(registry))
+        self.assertIs(registry["a.Point"], registry["b.Point"].direct_supertypes[0])
+        self.assertIs(registry["b.Point"], registry["Shape"].method_named("getCenter").return_type)
+
+
+if __name__ == '__main__':
+    unittest.main()
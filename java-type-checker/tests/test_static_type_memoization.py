@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import CountingType, Graphics
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestStaticTypeMemoization(TypeTest):
+
+    def test_00_method_call_chain_does_linear_number_of_lookups(self):
+        # For example:
+        #
+        #     Builder b;
+        #
+        #     b.next().next().next() ... .next()
+        #
+        builder = CountingType("Builder")
+        builder.add_method(JavaMethod("next", return_type=builder))
+        expr = JavaVariable("b", builder)
+        for i in range(40):
+            expr = JavaMethodCall(expr, "next")
+
+        self.assertNoCompileErrors(expr)
+        self.assertEqual(builder, expr.static_type())
+        self.assertLessEqual(builder.lookups, 2 * 40)  # Once to check each call, once for its type
+
+    def test_01_add_method_invalidates_memoized_types(self):
+        widget = JavaObjectType("Widget")
+        widget.add_method(JavaMethod("getSize", return_type=Graphics.size))
+        expr = JavaMethodCall(JavaVariable("w", widget), "getSize")
+        self.assertEqual(Graphics.size, expr.static_type())
+
+        widget.add_method(JavaMethod("getSize", return_type=Graphics.point))
+        self.assertEqual(Graphics.point, expr.static_type())
+
+    def test_02_supertype_change_invalidates_memoized_types(self):
+        widget = JavaObjectType("Widget")
+        expr = JavaMethodCall(JavaVariable("w", widget), "getSize")
+        self.assertCompileError(NoSuchJavaMethod, "Widget has no method named getSize", expr)
+
+        widget.direct_supertypes = [Graphics.window]
+        self.assertNoCompileErrors(expr)
+        self.assertEqual(Graphics.size, expr.static_type())
+
+    def test_03_failed_check_keeps_known_static_type(self):
+        # Point p; p = rect
+        expr = JavaAssignment(
+            JavaVariable("p", Graphics.point), JavaVariable("rect", Graphics.rectangle))
+        self.assertEqual(Graphics.point, expr.static_type())
+        self.assertCompileError(
+            JavaTypeMismatchError,
+            "Cannot assign Rectangle to variable p of type Point",
+            expr)
+        self.assertIs(Graphics.point, expr._static_type)  # Still memoized
+        self.assertEqual(Graphics.point, expr.static_type())
+
+    def test_04_subclass_without_memo_slots_or_constructor(self):
+        # A node defined outside the library, with its own fields and no call to super().__init__()
+        class GetPosition(JavaExpression):
+            def __init__(self, receiver):
+                self.receiver = receiver
+
+            def _static_type_steps(self):
+                receiver_type = yield self.receiver
+                return receiver_type.method_named("getPosition").return_type
+
+            _check_steps = _static_type_steps
+
+        rect = JavaVariable("rect", Graphics.rectangle)
+        expr = GetPosition(rect)
+        self.assertEqual(Graphics.point, expr.static_type())
+        self.assertNoCompileErrors(JavaMethodCall(expr, "getX"))
+        self.assertCompileError(
+            NoSuchJavaMethod, "Point has no method named getPosition", GetPosition(expr))
+
+
+if __name__ == '__main__':
+    unittest.main()
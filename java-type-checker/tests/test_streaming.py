@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker.cli import check_corpus_lines, iter_corpus
+from java_type_checker.serialization import (
+    expression_to_json, universe_from_json, universe_to_json)
+from java_type_checker.streaming import check_lines, encode_chunks, write_results
+from tests.fixtures import graphics_types, sample_expressions
+import io
+import json
+import tracemalloc
+import unittest
+
+
+class _Discard(object):
+    def write(self, data):
+        pass
+
+    def flush(self):
+        pass
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.universe_data = json.dumps(universe_to_json(graphics_types())).encode("utf-8")
+        self.types = universe_from_json(json.loads(self.universe_data))
+        self.lines = [json.dumps(expression_to_json(expr)) + "\n" for expr in sample_expressions()]
+        self.lines.insert(3, '{"var": "x", "type": "Nope"}\n')
+        self.lines.insert(5, "\n")
+
+    def corpus(self, repeat, consumed=None):
+        # Generates the sample lines `repeat` times, counting the lines read so far in consumed[0]
+        for _ in range(repeat):
+            for line in self.lines:
+                if consumed is not None:
+                    consumed[0] += 1
+                yield line
+
+    def test_00_results_match_batch_checking(self):
+        expected = check_corpus_lines([line for line in self.lines if line.strip()], self.types)
+        self.assertEqual(expected, list(check_lines(self.lines, self.types)))
+        self.assertEqual(
+            {"ok": False, "error": "InvalidExpression", "message": "Unknown type Nope"}, expected[3])
+
+    def test_01_lines_are_read_on_demand(self):
+        consumed = [0]
+        results = check_lines(self.corpus(1000, consumed), self.types)
+        self.assertEqual(0, consumed[0])
+        for _ in range(10):
+            next(results)
+        self.assertEqual(11, consumed[0])  # Including one blank line
+
+    def test_02_chunked_output(self):
+        results = list(check_lines(self.lines, self.types))
+        chunks = list(encode_chunks(results, chunk_size=200))
+        self.assertGreater(len(chunks), 2)
+        self.assertTrue(all(len(chunk) >= 200 for chunk in chunks[:-1]))
+        self.assertEqual(results, [json.loads(line) for line in "".join(chunks).splitlines()])
+
+        consumed = [0]
+        chunks = encode_chunks(check_lines(self.corpus(1000, consumed), self.types), chunk_size=200)
+        next(chunks)
+        self.assertLess(consumed[0], 20)
+
+        output = io.StringIO()
+        counts = write_results(check_lines(self.lines, self.types), output, chunk_size=200)
+        self.assertEqual({"expressions": len(results), "errors": 16}, counts)
+        self.assertEqual("".join(encode_chunks(results)), output.getvalue())
+
+    def test_03_memory_does_not_grow_with_corpus_size(self):
+        def peak(repeat):
+            tracemalloc.start()
+            try:
+                write_results(check_lines(self.corpus(repeat), self.types), _Discard(), 1024)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        # Ill-typed nodes and their errors refer to each other, so they are freed by the cyclic
+        # garbage collector, whose timing makes the peak vary somewhat
+        small, large = peak(100), peak(1000)
+        self.assertLess(large, small * 3)
+
+    def test_04_parallel_stream_matches_serial_stream(self):
+        serial = list(iter_corpus(self.universe_data, self.corpus(10)))
+        consumed = [0]
+        worker_stats = {}
+        parallel = iter_corpus(
+            self.universe_data, self.corpus(10, consumed), jobs=2, shard_size=7,
+            worker_stats=worker_stats)
+        first = next(parallel)
+        self.assertLessEqual(consumed[0], 5 * 7 + 2)  # Four shards in flight, plus blank lines
+        self.assertEqual(serial, [first] + list(parallel))
+        self.assertEqual(len(serial), sum(count for count, seconds in worker_stats.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+from tests.helpers import TypeTest
+import pickle
+import unittest
+
+
+class TestStructuredErrors(TypeTest):
+
+    def error(self, expr):
+        with self.assertRaises(JavaTypeError) as context:
+            expr.check_types()
+        return context.exception
+
+    def test_00_no_such_method(self):
+        expr = JavaMethodCall(JavaVariable("p", Graphics.point), "getZ")
+        error = self.error(expr)
+        self.assertIs(expr, error.expression)
+        self.assertIs(Graphics.point, error.receiver_type)
+        self.assertEqual("getZ", error.method_name)
+        self.assertEqual("Point has no method named getZ", str(error))
+
+        with self.assertRaises(NoSuchJavaMethod) as context:
+            JavaBuiltInTypes.NULL.method_named("getZ")
+        self.assertIsNone(context.exception.expression)
+        self.assertEqual("Type null does not have methods", str(context.exception))
+
+    def test_01_argument_errors(self):
+        point = JavaVariable("p", Graphics.point)
+        expr = JavaMethodCall(point, "getX", point)
+        error = self.error(expr)
+        self.assertIsInstance(error, JavaArgumentCountError)
+        self.assertEqual((Graphics.point, "getX"), (error.target, error.method_name))
+        self.assertEqual(((0,), 1), (error.expected, error.actual))
+        self.assertEqual("Point.getX()", error.method)
+
+        expr = JavaConstructorCall(Graphics.point, point, point)
+        error = self.error(expr)
+        self.assertIsInstance(error, JavaTypeMismatchError)
+        self.assertIsNone(error.method_name)
+        self.assertEqual(
+            ((JavaBuiltInTypes.DOUBLE, JavaBuiltInTypes.DOUBLE),), error.expected)
+        self.assertEqual((Graphics.point, Graphics.point), error.actual)
+        self.assertEqual(
+            "Point constructor expects arguments of type (double, double), but got (Point, Point)",
+            str(error))
+
+    def test_02_assignment_and_instantiation_errors(self):
+        expr = JavaAssignment(JavaVariable("p", Graphics.point), JavaVariable("s", Graphics.size))
+        error = self.error(expr)
+        self.assertEqual(("p", Graphics.point, Graphics.size), (error.variable, error.expected, error.actual))
+
+        error = self.error(JavaConstructorCall(JavaBuiltInTypes.INT))
+        self.assertIsInstance(error, JavaIllegalInstantiationError)
+        self.assertIs(JavaBuiltInTypes.INT, error.instantiated_type)
+        self.assertEqual("Type int is not instantiable", str(error))
+
+    def test_03_messages_are_formatted_only_on_demand(self):
+        calls = []
+        def describe():
+            calls.append(1)
+            return "frob()"
+
+        error = first_args_error(describe, [JavaBuiltInTypes.INT], [])
+        self.assertEqual(JavaArgumentCountError, error.error_class)
+        self.assertEqual({"expected": (1,), "actual": 0}, {k: error.fields[k] for k in ("expected", "actual")})
+        self.assertEqual([], calls)
+
+        exception = error.exception()
+        self.assertEqual([], calls)
+        self.assertEqual("Wrong number of arguments for frob(): expected 1, got 0", str(exception))
+        self.assertEqual(str(exception), str(exception))
+        self.assertEqual([1], calls)
+
+    def test_04_errors_with_plain_messages(self):
+        error = JavaTypeMismatchError("Something is wrong")
+        self.assertEqual("Something is wrong", str(error))
+        self.assertEqual(("Something is wrong",), error.args)
+        self.assertEqual("JavaTypeMismatchError('Something is wrong')", repr(error))
+
+    def test_05_errors_pickle_as_messages(self):
+        error = self.error(JavaConstructorCall(JavaBuiltInTypes.INT))
+        copy = pickle.loads(pickle.dumps(error))
+        self.assertIsInstance(copy, JavaIllegalInstantiationError)
+        self.assertEqual(str(error), str(copy))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestSupertypeClosure(TypeTest):
+
+    def test_00_ancestors_include_type_itself_and_all_supertypes(self):
+        self.assertEqual(
+            {
+                Graphics.rectangle,
+                Graphics.graphics_object,
+                Graphics.strokable,
+                Graphics.fillable,
+                JavaBuiltInTypes.OBJECT,
+            },
+            Graphics.rectangle.ancestors())
+
+    def test_01_handles_wide_stack_of_diamonds(self):
+        # Each level implements both halves of the diamond below it, so an unmemoized search visits
+        # 2^levels paths to reach the bottom.
+        bottom = JavaObjectType("Bottom")
+        top = bottom
+        for i in range(60):
+            left = JavaObjectType("Left{0}".format(i), direct_supertypes=[top])
+            right = JavaObjectType("Right{0}".format(i), direct_supertypes=[top])
+            top = JavaObjectType("Diamond{0}".format(i), direct_supertypes=[left, right])
+        self.assertSubtype(top, bottom)
+        self.assertNotSubtype(top, Graphics.point)
+        self.assertEqual(1 + 60 * 3 + 1, len(top.ancestors()))  # + Bottom, + Object
+
+    def test_02_handles_hierarchy_deeper_than_recursion_limit(self):
+        deep_subtype = Graphics.rectangle
+        for i in range(1500):
+            deep_subtype = JavaObjectType("DeepType{0}".format(i), direct_supertypes=[deep_subtype])
+        self.assertSubtype(deep_subtype, Graphics.fillable)
+
+    def test_03_reassigning_direct_supertypes_invalidates_ancestors(self):
+        shape = JavaObjectType("Shape")
+        circle = JavaObjectType("Circle", direct_supertypes=[shape])
+        self.assertNotSubtype(circle, Graphics.fillable)
+
+        shape.direct_supertypes = [Graphics.fillable]
+        self.assertSubtype(circle, Graphics.fillable)
+
+        shape.direct_supertypes = []
+        self.assertNotSubtype(circle, Graphics.fillable)
+        self.assertNotSubtype(circle, JavaBuiltInTypes.OBJECT)
+
+    def test_04_direct_supertypes_cannot_be_changed_in_place(self):
+        with self.assertRaises(AttributeError):
+            Graphics.rectangle.direct_supertypes.append(Graphics.point)
+
+    def test_05_cycles_are_reported_instead_of_recursing_forever(self):
+        chicken = JavaObjectType("Chicken")
+        egg = JavaObjectType("Egg", direct_supertypes=[chicken])
+        chicken.direct_supertypes = [egg]
+        with self.assertRaisesRegex(ValueError, "^Cyclic type hierarchy: Egg extends Chicken extends Egg$"):
+            egg.is_subtype_of(JavaBuiltInTypes.OBJECT)
+
+
+if __name__ == '__main__':
+    unittest.main()
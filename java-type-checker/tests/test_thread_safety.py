@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker.serialization import (
+    expression_from_json, expression_to_json, universe_from_json, universe_to_json)
+from tests.fixtures import check_types_outcome, graphics_types, sample_expressions
+from tests.helpers import TypeTest
+import random
+import sys
+import threading
+import unittest
+
+
+class TestThreadSafety(TypeTest):
+
+    THREADS = 8
+    ROUNDS = 20
+
+    def setUp(self):
+        # A private copy of the Graphics types, so that freezing it leaves the shared fixtures alone
+        self.types = universe_from_json(universe_to_json(graphics_types()))
+        self.universe = freeze(self.types.object_types())
+
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # Switch threads as often as possible
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def expressions(self):
+        # New nodes on every call. Identical subexpressions are shared, so threads that check
+        # different expressions still write to the same nodes.
+        interner = ExpressionInterner()
+        expressions = [
+            expression_from_json(expression_to_json(expr), self.types, interner)
+            for expr in sample_expressions()]
+        builder = self.types["Rectangle"]
+        chain = interner.variable("rect", builder)
+        for i in range(200):
+            chain = interner.method_call(interner.method_call(chain, "getPosition"), "getX")
+            chain = interner.constructor_call(builder, interner.constructor_call(
+                self.types["Point"], chain, chain), interner.variable("size", self.types["Size"]))
+        expressions.append(chain)
+        return expressions
+
+    def outcomes(self, expressions, order):
+        outcomes = [None] * len(expressions)
+        for i in order:
+            expr = expressions[i]
+            outcome = check_types_outcome(expr)
+            outcomes[i] = (outcome, None if outcome else expr.static_type())
+        return outcomes
+
+    def check_concurrently(self, expressions, while_checking=None):
+        barrier = threading.Barrier(self.THREADS + (while_checking is not None))
+        results = [None] * self.THREADS
+        failures = []
+
+        def worker(n):
+            order = list(range(len(expressions)))
+            random.Random(n).shuffle(order)
+            barrier.wait()
+            try:
+                results[n] = self.outcomes(expressions, order)
+            except BaseException as e:
+                failures.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        if while_checking is not None:
+            barrier.wait()
+            while any(thread.is_alive() for thread in threads):
+                while_checking()
+        for thread in threads:
+            thread.join()
+        if failures:
+            raise failures[0]
+        return results
+
+    def test_00_concurrent_checks_match_single_threaded_run(self):
+        expected = self.outcomes(self.expressions(), range(len(self.expressions())))
+        self.assertIn(None, [outcome for outcome, static_type in expected])
+        self.assertNotIn(None, [static_type for outcome, static_type in expected if outcome is None])
+
+        for _ in range(self.ROUNDS):
+            for outcomes in self.check_concurrently(self.expressions()):
+                self.assertEqual(expected, outcomes)
+
+    def test_01_changes_to_other_types_do_not_touch_frozen_tables(self):
+        expected = self.outcomes(self.expressions(), range(len(self.expressions())))
+        tables = {t: t.method_table() for t in self.types.object_types()}
+
+        # Every change bumps the universe version, so the expressions’ memos keep going stale and
+        # the threads keep recomputing them while the frozen types are being read.
+        unrelated = JavaObjectType("Unrelated")
+        counter = iter(range(sys.maxsize))
+        def add_method():
+            unrelated.add_method(JavaMethod(f"m{next(counter)}", return_type=JavaBuiltInTypes.INT))
+
+        for _ in range(self.ROUNDS // 4):
+            for outcomes in self.check_concurrently(self.expressions(), while_checking=add_method):
+                self.assertEqual(expected, outcomes)
+        for t, table in tables.items():
+            self.assertIs(table, t.method_table())
+
+    def test_02_frozen_tables_are_read_only(self):
+        rectangle = self.types["Rectangle"]
+        with self.assertRaises(TypeError):
+            rectangle.method_table()["getFunky"] = None
+        with self.assertRaises(TypeError):
+            rectangle.find_overloads("setPosition").by_arity[3] = ()
+        with self.assertRaises(TypeError):
+            rectangle.constructor_overloads().by_arity[0] = ()
+        self.assertSubtype(rectangle, self.types["GraphicsObject"])
+
+    def test_03_freezing_other_universes_leaves_built_ins_alone(self):
+        expected = self.outcomes(self.expressions(), range(len(self.expressions())))
+        built_ins = [(t._universe, t._type_id, t._ancestor_bits) for t in JavaBuiltInTypes.ALL]
+        rectangle = self.types["Rectangle"]
+
+        def freeze_another():
+            # Another universe whose null can be passed where its own Rectangle is expected
+            other = universe_from_json(universe_to_json(graphics_types()))
+            universe = freeze(other.object_types())
+            self.assertTrue(universe.is_subtype(JavaBuiltInTypes.NULL, other["Rectangle"]))
+            self.assertFalse(universe.is_subtype(other["Rectangle"], JavaBuiltInTypes.NULL))
+
+        for _ in range(self.ROUNDS // 4):
+            for outcomes in self.check_concurrently(self.expressions(), while_checking=freeze_another):
+                self.assertEqual(expected, outcomes)
+        self.assertEqual(
+            built_ins, [(t._universe, t._type_id, t._ancestor_bits) for t in JavaBuiltInTypes.ALL])
+        self.assertIs(JavaBuiltInTypes.UNIVERSE, JavaBuiltInTypes.OBJECT._universe)
+        self.assertTrue(self.universe.is_subtype(JavaBuiltInTypes.NULL, rectangle))
+        self.assertSubtype(rectangle, JavaBuiltInTypes.OBJECT)
+        self.assertNotSubtype(JavaBuiltInTypes.OBJECT, rectangle)
+        self.assertEqual(
+            {JavaBuiltInTypes.OBJECT}, least_upper_bounds(rectangle, JavaBuiltInTypes.OBJECT))
+        self.assertEqual({rectangle}, least_upper_bounds(JavaBuiltInTypes.NULL, rectangle))
+
+
+if __name__ == '__main__':
+    unittest.main()